@@ -51,6 +51,12 @@ class GradScaler(AmpScaler):
         decr_every_n_nan_or_inf(int, optional): Decreases loss scaling every n
                                     accumulated steps with nan or inf gradients. Default is 2.
         use_dynamic_loss_scaling(bool, optional): Whether to use dynamic loss scaling. If False, fixed loss_scaling is used. If True, the loss scaling is updated dynamicly. Default is True.
+        use_device_found_inf(bool, optional): Whether to keep the check of nan or inf gradients on device. If True, the update of optimizer is masked on device
+                                when nan or inf is found, i.e. parameters and optimizer states are restored to their values before the update, which is
+                                the same as skipping it. The loss scaling is updated on device, and optimizer states kept on host (e.g. the beta pows
+                                of Adam and AdamW) are moved to device, so `step()` and `update()` do not synchronize with host. Lamb masks its update
+                                in the kernel, the other optimizers copy the updated parameters and their states before the update in each step.
+                                Default is False.
     Returns:
         An GradScaler object.
 
@@ -84,6 +90,7 @@ class GradScaler(AmpScaler):
         incr_every_n_steps=1000,
         decr_every_n_nan_or_inf=2,
         use_dynamic_loss_scaling=True,
+        use_device_found_inf=False,
     ):
         super().__init__(
             enable,
@@ -93,6 +100,7 @@ class GradScaler(AmpScaler):
             incr_every_n_steps,
             decr_every_n_nan_or_inf,
             use_dynamic_loss_scaling,
+            use_device_found_inf,
         )
 
     def scale(self, var):
@@ -206,7 +214,10 @@ class GradScaler(AmpScaler):
         if optimizer_state["state"] is OptimizerState.INIT:
             self._unscale(optimizer)
 
-        if self._found_inf:
+        if self._use_device_found_inf:
+            with self._found_inf_guard(optimizer):
+                optimizer.step()
+        elif self._found_inf:
             self._cache_founf_inf = True
         else:
             optimizer.step()
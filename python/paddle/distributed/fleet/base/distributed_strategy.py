@@ -1655,6 +1655,15 @@ class DistributedStrategy:
 
             **pp_degree(int)**: set number of GPUs in a pipeline parallel group. Default 1
 
+            **dp_comm_overlap(bool)**: all-reduce the gradients of data parallel in buckets during backward,
+                                    to overlap communication with computation. The bucket size is
+                                    fuse_grad_size_in_MB. Default False
+
+            **dp_accumulate_steps(int)**: the number of backward passes whose gradients are accumulated before each
+                                    step with dp_comm_overlap, if it is not pipeline parallel, where it is the
+                                    accumulate_steps of pipeline_configs. The gradients are all-reduced during the
+                                    last backward pass. Default 1
+
         Examples:
             .. code-block:: python
 
@@ -40,7 +40,14 @@ class HybridParallelGradScaler:
 
         optimize_ops, params_grads = (None, None)
 
-        if self._found_inf:
+        if self._use_device_found_inf:
+            # NOTE: found_inf is kept on device, so the update is masked by
+            #       the guard of the scaler, which reads found_inf of the
+            #       wrapped scaler, instead of skipped on host
+            self._scaler._found_inf = self._found_inf
+            with self._found_inf_guard(optimizer):
+                optimize_ops, params_grads = optimizer.minimize(*args, **kwargs)
+        elif self._found_inf:
             self._cache_founf_inf = True
         else:
             optimize_ops, params_grads = optimizer.minimize(*args, **kwargs)
@@ -55,6 +62,9 @@ class HybridParallelGradScaler:
     def _unscale(self, optimizer):
         if not self._enable:
             return
+        wait_grads = getattr(optimizer, '_wait_grads', None)
+        if wait_grads is not None:
+            wait_grads()
         param_grads = [
             param._grad_ivar()
             for param in optimizer._parameter_list
@@ -73,6 +83,10 @@ class HybridParallelGradScaler:
                 self._found_inf, op=paddle.distributed.ReduceOp.MAX, group=None
             )
             self._found_inf = paddle.cast(self._found_inf, dtype="bool")
+        if self._use_device_found_inf:
+            self._found_inf = self._device_found_inf(
+                [(param_grads, self._found_inf)]
+            )
 
     def __getattr__(self, item):
         return getattr(self._scaler, item)
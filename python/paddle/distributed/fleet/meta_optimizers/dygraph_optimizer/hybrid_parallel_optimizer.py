@@ -17,6 +17,7 @@ from paddle.fluid.clip import ClipGradByGlobalNorm
 from ...utils.hybrid_parallel_util import (
     fused_allreduce_gradients,
     sharding_reduce_gradients,
+    FusedAllReduceReducer,
 )
 from ...base.topology import ParallelMode
 from paddle.autograd import no_grad
@@ -202,6 +203,27 @@ class HybridParallelOptimizer:
 
         self._sharding_enable = self._hcg.get_sharding_parallel_world_size() > 1
 
+        # NOTE: With dp_comm_overlap, the gradients are all-reduced by the
+        #       hooks of parameters during backward, instead of after it.
+        self._dp_reducer = None
+        if (
+            self._dp_enable
+            and self._strategy is not None
+            and self._strategy.hybrid_configs['dp_comm_overlap']
+        ):
+            # NOTE: the all-reduce is launched in the last backward pass of
+            #       the accumulated ones, so the number of them must be known
+            if self._hcg.get_parallel_mode() == ParallelMode.PIPELINE_PARALLEL:
+                acc_steps = self._strategy.pipeline_configs['accumulate_steps']
+            else:
+                acc_steps = self._strategy.hybrid_configs['dp_accumulate_steps']
+            self._dp_reducer = FusedAllReduceReducer(
+                _obtain_optimizer_parameters_list(self._inner_opt),
+                self._hcg.get_data_parallel_group(),
+                acc_steps=acc_steps,
+                bucket_size=self._strategy.fuse_grad_size_in_MB * 1024 * 1024,
+            )
+
         if (
             isinstance(self._inner_opt._grad_clip, ClipGradByGlobalNorm)
             and not self._use_dp_mode
@@ -229,14 +251,23 @@ class HybridParallelOptimizer:
                                 self._inner_opt._grad_clip, hcg
                             )
 
+    def _wait_grads(self):
+        # NOTE: with dp_comm_overlap, gradients are views of the buffers whose
+        #       all-reduce may be in flight, any consumer of gradients (e.g.
+        #       unscaling of GradScaler) should wait for them first
+        if self._dp_reducer is not None:
+            self._dp_reducer.wait()
+
     @no_grad()
     @framework.dygraph_only
     def step(self):
+        self._wait_grads()
+
         parameters_list = _obtain_optimizer_parameters_list(self._inner_opt)
         if self._sharding_enable:
             sharding_reduce_gradients(list(parameters_list), self._hcg)
 
-        if self._dp_enable:
+        if self._dp_enable and self._dp_reducer is None:
             fused_allreduce_gradients(list(parameters_list), self._hcg)
 
         self._inner_opt.step()
@@ -252,11 +283,13 @@ class HybridParallelOptimizer:
             parameters if parameters else self._inner_opt._parameter_list
         )
 
+        self._wait_grads()
+
         # Here sharding should use global parameter list
         if self._sharding_enable:
             sharding_reduce_gradients(list(parameter_list), self._hcg)
 
-        if self._dp_enable:
+        if self._dp_enable and self._dp_reducer is None:
             fused_allreduce_gradients(list(parameter_list), self._hcg)
 
         return self._inner_opt.minimize(
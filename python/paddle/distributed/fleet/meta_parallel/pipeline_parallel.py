@@ -192,11 +192,20 @@ class PipelineParallel(MetaParallelBase):
             )
             p2p.send_backward(input_tensor_grad, self.is_pipeline_first_stage())
 
+        self._wait_dp_comm()
         self._layers.allreduce_shared_weight_gradients()
         with paddle.amp.auto_cast(enable=False):
             train_loss = self._broadcast_final_loss()
         return train_loss
 
+    def _wait_dp_comm(self):
+        # NOTE: The async all-reduce of data parallel gradients must finish
+        #       before the gradients of shared weights are all-reduced.
+        optimizer = getattr(self, 'optimizer', None)
+        wait_grads = getattr(optimizer, '_wait_grads', None)
+        if wait_grads is not None:
+            wait_grads()
+
     def _prepare_training(self, data, optimizer, lr_scheduler):
         # reset the virtual pp rank for each run
         self.set_virtual_pipeline_rank(0)
@@ -746,6 +755,7 @@ class PipelineParallelWithInterleave(PipelineParallel):
                     )
                 )
 
+            self._wait_dp_comm()
             self._layers.allreduce_shared_weight_gradients()
 
         if compute_loss:
@@ -14,6 +14,7 @@
 
 from paddle import framework
 import paddle
+from paddle import _C_ops
 from paddle.fluid import core
 from paddle.fluid.dygraph.parallel import (
     _split_tensors,
@@ -202,6 +203,204 @@ def fused_allreduce_gradients(parameter_list, hcg):
     fused_allreduce_gradients_with_group(parameter_list, data_parallel_group)
 
 
+class FusedCommBuffer:
+    """
+    A flattened buffer of the gradients of ``params`` with the same dtype,
+    which is all-reduced asynchronously once the gradients of all params are
+    ready, i.e. accumulated for ``acc_steps`` times. After the all-reduce, the
+    gradients of params are views of the buffer, so the buffer is reused
+    across steps without copying the gradients back.
+    """
+
+    def __init__(self, id, params, comm_group, acc_steps=1):
+        self._id = id
+        self._params = params
+        self._comm_group = comm_group
+        self._acc_steps = acc_steps
+        self._nranks = (
+            paddle.distributed.get_world_size()
+            if comm_group is None
+            else comm_group.nranks
+        )
+        self._param_indices = {
+            param.name: i for i, param in enumerate(self._params)
+        }
+        self._init_buffer()
+        self._reset()
+
+    def _init_buffer(self):
+        self._grads, self.buffer = _C_ops.coalesce_tensor(
+            self._params,
+            self._params[0].dtype,
+            False,
+            True,
+            False,
+            0.0,
+            False,
+            -1,
+            -1,
+            [],
+            [],
+        )
+
+    def _reset(self):
+        self._params_step_dict = {}
+        self._params_checked_in = 0
+        self._task = None
+
+    @property
+    def is_ready(self):
+        return self._params_checked_in == len(self._params)
+
+    def add_grad(self, param):
+        if not self._params_step_dict:
+            # NOTE: clear_grad(set_to_zero=False) releases the memory of the
+            #       gradients, which are views of the buffer, so the buffer
+            #       is created again.
+            if not all(grad._is_initialized() for grad in self._grads):
+                self._init_buffer()
+
+        step = self._params_step_dict.get(param.name, 0) + 1
+        self._params_step_dict[param.name] = step
+        if step == self._acc_steps:
+            self._copy_grad_to_buffer(param)
+            self._params_checked_in += 1
+
+    def _copy_grad_to_buffer(self, param):
+        grad_view = self._grads[self._param_indices[param.name]]
+        grad = param.grad
+        if grad is None:
+            # the gradient of param which is unused in this step is zero
+            paddle.assign(paddle.zeros_like(grad_view), grad_view)
+        elif grad._is_shared_buffer_with(grad_view):
+            return
+        else:
+            assert (
+                not grad.is_selected_rows()
+            ), "Now, it doesn't support sparse parameters"
+            paddle.assign(grad, grad_view)
+        param._copy_gradient_from(grad_view)
+
+    def flush(self):
+        """
+        Checks in the params whose gradients are not ready, e.g. the params
+        unused in this step.
+        """
+        for param in self._params:
+            if self._params_step_dict.get(param.name, 0) < self._acc_steps:
+                self._copy_grad_to_buffer(param)
+        self._params_checked_in = len(self._params)
+
+    def comm_grads(self):
+        assert self.is_ready and self._task is None
+        self.buffer.scale_(1.0 / self._nranks)
+        self._task = paddle.distributed.all_reduce(
+            self.buffer, group=self._comm_group, sync_op=False
+        )
+
+    def wait(self):
+        assert self._task is not None
+        self._task.wait()
+        self._reset()
+
+
+class FusedAllReduceReducer:
+    """
+    All-reduces the gradients of ``parameters`` in data parallel during
+    backward. The parameters are assigned to FusedCommBuffer of at most
+    ``bucket_size`` bytes, and the gradient-ready hooks of parameters launch
+    the async all-reduce of each bucket once it is full, so communication
+    overlaps with the rest of backward.
+
+    Args:
+        parameters (list): The parameters whose gradients are all-reduced.
+        comm_group (Group): The data parallel group.
+        acc_steps (int, optional): The number of backward passes whose
+            gradients are accumulated before all-reduce. ``wait`` raises
+            RuntimeError if more backward passes are run. Default is 1.
+        bucket_size (int, optional): The max size in bytes of a bucket.
+            Default is 128MB.
+    """
+
+    def __init__(
+        self,
+        parameters,
+        comm_group,
+        acc_steps=1,
+        bucket_size=128 * 1024 * 1024,
+    ):
+        assert (
+            in_dygraph_mode()
+        ), "FusedAllReduceReducer only supports eager mode."
+        parameters = [param for param in parameters if param.trainable]
+        group_indices = core.eager_assign_group_by_size(
+            parameters, [False] * len(parameters), [bucket_size]
+        )
+        # NOTE: The gradients are ready roughly in the reversed order of
+        #       parameters, and the buckets are all-reduced in the same order
+        #       on all ranks.
+        self._buffers = [
+            FusedCommBuffer(
+                i, [parameters[j] for j in indices], comm_group, acc_steps
+            )
+            for i, indices in enumerate(reversed(group_indices))
+        ]
+        self._acc_steps = acc_steps
+        self._next_buffer = 0
+        self._has_grad = False
+        for buffer in self._buffers:
+            for param in buffer._params:
+                param._register_backward_hook(self._make_hook(buffer, param))
+
+    def _make_hook(self, buffer, param):
+        @framework.no_grad()
+        def hook():
+            self._has_grad = True
+            buffer.add_grad(param)
+            while (
+                self._next_buffer < len(self._buffers)
+                and self._buffers[self._next_buffer].is_ready
+            ):
+                self._buffers[self._next_buffer].comm_grads()
+                self._next_buffer += 1
+
+        return hook
+
+    @framework.no_grad()
+    def wait(self):
+        """
+        Waits until the gradients of all parameters are all-reduced. It is
+        called after the backward of the last micro batch, before the
+        gradients are used.
+        """
+        if not self._has_grad:
+            return
+        acc_steps = max(
+            max(buffer._params_step_dict.values(), default=0)
+            for buffer in self._buffers
+        )
+        for buffer in self._buffers[self._next_buffer :]:
+            buffer.flush()
+            buffer.comm_grads()
+        for buffer in self._buffers:
+            buffer.wait()
+        self._next_buffer = 0
+        self._has_grad = False
+        # NOTE: the gradients of the backward passes after acc_steps are
+        #       accumulated into the buffers during their all-reduce, so the
+        #       result is wrong, which can only be found here
+        if acc_steps > self._acc_steps:
+            raise RuntimeError(
+                "The gradients are accumulated for {} backward passes, but "
+                "all-reduced after {} backward passes. Please set acc_steps "
+                "to the number of accumulated backward passes, i.e. "
+                "dp_accumulate_steps of hybrid_configs, or accumulate_steps "
+                "of pipeline_configs in pipeline parallel.".format(
+                    acc_steps, self._acc_steps
+                )
+            )
+
+
 def sharding_reduce_gradients(parameter_list, hcg):
     # TODO allreduce --> reduce
     # TODO merge grad / nrank with dp
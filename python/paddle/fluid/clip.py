@@ -92,6 +92,14 @@ def _squared_l2_norm(x):
     return out
 
 
+def _can_coalesce(x):
+    # NOTE: coalesce_tensor supports float16 on devices only, and does not
+    #       support bfloat16
+    if x.dtype in [core.VarDesc.VarType.FP32, core.VarDesc.VarType.FP64]:
+        return True
+    return x.dtype == core.VarDesc.VarType.FP16 and not x.place.is_cpu_place()
+
+
 class BaseErrorClipAttr:
     def __str__(self):
         raise NotImplementedError()
@@ -484,8 +492,109 @@ class ClipGradByGlobalNorm(ClipGradBase):
     def __str__(self):
         return "Gradient Clip By GlobalNorm, global_norm=%f" % (self.clip_norm)
 
+    @imperative_base.no_grad
+    def _eager_dygraph_clip(self, params_grads):
+        # NOTE: The dense gradients of each dtype are copied into one buffer by
+        #       coalesce_tensor, so that the squared norm and the scaling take
+        #       one kernel per dtype instead of one per gradient. The clipped
+        #       gradients are views of the buffers, and auto_skip_clip is done
+        #       by a where on device, so there is no synchronization with host.
+        new_grads = []
+        fused_indices = {}
+        unfused_indices = []
+        sum_square_list = []
+        for i, (p, g) in enumerate(params_grads):
+            new_grads.append(g)
+            if g is None or getattr(p, 'need_clip', True) is False:
+                continue
+            if g.is_selected_rows():
+                merge_grad = layers.merge_selected_rows(g)
+                merge_grad = merge_grad._get_tensor_from_selected_rows()
+                sum_square_list.append(_squared_l2_norm(merge_grad))
+                unfused_indices.append(i)
+            elif _can_coalesce(g):
+                fused_indices.setdefault(g.dtype, []).append(i)
+            else:
+                sum_square_list.append(_squared_l2_norm(g))
+                unfused_indices.append(i)
+
+        # all parameters have been filterd out
+        if len(sum_square_list) + len(fused_indices) == 0:
+            return params_grads
+
+        buffers = []
+        for dtype, indices in fused_indices.items():
+            grads, buffer = _C_ops.coalesce_tensor(
+                [new_grads[i] for i in indices],
+                dtype,
+                True,
+                False,
+                False,
+                0.0,
+                False,
+                -1,
+                -1,
+                [],
+                [],
+            )
+            for i, grad in zip(indices, grads):
+                new_grads[i] = grad
+            sum_square_list.append(_squared_l2_norm(buffer))
+            buffers.append(buffer)
+
+        sum_dtype = core.VarDesc.VarType.FP32
+        if any(s.dtype == core.VarDesc.VarType.FP64 for s in sum_square_list):
+            sum_dtype = core.VarDesc.VarType.FP64
+        global_norm_var = paddle.add_n(
+            [
+                s if s.dtype == sum_dtype else s.astype(sum_dtype)
+                for s in sum_square_list
+            ]
+        )
+        global_norm_var = paddle.sqrt(global_norm_var)
+        max_global_norm = layers.fill_constant(
+            shape=[1], dtype=global_norm_var.dtype, value=self.clip_norm
+        )
+        if not self.auto_skip_clip:
+            clip_var = max_global_norm / paddle.maximum(
+                global_norm_var, max_global_norm
+            )
+        else:
+            # NOTE: the ratio is 1.0 when global_norm_var <= max_global_norm,
+            #       which keeps the gradients unchanged
+            clip_var = paddle.where(
+                global_norm_var > max_global_norm,
+                max_global_norm / global_norm_var,
+                paddle.ones_like(global_norm_var),
+            )
+
+        for buffer in buffers:
+            clip_input = (
+                clip_var.astype(buffer.dtype)
+                if clip_var.dtype != buffer.dtype
+                else clip_var
+            )
+            # assign into buffer in place, which keeps the views of it valid
+            paddle.assign(_C_ops.multiply(buffer, clip_input), buffer)
+        for i in unfused_indices:
+            g = new_grads[i]
+            clip_input = (
+                clip_var.astype(g.dtype)
+                if clip_var.dtype != g.dtype
+                else clip_var
+            )
+            new_grads[i] = layers.elementwise_mul(g, clip_input)
+
+        return [
+            (p, g)
+            for (p, _), g in zip(params_grads, new_grads)
+            if g is not None
+        ]
+
     @imperative_base.no_grad
     def _dygraph_clip(self, params_grads):
+        if in_dygraph_mode():
+            return self._eager_dygraph_clip(params_grads)
         params_and_grads = []
         sum_square_list = []
         sum_square_list_fp16 = []
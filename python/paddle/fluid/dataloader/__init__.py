@@ -24,9 +24,13 @@ from .dataloader_iter import *
 from . import sampler
 from .sampler import *
 
+from . import record_dataset
+from .record_dataset import *
+
 __all__ = (
     dataset.__all__
     + batch_sampler.__all__
     + dataloader_iter.__all__
     + sampler.__all__
+    + record_dataset.__all__
 )
@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import numpy as np
+import copy
 import math
+import itertools
 
 from .sampler import Sampler, SequenceSampler, RandomSampler
 from .dataset import Dataset, IterableDataset
 
-__all__ = ["BatchSampler", "DistributedBatchSampler"]
+__all__ = ["BatchSampler", "DistributedBatchSampler", "BucketedBatchSampler"]
 
 
 class BatchSampler(Sampler):
@@ -142,14 +144,40 @@ class BatchSampler(Sampler):
         )
         self.drop_last = drop_last
 
+        # number of batches generated in current epoch, and the number
+        # of batches to skip in next epoch set by set_state_dict
+        self._num_consumed_batches = 0
+        self._resume_num_consumed_batches = None
+
     def __iter__(self):
+        # NOTE: sampler iterator is created eagerly, so that the sampler
+        #       state of this epoch can be got once iterator created
+        num_skip_samples = 0
+        if self._resume_num_consumed_batches is not None:
+            self._num_consumed_batches = self._resume_num_consumed_batches
+            self._resume_num_consumed_batches = None
+            if not hasattr(self.sampler, 'set_state_dict'):
+                # sampler without state can only be skipped by replaying
+                num_skip_samples = self._num_consumed_batches * self.batch_size
+        else:
+            self._num_consumed_batches = 0
+        sampler_iter = iter(self.sampler)
+        if num_skip_samples > 0:
+            sampler_iter = itertools.islice(
+                sampler_iter, num_skip_samples, None
+            )
+        return self._iter_batches(sampler_iter)
+
+    def _iter_batches(self, sampler_iter):
         batch_indices = []
-        for idx in self.sampler:
+        for idx in sampler_iter:
             batch_indices.append(idx)
             if len(batch_indices) == self.batch_size:
+                self._num_consumed_batches += 1
                 yield batch_indices
                 batch_indices = []
         if not self.drop_last and len(batch_indices) > 0:
+            self._num_consumed_batches += 1
             yield batch_indices
 
     def __len__(self):
@@ -157,6 +185,69 @@ class BatchSampler(Sampler):
         num_samples += int(not self.drop_last) * (self.batch_size - 1)
         return num_samples // self.batch_size
 
+    def state_dict(self):
+        """
+        Get the iteration state of the batch sampler, which contains the
+        state of :attr:`sampler` (if :attr:`sampler` implements
+        :code:`state_dict`) and the number of batches generated in current
+        epoch.
+
+        .. note::
+            Batches generated by batch sampler may be prefetched and not
+            consumed yet in :code:`paddle.io.DataLoader`, use
+            :code:`DataLoader.state_dict` to get the state by batches
+            actually consumed.
+
+        Returns:
+            dict: the state of the batch sampler.
+
+        Examples:
+
+            .. code-block:: python
+
+                from paddle.io import BatchSampler
+
+                bs = BatchSampler(dataset=list(range(100)), shuffle=True,
+                                  batch_size=8)
+                it = iter(bs)
+                first = next(it)
+                state = bs.state_dict()
+
+                resumed = BatchSampler(dataset=list(range(100)), shuffle=True,
+                                       batch_size=8)
+                resumed.set_state_dict(state)
+                # resumed batch sampler yields the same batches as it
+                assert list(resumed) == list(it)
+        """
+        sampler_state = None
+        if hasattr(self.sampler, 'state_dict'):
+            sampler_state = self.sampler.state_dict()
+        return {
+            'sampler': sampler_state,
+            'num_consumed_batches': self._num_consumed_batches,
+        }
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state got by :code:`state_dict`, the next
+        iteration of the batch sampler will start from the next batch of
+        the recorded state. If :attr:`sampler` implements
+        :code:`set_state_dict`, consumed batches are skipped without
+        replaying, otherwise consumed indices will be drawn and dropped.
+
+        Args:
+            state_dict(dict): the state of the batch sampler.
+        """
+        num_consumed_batches = state_dict.get('num_consumed_batches', 0)
+        sampler_state = state_dict.get('sampler')
+        if hasattr(self.sampler, 'set_state_dict'):
+            sampler_state = dict(sampler_state or {})
+            sampler_state['num_consumed'] = (
+                num_consumed_batches * self.batch_size
+            )
+            self.sampler.set_state_dict(sampler_state)
+        self._resume_num_consumed_batches = num_consumed_batches
+
 
 class _InfiniteIterableSampler:
     def __init__(self, dataset, batch_size=1):
@@ -171,6 +262,24 @@ class _InfiniteIterableSampler:
             yield [None] * self.batch_size
 
 
+class _SubsetBatchSampler:
+    """
+    Batch sampler yielding the first :attr:`num_batches` mini-batches of
+    a batch sampler, used to build the loader for auto tuning. The batch
+    sampler is copied so that iterating does not change its epoch.
+    """
+
+    def __init__(self, batch_sampler, num_batches):
+        self.batch_sampler = copy.copy(batch_sampler)
+        self.num_batches = num_batches
+
+    def __iter__(self):
+        return itertools.islice(iter(self.batch_sampler), self.num_batches)
+
+    def __len__(self):
+        return min(len(self.batch_sampler), self.num_batches)
+
+
 class DistributedBatchSampler(BatchSampler):
     """Sampler that restricts data loading to a subset of the dataset.
 
@@ -273,7 +382,19 @@ class DistributedBatchSampler(BatchSampler):
         self.num_samples = int(math.ceil(len(self.dataset) * 1.0 / self.nranks))
         self.total_size = self.num_samples * self.nranks
 
+        # epoch used to shuffle indices in current iteration
+        self._iter_epoch = 0
+        self._num_consumed_batches = 0
+        self._resume_num_consumed_batches = None
+
     def __iter__(self):
+        num_consumed_batches = 0
+        if self._resume_num_consumed_batches is not None:
+            num_consumed_batches = self._resume_num_consumed_batches
+            self._resume_num_consumed_batches = None
+        self._num_consumed_batches = num_consumed_batches
+        self._iter_epoch = self.epoch
+
         num_samples = len(self.dataset)
         indices = np.arange(num_samples).tolist()
         indices += indices[: (self.total_size - len(indices))]
@@ -310,22 +431,44 @@ class DistributedBatchSampler(BatchSampler):
             indices = _get_indices_by_batch_size(indices)
 
         assert len(indices) == self.num_samples
-        _sample_iter = iter(indices)
-
-        batch_indices = []
-        for idx in _sample_iter:
-            batch_indices.append(idx)
-            if len(batch_indices) == self.batch_size:
-                yield batch_indices
-                batch_indices = []
-        if not self.drop_last and len(batch_indices) > 0:
-            yield batch_indices
+        # NOTE: batches of a rank are contiguous in indices, consumed
+        #       batches can be skipped by slicing directly
+        _sample_iter = iter(indices[num_consumed_batches * self.batch_size :])
+        return self._iter_batches(_sample_iter)
 
     def __len__(self):
         num_samples = self.num_samples
         num_samples += int(not self.drop_last) * (self.batch_size - 1)
         return num_samples // self.batch_size
 
+    def state_dict(self):
+        """
+        Get the iteration state of the batch sampler, which contains the
+        epoch used to shuffle indices in current iteration and the number
+        of batches generated in current epoch.
+
+        Returns:
+            dict: the state of the batch sampler.
+        """
+        return {
+            'epoch': self._iter_epoch,
+            'num_consumed_batches': self._num_consumed_batches,
+        }
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state got by :code:`state_dict`, the next
+        iteration of the batch sampler will shuffle indices by the recorded
+        epoch and start from the next batch of the recorded state.
+
+        Args:
+            state_dict(dict): the state of the batch sampler.
+        """
+        self.epoch = state_dict.get('epoch', self.epoch)
+        self._resume_num_consumed_batches = state_dict.get(
+            'num_consumed_batches', 0
+        )
+
     def set_epoch(self, epoch):
         """
         Sets the epoch number. When :attr:`shuffle=True`, this number is used
@@ -364,3 +507,325 @@ class DistributedBatchSampler(BatchSampler):
                     sampler.set_epoch(epoch)
         """
         self.epoch = epoch
+
+
+class BucketedBatchSampler(BatchSampler):
+    """
+    Batch sampler which groups samples with similar lengths into the same
+    mini-batch to reduce padding of variable length data (e.g. sentences
+    in NLP tasks), batch size is dynamic and bounded by a token budget.
+
+    Samples are grouped into length buckets by :attr:`bucket_boundaries`,
+    then each bucket is split into mini-batches greedily: a sample is
+    added to current mini-batch if the padded token number of the
+    mini-batch, i.e. ``max length * sample number``, does not exceed
+    :attr:`max_tokens` and the sample number does not exceed
+    :attr:`batch_size`, otherwise a new mini-batch is started. A sample
+    longer than :attr:`max_tokens` is put in a mini-batch by itself.
+
+    Mini-batches are sharded across :attr:`num_replicas` processes like
+    :ref:`api_paddle_io_DistributedBatchSampler`, all processes generate
+    the same mini-batches from the same :attr:`seed` and epoch, and the
+    ``i``-th mini-batch is assigned to the process with rank
+    ``i % num_replicas``.
+
+    .. note::
+        Dataset is assumed to be of constant size and sample lengths are
+        computed only once in initialization.
+
+    Args:
+        dataset(Dataset): this could be an instance of subclass of :ref:`api_paddle_io_Dataset`
+            or other python object which implemented :code:`__len__` and
+            :code:`__getitem__`.
+        lengths(list|numpy.ndarray, optional): the length of each sample in
+            :attr:`dataset`. Default None, computed by :attr:`length_fn`.
+        length_fn(callable, optional): function to compute the length of a
+            sample, it is called with each sample got from :attr:`dataset`
+            if :attr:`lengths` is not set. Only one of :attr:`lengths` and
+            :attr:`length_fn` should be set. Default None.
+        max_tokens(int, optional): the max padded token number of a
+            mini-batch. Default None, not bounded.
+        batch_size(int, optional): the max sample number of a mini-batch.
+            At least one of :attr:`max_tokens` and :attr:`batch_size`
+            should be set. Default None, not bounded.
+        bucket_boundaries(list, optional): increasing upper bounds
+            (exclusive) of the length buckets, samples with length in
+            ``[bucket_boundaries[i-1], bucket_boundaries[i])`` are grouped
+            into the ``i``-th bucket, samples not shorter than the last
+            boundary are grouped into the last bucket. Default None, all
+            samples are sorted by length, which minimizes padding at the
+            cost of less randomness of mini-batch composition.
+        num_replicas(int, optional): porcess number in distributed training.
+            If :attr:`num_replicas` is None, :attr:`num_replicas` will be
+            retrieved from :ref:`api_paddle_distributed_ParallelEnv` .
+            Default None.
+        rank(int, optional): the rank of the current process among :attr:`num_replicas`
+            processes. If :attr:`rank` is None, :attr:`rank` is retrieved from
+            :ref:`api_paddle_distributed_ParallelEnv`. Default None.
+        shuffle(bool, optional): whether to shuffle samples in each bucket
+            and the order of mini-batches. Default False.
+        drop_last(bool, optional): whether to drop the tail mini-batches
+            which cannot be evenly assigned to all processes, otherwise
+            mini-batches from the beginning are repeated to pad.
+            Default False.
+        seed(int, optional): the random seed for shuffling, the seed of an
+            epoch is ``seed + epoch``. Default 0.
+
+    Returns:
+        BucketedBatchSampler, return an iterable object for indices iterating.
+
+    Examples:
+        .. code-block:: python
+
+            import numpy as np
+
+            from paddle.io import Dataset, DataLoader, BucketedBatchSampler
+
+            class RandomSentenceDataset(Dataset):
+                def __init__(self, num_samples):
+                    self.lengths = np.random.randint(5, 100, [num_samples])
+
+                def __getitem__(self, idx):
+                    return np.random.randint(0, 1000, [self.lengths[idx]])
+
+                def __len__(self):
+                    return len(self.lengths)
+
+            dataset = RandomSentenceDataset(1000)
+            batch_sampler = BucketedBatchSampler(dataset,
+                                                 lengths=dataset.lengths,
+                                                 max_tokens=1024,
+                                                 bucket_boundaries=[20, 50],
+                                                 shuffle=True)
+
+            for epoch in range(2):
+                batch_sampler.set_epoch(epoch)
+                for batch_indices in batch_sampler:
+                    # samples in a mini-batch have similar lengths
+                    print(dataset.lengths[batch_indices])
+    """
+
+    def __init__(
+        self,
+        dataset,
+        lengths=None,
+        length_fn=None,
+        max_tokens=None,
+        batch_size=None,
+        bucket_boundaries=None,
+        num_replicas=None,
+        rank=None,
+        shuffle=False,
+        drop_last=False,
+        seed=0,
+    ):
+        self.dataset = dataset
+
+        assert (lengths is None) != (
+            length_fn is None
+        ), "only one of lengths and length_fn should be set"
+        if lengths is None:
+            assert callable(length_fn), "length_fn should be callable"
+            lengths = [length_fn(dataset[i]) for i in range(len(dataset))]
+        self.lengths = np.asarray(lengths, dtype='int64').reshape([-1])
+        assert len(self.lengths) == len(dataset), (
+            "lengths should have the same size as dataset, but got {} "
+            "and {}".format(len(self.lengths), len(dataset))
+        )
+
+        assert (
+            max_tokens is not None or batch_size is not None
+        ), "at least one of max_tokens and batch_size should be set"
+        assert max_tokens is None or (
+            isinstance(max_tokens, int) and max_tokens > 0
+        ), "max_tokens should be a positive integer"
+        assert batch_size is None or (
+            isinstance(batch_size, int) and batch_size > 0
+        ), "batch_size should be a positive integer"
+        self.max_tokens = max_tokens
+        self.batch_size = batch_size
+
+        if bucket_boundaries is not None:
+            bucket_boundaries = list(bucket_boundaries)
+            assert all(
+                a < b for a, b in zip(bucket_boundaries, bucket_boundaries[1:])
+            ), "bucket_boundaries should be increasing"
+        self.bucket_boundaries = bucket_boundaries
+
+        assert isinstance(shuffle, bool), "shuffle should be a boolean value"
+        self.shuffle = shuffle
+        assert isinstance(
+            drop_last, bool
+        ), "drop_last should be a boolean number"
+        self.drop_last = drop_last
+        assert isinstance(seed, int), "seed should be an integer"
+        self.seed = seed
+
+        from paddle.fluid.dygraph.parallel import ParallelEnv
+
+        if num_replicas is not None:
+            assert (
+                isinstance(num_replicas, int) and num_replicas > 0
+            ), "num_replicas should be a positive integer"
+            self.nranks = num_replicas
+        else:
+            self.nranks = ParallelEnv().nranks
+
+        if rank is not None:
+            assert (
+                isinstance(rank, int) and rank >= 0
+            ), "rank should be a non-negative integer"
+            self.local_rank = rank
+        else:
+            self.local_rank = ParallelEnv().local_rank
+
+        self.epoch = 0
+        # epoch used to generate mini-batches in current iteration, epoch
+        # is increased when iteration starts if shuffle, __len__ should
+        # use this epoch while iterating
+        self._iter_epoch = 0
+        self._iterating = False
+        self._num_consumed_batches = 0
+        self._resume_num_consumed_batches = None
+        # mini-batches of local rank cached by epoch, as __len__ and
+        # __iter__ of the same epoch need the same batches
+        self._cached_epoch = None
+        self._cached_batches = None
+
+    def _split_bucket(self, indices):
+        batches = []
+        batch_indices = []
+        max_length = 0
+        for idx in indices:
+            length = int(self.lengths[idx])
+            new_max_length = max(max_length, length)
+            if len(batch_indices) > 0 and (
+                (
+                    self.max_tokens is not None
+                    and new_max_length * (len(batch_indices) + 1)
+                    > self.max_tokens
+                )
+                or (
+                    self.batch_size is not None
+                    and len(batch_indices) >= self.batch_size
+                )
+            ):
+                batches.append(batch_indices)
+                batch_indices = []
+                new_max_length = length
+            batch_indices.append(int(idx))
+            max_length = new_max_length
+        if len(batch_indices) > 0:
+            batches.append(batch_indices)
+        return batches
+
+    def _generate_batches(self, epoch):
+        rng = np.random.RandomState(self.seed + epoch) if self.shuffle else None
+        if self.bucket_boundaries is None:
+            indices = np.arange(len(self.lengths))
+            if rng is not None:
+                indices = rng.permutation(indices)
+            # NOTE: stable sort keeps the shuffled order of samples with
+            #       the same length
+            buckets = [
+                indices[np.argsort(self.lengths[indices], kind='stable')]
+            ]
+        else:
+            bucket_ids = np.searchsorted(
+                self.bucket_boundaries, self.lengths, side='right'
+            )
+            buckets = []
+            for bucket_id in range(len(self.bucket_boundaries) + 1):
+                indices = np.nonzero(bucket_ids == bucket_id)[0]
+                if rng is not None:
+                    indices = rng.permutation(indices)
+                buckets.append(indices)
+
+        batches = []
+        for indices in buckets:
+            batches.extend(self._split_bucket(indices))
+        if rng is not None:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+
+        # shard mini-batches to ranks
+        if self.nranks > 1 and len(batches) > 0:
+            if self.drop_last:
+                batches = batches[: len(batches) // self.nranks * self.nranks]
+            else:
+                num_pad = -len(batches) % self.nranks
+                batches += [batches[i % len(batches)] for i in range(num_pad)]
+            batches = batches[self.local_rank :: self.nranks]
+        return batches
+
+    def _get_batches(self, epoch):
+        if self._cached_epoch != epoch:
+            self._cached_batches = self._generate_batches(epoch)
+            self._cached_epoch = epoch
+        return self._cached_batches
+
+    def __iter__(self):
+        num_consumed_batches = 0
+        if self._resume_num_consumed_batches is not None:
+            num_consumed_batches = self._resume_num_consumed_batches
+            self._resume_num_consumed_batches = None
+        self._num_consumed_batches = num_consumed_batches
+        self._iter_epoch = self.epoch
+
+        batches = self._get_batches(self.epoch)
+        if self.shuffle:
+            self.epoch += 1
+        self._iterating = True
+        return self._iter_batch_list(batches[num_consumed_batches:])
+
+    def _iter_batch_list(self, batches):
+        try:
+            for batch_indices in batches:
+                self._num_consumed_batches += 1
+                yield batch_indices
+        finally:
+            self._iterating = False
+
+    def __len__(self):
+        epoch = self._iter_epoch if self._iterating else self.epoch
+        return len(self._get_batches(epoch))
+
+    def state_dict(self):
+        """
+        Get the iteration state of the batch sampler, which contains the
+        epoch used to generate mini-batches in current iteration and the
+        number of mini-batches generated in current epoch.
+
+        Returns:
+            dict: the state of the batch sampler.
+        """
+        return {
+            'epoch': self._iter_epoch,
+            'num_consumed_batches': self._num_consumed_batches,
+        }
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state got by :code:`state_dict`, the next
+        iteration of the batch sampler will generate mini-batches by the
+        recorded epoch and start from the next mini-batch of the recorded
+        state.
+
+        Args:
+            state_dict(dict): the state of the batch sampler.
+        """
+        self.epoch = state_dict.get('epoch', self.epoch)
+        self._resume_num_consumed_batches = state_dict.get(
+            'num_consumed_batches', 0
+        )
+
+    def set_epoch(self, epoch):
+        """
+        Sets the epoch number. When :attr:`shuffle=True`, ``seed + epoch``
+        is used as the random seed to shuffle samples and mini-batches, all
+        processes should set the same epoch to generate the same
+        mini-batches.
+
+        Arguments:
+            epoch (int): Epoch number.
+        """
+        self.epoch = epoch
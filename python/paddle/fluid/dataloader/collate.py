@@ -108,3 +108,44 @@ def default_convert_fn(batch):
         return [default_convert_fn(d) for d in batch]
     else:
         return batch
+
+
+def default_columnar_collate_fn(batch):
+    """
+    Default batch collating function for :code:`paddle.io.DataLoader`
+    in columnar mode, which is used when the dataset implements
+    :code:`__getitems__` to return a whole batch at once. Input data
+    is already batched column by column, e.g.
+
+    {'id': np.array(shape=[4]), 'image': np.array(shape=[4, 3, 224, 224])}
+
+    Numpy array and paddle.Tensor columns are returned as is without
+    copying, columns given as list of numbers are converted to numpy
+    array, and dictionary or list of columns are parsed recursively.
+
+    Args:
+        batch(columnar batch data): batch data composed of list,
+            dictionary, numpy array and paddle.Tensor, each numpy array
+            and paddle.Tensor should contain the whole batch of a field.
+
+    Returns:
+        Batched data: batch data with each column as numpy array or
+                      paddle.Tensor.
+    """
+    if isinstance(batch, (np.ndarray, paddle.Tensor, core.eager.Tensor)):
+        return batch
+    elif isinstance(batch, (str, bytes, numbers.Number)):
+        return batch
+    elif isinstance(batch, Mapping):
+        return {key: default_columnar_collate_fn(batch[key]) for key in batch}
+    elif isinstance(batch, Sequence):
+        if len(batch) > 0 and all(
+            isinstance(field, numbers.Number) for field in batch
+        ):
+            return np.array(batch)
+        return [default_columnar_collate_fn(field) for field in batch]
+
+    raise TypeError(
+        "columnar batch data con only contains: tensor, numpy.ndarray, "
+        "dict, list, number, but got {}".format(type(batch))
+    )
@@ -20,6 +20,7 @@ import numbers
 import logging
 import itertools
 import threading
+import contextlib
 import numpy as np
 from collections import namedtuple
 from paddle.fluid.framework import (
@@ -43,7 +44,11 @@ from ..multiprocess_utils import (
 )
 from .fetcher import _IterableDatasetFetcher, _MapDatasetFetcher
 from .batch_sampler import _InfiniteIterableSampler
-from .collate import default_collate_fn, default_convert_fn
+from .collate import (
+    default_collate_fn,
+    default_convert_fn,
+    default_columnar_collate_fn,
+)
 from .worker import (
     ParentWatchDog,
     get_worker_info,
@@ -54,6 +59,12 @@ from .worker import (
     _ResumeIteration,
 )
 from .flat import _flatten_batch, _restore_batch
+from .shm_pool import (
+    _SharedMemoryBatch,
+    _SharedMemorySlotPool,
+    _SharedMemorySlotReader,
+)
+from .metrics import _PipelineMetrics
 from paddle.profiler.timer import benchmark
 
 __all__ = ['get_worker_info']
@@ -89,6 +100,122 @@ def _clear_loader():
 CleanupFuncRegistrar.register(_clear_loader)
 
 
+class _IterationState:
+    """
+    Iteration state of a DataLoader iterator: the state of batch sampler
+    at the beginning of current epoch and the number of batches output.
+    DataLoader keeps the state of the last iterator, so that the state
+    can still be got after the iterator is released, e.g. after breaking
+    out of the loop, where the state of batch sampler includes batches
+    prefetched by workers but not output.
+
+    Args:
+        batch_sampler(BatchSampler): the batch sampler of DataLoader.
+        sampler_state(dict|None): the state of batch sampler, None if
+            the batch sampler does not implement state_dict.
+    """
+
+    def __init__(self, batch_sampler, sampler_state):
+        self.batch_sampler = batch_sampler
+        self.sampler_state = sampler_state
+        self.num_yielded_batches = 0
+
+    def state_dict(self, num_yielded_batches=None):
+        if self.sampler_state is None:
+            raise NotImplementedError(
+                "state_dict is only supported when batch_sampler implements "
+                "state_dict, but got batch_sampler {}".format(
+                    type(self.batch_sampler)
+                )
+            )
+        if num_yielded_batches is None:
+            num_yielded_batches = self.num_yielded_batches
+        state = dict(self.sampler_state)
+        state['num_consumed_batches'] = (
+            self.sampler_state['num_consumed_batches'] + num_yielded_batches
+        )
+        return state
+
+
+class _OnlinePrefetchTuner:
+    """
+    Tune prefetch factor of multi-process DataLoader online. Blocking
+    queue depth and the time main process waits for data are recorded
+    in each step, for every :attr:`window` steps, prefetch factor is
+    increased if the blocking queue is often drained (consumer starved)
+    and decreased if the blocking queue always holds more than a round
+    of batches (memory wasted on over-prefetching).
+
+    Args:
+        prefetch_factor(int): the initial prefetch factor.
+        max_prefetch_factor(int): the upper bound of prefetch factor.
+        report(dict|None): auto tuning report of DataLoader, adjustments
+            will be appended to the 'online' field if not None.
+        window(int): the number of steps to decide an adjustment.
+    """
+
+    # steps drained ratio over which prefetch factor is increased
+    STARVED_RATIO = 0.1
+
+    def __init__(
+        self, prefetch_factor, max_prefetch_factor, report=None, window=50
+    ):
+        self.prefetch_factor = prefetch_factor
+        self.max_prefetch_factor = max_prefetch_factor
+        self.report = report
+        self.window = window
+        self._step = 0
+        self._reset_window()
+
+    def _reset_window(self):
+        self._window_steps = 0
+        self._drained_steps = 0
+        self._wait_time = 0.0
+        self._min_depth = None
+
+    def step(self, wait_time, queue_depth, round_size):
+        """
+        Record a step and return the prefetch factor to use.
+
+        Args:
+            wait_time(float): seconds main process waits for this step.
+            queue_depth(int): batch number in blocking queue before read.
+            round_size(int): batch number read in a step.
+        """
+        self._step += 1
+        self._window_steps += 1
+        self._wait_time += wait_time
+        if queue_depth < round_size:
+            self._drained_steps += 1
+        if self._min_depth is None or queue_depth < self._min_depth:
+            self._min_depth = queue_depth
+
+        if self._window_steps < self.window:
+            return self.prefetch_factor
+
+        drained_ratio = self._drained_steps / float(self._window_steps)
+        old_factor = self.prefetch_factor
+        if (
+            drained_ratio > self.STARVED_RATIO
+            and self.prefetch_factor < self.max_prefetch_factor
+        ):
+            self.prefetch_factor += 1
+        elif self._min_depth > round_size and self.prefetch_factor > 1:
+            self.prefetch_factor -= 1
+
+        if self.prefetch_factor != old_factor and self.report is not None:
+            self.report.setdefault('online', []).append(
+                {
+                    'step': self._step,
+                    'prefetch_factor': self.prefetch_factor,
+                    'drained_ratio': drained_ratio,
+                    'avg_wait_time': self._wait_time / self._window_steps,
+                }
+            )
+        self._reset_window()
+        return self.prefetch_factor
+
+
 class _DataLoaderIterBase:
     """
     Iterator implement of DataLoader, will load and feed mini-batch
@@ -102,6 +229,10 @@ class _DataLoaderIterBase:
         self._dataset = loader.dataset
         self._feed_list = loader.feed_list or []
         self._places = loader.places
+        # NOTE: in device prefetch mode, batches are read in CPU place and
+        #       copied to target place by _DevicePrefetcher
+        if loader._device_prefetch_depth > 0:
+            self._places = [core.CPUPlace()]
         self._return_list = loader.return_list
         self._batch_sampler = loader.batch_sampler
         self._drop_last = loader.drop_last
@@ -110,16 +241,34 @@ class _DataLoaderIterBase:
         self._use_buffer_reader = loader.use_buffer_reader
         self._prefetch_factor = loader.prefetch_factor
         self._use_shared_memory = loader.use_shared_memory
+        self._use_shared_memory_pool = (
+            loader.use_shared_memory_pool and self._use_shared_memory
+        )
         self._timeout = (
             loader.timeout if loader.timeout > 0 else MP_STATUS_CHECK_INTERVAL
         )
         self._worker_init_fn = loader.worker_init_fn
         self._dataset_kind = loader.dataset_kind
         self._pin_memory = loader.pin_memory
+        self._use_getitems = loader._use_getitems
+        # NOTE: metrics of pipeline stages shared with workers, metrics
+        #       of persistent workers are accumulated across epochs
+        self._metrics = None
+        if loader._collect_metrics:
+            self._metrics = _PipelineMetrics(self._num_workers)
 
         self._sampler_iter = iter(self._index_sampler)
+        # NOTE: batch sampler state is recorded once sampler iterator
+        #       created, batches consumed are counted when output, batches
+        #       prefetched and not output are not counted in state_dict
+        self._iteration_state = self._create_iteration_state()
         if self._auto_collate_batch:
-            self._collate_fn = loader.collate_fn or default_collate_fn
+            if self._use_getitems:
+                self._collate_fn = (
+                    loader.collate_fn or default_columnar_collate_fn
+                )
+            else:
+                self._collate_fn = loader.collate_fn or default_collate_fn
         else:
             self._collate_fn = loader.collate_fn or default_convert_fn
 
@@ -148,6 +297,38 @@ class _DataLoaderIterBase:
     def __len__(self):
         return len(self._batch_sampler)
 
+    def _stage(self, name):
+        if self._metrics is None:
+            return contextlib.nullcontext()
+        return self._metrics.stage(name)
+
+    def _record_next(self, wait_time, queue_depth):
+        if self._metrics is not None:
+            self._metrics.record('next_wait', wait_time)
+            self._metrics.record_occupancy('blocking_queue', queue_depth)
+
+    def _create_iteration_state(self):
+        sampler_state = None
+        if self._auto_collate_batch and hasattr(
+            self._batch_sampler, 'state_dict'
+        ):
+            sampler_state = self._batch_sampler.state_dict()
+        return _IterationState(self._batch_sampler, sampler_state)
+
+    def state_dict(self):
+        """
+        Get the iteration state of DataLoader, which contains the state of
+        batch sampler at the beginning of current epoch and the number of
+        batches consumed (output by the iterator), batches prefetched in
+        worker processes or blocking queue are not counted. Load the state
+        by :code:`DataLoader.set_state_dict` to resume iteration from the
+        next batch.
+
+        Returns:
+            dict: the state of DataLoader iteration.
+        """
+        return self._iteration_state.state_dict()
+
     def _exit_thread_expectedly(self):
         self._thread_done_event.set()
         if self._blocking_queue:
@@ -174,7 +355,9 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
             self._auto_collate_batch,
             self._collate_fn,
             self._drop_last,
+            self._use_getitems,
         )
+        self._dataset_fetcher.metrics = self._metrics
 
         # NOTE: _structrue_infos used to record the data structure of
         # batch to restore batch structure after reading Tensor
@@ -255,7 +438,8 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                 break
 
             # flat batch and record structure infos
-            batch, structure = _flatten_batch(batch)
+            with self._stage('flatten'):
+                batch, structure = _flatten_batch(batch)
             self._structure_infos.append(structure)
 
             if self._thread_done_event.is_set():
@@ -263,22 +447,24 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
 
             try:
                 # pack as LoDTensorArray
-                array = core.LoDTensorArray()
-                for slot in batch:
-                    if isinstance(slot, (paddle.Tensor, core.eager.Tensor)):
-                        slot = slot.value().get_tensor()
-                    elif not isinstance(slot, core.LoDTensor):
-                        tmp = core.LoDTensor()
-                        tmp.set(slot, core.CPUPlace())
-                        slot = tmp
-
-                    array.append(slot)
+                with self._stage('to_tensor'):
+                    array = core.LoDTensorArray()
+                    for slot in batch:
+                        if isinstance(slot, (paddle.Tensor, core.eager.Tensor)):
+                            slot = slot.value().get_tensor()
+                        elif not isinstance(slot, core.LoDTensor):
+                            tmp = core.LoDTensor()
+                            tmp.set(slot, core.CPUPlace())
+                            slot = tmp
+
+                        array.append(slot)
 
                 if self._thread_done_event.is_set():
                     break
 
                 try:
-                    self._blocking_queue.push(array)
+                    with self._stage('queue_push'):
+                        self._blocking_queue.push(array)
                 except:
                     self._exit_thread_expectedly()
 
@@ -298,6 +484,9 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
         try:
             benchmark().check_if_need_record(self)
             benchmark().before_reader()
+            if self._metrics is not None:
+                queue_depth = self._blocking_queue.size()
+                wait_start = time.perf_counter()
             if in_dygraph_mode():
                 data = core.eager.read_next_tensor_list(
                     self._reader.read_next_list()[0]
@@ -326,6 +515,9 @@ class _DataLoaderIterSingleProcess(_DataLoaderIterBase):
                             data = data[0]
                     else:
                         data = self._reader.read_next()
+            if self._metrics is not None:
+                self._record_next(time.perf_counter() - wait_start, queue_depth)
+            self._iteration_state.num_yielded_batches += len(self._places)
             benchmark().after_reader()
 
             return data
@@ -378,6 +570,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
         self._persistent_workers = loader._persistent_workers
         self._resume_worker_cnt = 0
+        # set by _thread_loop when all workers resumed in _reset
+        self._resume_done_event = threading.Event()
 
         assert (
             self._num_workers > 0
@@ -403,10 +597,31 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         # has at least "_prefetch_factor" indices, and outstanding batch cached
         # output data for at least "_prefetch_factor" iterations(Note that len(_places)
         # batches will be composed as an iteration output)
-        self._outstanding_capacity = self._prefetch_factor * max(
-            self._num_workers, len(self._places)
+        self._outstanding_unit = max(self._num_workers, len(self._places))
+        self._outstanding_capacity = (
+            self._prefetch_factor * self._outstanding_unit
         )
 
+        # NOTE: in online tuning mode, outstanding batch number is tuned
+        #       as _outstanding_target, and _outstanding_capacity is the
+        #       upper bound of _outstanding_target
+        self._online_tuner = None
+        self._outstanding_target = self._outstanding_capacity
+        if loader._online_tuning:
+            from ..reader import PREFETCH_FACTOR_CANDIDATES
+
+            max_prefetch_factor = max(
+                self._prefetch_factor, max(PREFETCH_FACTOR_CANDIDATES)
+            )
+            self._online_tuner = _OnlinePrefetchTuner(
+                self._prefetch_factor,
+                max_prefetch_factor,
+                loader.autotune_report,
+            )
+            self._outstanding_capacity = (
+                max_prefetch_factor * self._outstanding_unit
+            )
+
         # see _try_put_indices
         self._thread_lock = threading.Lock()
 
@@ -414,7 +629,7 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
 
         # init workers and indices queues and put 2 indices in each indices queue
         self._init_workers()
-        for _ in range(self._outstanding_capacity):
+        for _ in range(self._outstanding_target):
             self._try_put_indices()
 
         self._init_thread()
@@ -432,6 +647,20 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         # create data_queue for workers
         self._data_queue = multiprocessing.Queue()
 
+        # NOTE: in shared memory pool mode, each worker owns a pool of
+        #       reusable shared memory slots to write batches in, slot
+        #       number should cover the batches outstanding in a worker
+        self._shm_pools = []
+        self._shm_reader = None
+        if self._use_shared_memory_pool:
+            self._shm_pools = [
+                _SharedMemorySlotPool(
+                    i, self._prefetch_factor + 1, multiprocessing.SimpleQueue()
+                )
+                for i in range(self._num_workers)
+            ]
+            self._shm_reader = _SharedMemorySlotReader(self._shm_pools)
+
         # event for workers and thread, thread event is only need
         # in multi-processing mode
         self._workers_done_event = multiprocessing.Event()
@@ -456,6 +685,11 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._num_workers,
                     self._use_shared_memory,
                     self._base_seed,
+                    self._shm_pools[i] if self._shm_pools else None,
+                    self._use_getitems,
+                    self._metrics.worker_histograms[i]
+                    if self._metrics is not None
+                    else None,
                 ),
             )
             worker.daemon = True
@@ -512,13 +746,20 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         # 1. Resume workers, clear worker caches
         # put _ResumeIteration to all worker as resume iteration flag
         with self._thread_lock:
+            self._resume_done_event.clear()
             self._resume_worker_cnt = self._num_workers
             for worker_id in range(self._num_workers):
                 self._indices_queues[worker_id].put(_ResumeIteration())
                 self._batches_outstanding += 1
-        # all flag will be check in _thread_loop, simply wait here
-        while self._resume_worker_cnt > 0:
-            time.sleep(0.5)
+        # all flag will be check in _thread_loop, wait for the event set
+        # by _thread_loop instead of polling with a fixed interval, which
+        # delays the start of each epoch in persistent workers mode
+        while not self._resume_done_event.wait(self._timeout):
+            if self._thread is None or not self._thread.is_alive():
+                raise RuntimeError(
+                    "DataLoader reader thread exit unexpectedly when "
+                    "resuming workers for a new epoch"
+                )
 
         # 2. clear blocking_queue caches
         # in order not to restart the thread, we just clear
@@ -537,6 +778,11 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     data = self._reader.read_next()
 
         # 3. reset all states
+        # batches cached for order keeping in shared memory pool mode
+        # still occupy slots, release slots before dropping them
+        for info in self._task_infos.values():
+            if len(info) == 3 and isinstance(info[1], _SharedMemoryBatch):
+                self._shm_reader.release(info[1])
         self._send_idx = 0
         self._rcvd_idx = 0
         self._batches_outstanding = 0
@@ -549,7 +795,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         # 4. reset _sampler_iter and put prefetch indices to start next epoch
         # init workers and indices queues and put 2 indices in each indices queue
         self._sampler_iter = iter(self._index_sampler)
-        for _ in range(self._outstanding_capacity):
+        self._iteration_state = self._create_iteration_state()
+        for _ in range(self._outstanding_target):
             self._try_put_indices()
 
     def _shutdown_worker(self, worker_id, shutdown=False):
@@ -578,6 +825,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     for q in self._indices_queues:
                         q.cancel_join_thread()
                         q.close()
+                    if self._shm_reader is not None:
+                        self._shm_reader.close()
             finally:
                 core._erase_process_pids(id(self))
                 self._shutdown = True
@@ -592,7 +841,8 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
         _set_expected_place(legacy_expected_place)
 
         while not self._thread_done_event.is_set():
-            batch = self._get_data()
+            with self._stage('ipc_get'):
+                batch = self._get_data()
             if not self._thread_done_event.is_set():
                 if batch is None:
                     self._exit_thread_expectedly()
@@ -600,28 +850,17 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     if isinstance(batch, _ResumeIteration):
                         assert self._resume_worker_cnt > 0
                         self._resume_worker_cnt -= 1
+                        if self._resume_worker_cnt == 0:
+                            self._resume_done_event.set()
                         continue
                     try:
                         # pack as LoDTensorArray
-                        array = core.LoDTensorArray()
-                        if self._use_shared_memory:
-                            for tensor in batch:
-                                array.append(tensor)
-                        else:
-                            # LoDTensor not in shared memory is not
-                            # serializable, cannot be create in workers
-                            for slot in batch:
-                                if isinstance(
-                                    slot, (paddle.Tensor, core.eager.Tensor)
-                                ):
-                                    slot = slot.value().get_tensor()
-                                elif not isinstance(slot, core.LoDTensor):
-                                    tmp = core.LoDTensor()
-                                    tmp.set(slot, core.CPUPlace())
-                                    slot = tmp
-                                array.append(slot)
-
-                        if not self._blocking_queue.push(array):
+                        with self._stage('to_tensor'):
+                            array = self._pack_batch(batch)
+
+                        with self._stage('queue_push'):
+                            pushed = self._blocking_queue.push(array)
+                        if not pushed:
                             self._blocking_queue.close()
                     except Exception as e:
                         self._exit_thread_unexpectedly()
@@ -629,6 +868,40 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     finally:
                         self._rcvd_idx += 1
 
+    def _pack_batch(self, batch):
+        array = core.LoDTensorArray()
+        if isinstance(batch, _SharedMemoryBatch):
+            # NOTE: arrays read from slot are views of shared memory,
+            #       slot can be released after copying into LoDTensor.
+            #       No view should be kept after the slot is released,
+            #       the mapping is closed when the worker grows the slot
+            #       for a larger batch, which fails on exported views
+            arrays = []
+            try:
+                arrays = self._shm_reader.read(batch)
+                while arrays:
+                    tmp = core.LoDTensor()
+                    tmp.set(arrays.pop(0), core.CPUPlace())
+                    array.append(tmp)
+            finally:
+                del arrays
+                self._shm_reader.release(batch)
+        elif self._use_shared_memory:
+            for tensor in batch:
+                array.append(tensor)
+        else:
+            # LoDTensor not in shared memory is not serializable,
+            # cannot be create in workers
+            for slot in batch:
+                if isinstance(slot, (paddle.Tensor, core.eager.Tensor)):
+                    slot = slot.value().get_tensor()
+                elif not isinstance(slot, core.LoDTensor):
+                    tmp = core.LoDTensor()
+                    tmp.set(slot, core.CPUPlace())
+                    slot = tmp
+                array.append(slot)
+        return array
+
     def _get_data(self):
         while not self._thread_done_event.is_set():
             # For IterableDataset, batch indices is generated infinitely
@@ -811,6 +1084,10 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                     self._thread_done_event.set()
                     self._blocking_queue.close()
 
+            if self._online_tuner is not None or self._metrics is not None:
+                queue_depth = self._blocking_queue.size()
+                wait_start = time.time()
+
             if in_dygraph_mode():
                 data = core.eager.read_next_tensor_list(
                     self._reader.read_next_list()[0]
@@ -839,6 +1116,15 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
                             data = data[0]
                     else:
                         data = self._reader.read_next()
+            if self._online_tuner is not None or self._metrics is not None:
+                wait_time = time.time() - wait_start
+            if self._online_tuner is not None:
+                self._tune_outstanding(wait_time, queue_depth)
+            if self._metrics is not None:
+                self._record_next(wait_time, queue_depth)
+                self._metrics.record_occupancy(
+                    'outstanding_batches', self._batches_outstanding
+                )
             self._on_output_batch()
             benchmark().after_reader()
             return data
@@ -851,7 +1137,25 @@ class _DataLoaderIterMultiProcess(_DataLoaderIterBase):
             if in_profiler_mode():
                 trace_event.end()
 
+    def _tune_outstanding(self, wait_time, queue_depth):
+        prefetch_factor = self._online_tuner.step(
+            wait_time, queue_depth, len(self._places)
+        )
+        target = prefetch_factor * self._outstanding_unit
+        # NOTE: put more indices for a larger target here, for a smaller
+        #       target, indices are not put until outstanding batches
+        #       consumed below the target in _on_output_batch
+        increase = target - self._outstanding_target
+        self._outstanding_target = target
+        for _ in range(increase):
+            self._try_put_indices()
+
     def _on_output_batch(self):
+        self._iteration_state.num_yielded_batches += len(self._places)
         for _ in range(len(self._places)):
             self._batches_outstanding -= 1
-            self._try_put_indices()
+            if (
+                self._online_tuner is None
+                or self._batches_outstanding < self._outstanding_target
+            ):
+                self._try_put_indices()
@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import warnings
+import numpy as np
+
 import paddle
 from .. import framework
 
@@ -21,6 +25,7 @@ __all__ = [
     "TensorDataset",
     "ComposeDataset",
     "ChainDataset",
+    "ShardedFileDataset",
     "random_split",
     "Subset",
 ]
@@ -40,6 +45,15 @@ class Dataset:
     :code:`__len__`: return dataset sample number. This method is required
     by some implements of :code:`paddle.io.BatchSampler`
 
+    Subclasses can optionally implement following method:
+
+    :code:`__getitems__`: get a whole batch from dataset with a given list
+    of indices. If defined, :code:`paddle.io.DataLoader` calls it once per
+    batch instead of calling :code:`__getitem__` for each index, and the
+    returned data is treated as an already collated batch in columnar
+    format (e.g. a dict or list of numpy arrays whose first dimension is
+    the batch size), so no per-field stacking is performed.
+
     see :code:`paddle.io.DataLoader`.
 
     Examples:
@@ -66,6 +80,31 @@ class Dataset:
             for i in range(len(dataset)):
                 print(dataset[i])
 
+        .. code-block:: python
+
+            import numpy as np
+            from paddle.io import Dataset, DataLoader
+
+            # define a dataset which returns batches in columnar format
+            class ColumnarDataset(Dataset):
+                def __init__(self, num_samples):
+                    self.ids = np.arange(num_samples).astype('int64')
+                    self.values = np.random.random([num_samples]).astype('float32')
+
+                def __getitem__(self, idx):
+                    return {'id': self.ids[idx], 'value': self.values[idx]}
+
+                def __getitems__(self, indices):
+                    return {'id': self.ids[indices], 'value': self.values[indices]}
+
+                def __len__(self):
+                    return len(self.ids)
+
+            loader = DataLoader(ColumnarDataset(100), batch_size=16)
+            for data in loader:
+                print(data['id'].shape)  # [16]
+                break
+
     """
 
     def __init__(self):
@@ -424,6 +463,261 @@ class ChainDataset(IterableDataset):
                 yield sample
 
 
+def _read_lines(path):
+    with open(path, 'r') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+class ShardedFileDataset(IterableDataset):
+    """
+    An iterable-style dataset streaming samples from a list of files,
+    which partitions files across distributed processes and DataLoader
+    worker processes automatically, so that each file is read by only
+    one worker of one process in an epoch.
+
+    Files are partitioned into ``num_replicas * num_workers`` shards
+    deterministically: files are sorted by size in descending order and
+    each file is assigned to the shard with the least total size, which
+    balances bytes to read among shards even if file sizes are skewed.
+    All processes compute the same partition, the worker with id
+    ``worker_id`` in the process with rank ``rank`` reads the shard
+    ``rank * num_workers + worker_id``. If there are fewer files than
+    shards, some workers read no file.
+
+    Samples of the files in a shard are read by :attr:`read_fn` as a
+    stream. If :attr:`shuffle` is True, the order of files in a shard
+    and the assignment of shards are shuffled, and samples are shuffled
+    by a buffer holding at most :attr:`buffer_size` samples, randomness
+    of an epoch is determined by ``seed + epoch``.
+
+    .. note::
+        Epoch number is increased after each iteration of this dataset
+        object when :attr:`shuffle` is True. In multi-process mode of
+        DataLoader, each worker iterates a copy of the dataset, please
+        call :code:`set_epoch` at the beginning of each epoch to reseed
+        (not needed with :attr:`persistent_workers` of DataLoader, in
+        which case the copies in workers increase epoch by themselves).
+
+    Args:
+        files(list of str): paths of the files to read.
+        read_fn(callable, optional): function called with a file path and
+            returns an iterable of samples in the file, e.g. a generator.
+            Default None, read lines of text file as samples with trailing
+            newline removed.
+        shuffle(bool, optional): whether to shuffle files and samples.
+            Default False.
+        buffer_size(int, optional): the size of the buffer to shuffle
+            samples, only used when :attr:`shuffle` is True. A larger
+            buffer gives better randomness and holds more samples in
+            memory. Default 1000.
+        seed(int, optional): the random seed for shuffling. Default 0.
+        num_replicas(int, optional): process number in distributed
+            training. If :attr:`num_replicas` is None, :attr:`num_replicas`
+            will be retrieved from :ref:`api_paddle_distributed_ParallelEnv`.
+            Default None.
+        rank(int, optional): the rank of the current process among
+            :attr:`num_replicas` processes. If :attr:`rank` is None,
+            :attr:`rank` is retrieved from
+            :ref:`api_paddle_distributed_ParallelEnv`. Default None.
+
+    Returns:
+        IterableDataset: a dataset streaming samples of the shard of
+        current process and worker.
+
+    Examples:
+
+        .. code-block:: python
+
+            import os
+            import json
+            import tempfile
+            import numpy as np
+            from paddle.io import ShardedFileDataset, DataLoader
+
+            data_dir = tempfile.mkdtemp()
+            files = []
+            for i in range(4):
+                path = os.path.join(data_dir, 'part-{}.jsonl'.format(i))
+                with open(path, 'w') as f:
+                    for j in range(10):
+                        f.write(json.dumps({'x': i * 10 + j}) + '\n')
+                files.append(path)
+
+            def read_fn(path):
+                with open(path) as f:
+                    for line in f:
+                        yield np.array([json.loads(line)['x']])
+
+            dataset = ShardedFileDataset(files, read_fn=read_fn, shuffle=True,
+                                         buffer_size=16)
+            loader = DataLoader(dataset, batch_size=4, num_workers=2)
+            for epoch in range(2):
+                dataset.set_epoch(epoch)
+                for data in loader:
+                    print(data)
+    """
+
+    def __init__(
+        self,
+        files,
+        read_fn=None,
+        shuffle=False,
+        buffer_size=1000,
+        seed=0,
+        num_replicas=None,
+        rank=None,
+    ):
+        self.files = list(files)
+        assert len(self.files) > 0, "files should not be empty"
+        assert read_fn is None or callable(
+            read_fn
+        ), "read_fn should be callable"
+        self.read_fn = read_fn or _read_lines
+        assert isinstance(shuffle, bool), "shuffle should be a boolean value"
+        self.shuffle = shuffle
+        assert (
+            isinstance(buffer_size, int) and buffer_size > 0
+        ), "buffer_size should be a positive integer"
+        self.buffer_size = buffer_size
+        assert isinstance(seed, int), "seed should be an integer"
+        self.seed = seed
+
+        from paddle.fluid.dygraph.parallel import ParallelEnv
+
+        if num_replicas is not None:
+            assert (
+                isinstance(num_replicas, int) and num_replicas > 0
+            ), "num_replicas should be a positive integer"
+            self.nranks = num_replicas
+        else:
+            self.nranks = ParallelEnv().nranks
+
+        if rank is not None:
+            assert (
+                isinstance(rank, int) and rank >= 0
+            ), "rank should be a non-negative integer"
+            self.local_rank = rank
+        else:
+            self.local_rank = ParallelEnv().local_rank
+
+        self.epoch = 0
+        # file sizes are got once in the process creating the dataset, so
+        # that all workers partition files by the same sizes
+        self._file_sizes = [self._get_file_size(f) for f in self.files]
+
+    @staticmethod
+    def _get_file_size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            # files not on local file system are balanced by number
+            return 1
+
+    def _partition(self, num_shards):
+        # NOTE: longest processing time first, sort by (-size, path) to
+        #       break ties deterministically on all processes
+        order = sorted(
+            range(len(self.files)),
+            key=lambda i: (-self._file_sizes[i], self.files[i]),
+        )
+        shard_sizes = np.zeros([num_shards], dtype='int64')
+        shards = [[] for _ in range(num_shards)]
+        for i in order:
+            shard_id = int(np.argmin(shard_sizes))
+            shards[shard_id].append(i)
+            shard_sizes[shard_id] += self._file_sizes[i]
+        return shards
+
+    def get_shard_files(self, worker_id=0, num_workers=1, epoch=None):
+        """
+        Get the files to read by the worker :attr:`worker_id` of current
+        process in the epoch :attr:`epoch`.
+
+        Args:
+            worker_id(int, optional): the DataLoader worker id. Default 0.
+            num_workers(int, optional): the DataLoader worker number.
+                Default 1.
+            epoch(int, optional): the epoch number. Default None, use the
+                current epoch.
+
+        Returns:
+            list of str: the files of the shard in reading order.
+        """
+        if epoch is None:
+            epoch = self.epoch
+        num_shards = self.nranks * num_workers
+        shards = self._partition(num_shards)
+        shard_id = self.local_rank * num_workers + worker_id
+        if not self.shuffle:
+            return [self.files[i] for i in sorted(shards[shard_id])]
+
+        rng = np.random.RandomState(self.seed + epoch)
+        shard_id = int(rng.permutation(num_shards)[shard_id])
+        indices = shards[shard_id]
+        return [self.files[i] for i in rng.permutation(indices)]
+
+    def _iter_samples(self, files):
+        for path in files:
+            for sample in self.read_fn(path):
+                yield sample
+
+    def _shuffle_samples(self, samples, rng):
+        buffer = []
+        for sample in samples:
+            if len(buffer) < self.buffer_size:
+                buffer.append(sample)
+                continue
+            idx = rng.randint(self.buffer_size)
+            yield buffer[idx]
+            buffer[idx] = sample
+        rng.shuffle(buffer)
+        for sample in buffer:
+            yield sample
+
+    def __iter__(self):
+        from .worker import get_worker_info
+
+        worker_info = get_worker_info()
+        worker_id, num_workers = 0, 1
+        if worker_info is not None:
+            worker_id, num_workers = worker_info.id, worker_info.num_workers
+
+        epoch = self.epoch
+        files = self.get_shard_files(worker_id, num_workers, epoch)
+        if len(files) == 0:
+            warnings.warn(
+                "no file to read in worker {} of rank {}, there are {} files "
+                "for {} shards".format(
+                    worker_id,
+                    self.local_rank,
+                    len(self.files),
+                    self.nranks * num_workers,
+                )
+            )
+
+        samples = self._iter_samples(files)
+        if self.shuffle:
+            self.epoch += 1
+            # NOTE: workers and ranks shuffle samples by different seeds
+            rng = np.random.RandomState(
+                [self.seed + epoch, self.local_rank, worker_id]
+            )
+            samples = self._shuffle_samples(samples, rng)
+        return samples
+
+    def set_epoch(self, epoch):
+        """
+        Sets the epoch number. When :attr:`shuffle=True`, ``seed + epoch``
+        is used as the random seed to shuffle files and samples, all
+        processes should set the same epoch.
+
+        Args:
+            epoch (int): Epoch number.
+        """
+        self.epoch = epoch
+
+
 class Subset(Dataset):
     """
     Subset of a dataset at specified indices.
@@ -0,0 +1,257 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import time
+import queue
+import threading
+
+import paddle
+from .. import core
+from ..framework import _set_expected_place, _current_expected_place
+from .dataloader_iter import _IterationState
+
+from collections.abc import Sequence, Mapping
+
+# NOTE: interval to check done event when putting to a full queue
+_PUT_CHECK_INTERVAL = 0.1
+# NOTE: max seconds to wait for thread exit on shutdown, thread may be
+#       blocked in reading next batch from iterator
+_SHUTDOWN_TIMEOUT = 5
+
+
+class _PrefetchEnd:
+    pass
+
+
+class _PrefetchError:
+    def __init__(self, exc_info):
+        self.exc_info = exc_info
+
+
+class _PrefetchStats:
+    """
+    Metrics of the device prefetch stage. DataLoader keeps the metrics of
+    the last stage, so that they can still be got after the stage is
+    released, e.g. after the loop over DataLoader is finished.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.num_batches = 0
+        self.copy_time = 0.0
+        self.max_copy_time = 0.0
+        self.stall_time = 0.0
+        self.queue_depth_sum = 0
+
+    def to_dict(self, queue_depth=0):
+        with self.lock:
+            return {
+                'num_batches': self.num_batches,
+                'queue_depth': queue_depth,
+                'avg_queue_depth': self.queue_depth_sum
+                / max(self.num_batches, 1),
+                'copy_time': self.copy_time,
+                'max_copy_time': self.max_copy_time,
+                'stall_time': self.stall_time,
+            }
+
+
+def _to_place(data, place, pin_memory):
+    if isinstance(data, (paddle.Tensor, core.eager.Tensor)):
+        if pin_memory:
+            data = data.pin_memory()
+        return data._copy_to(place, False)
+    elif isinstance(data, Mapping):
+        return {k: _to_place(v, place, pin_memory) for k, v in data.items()}
+    elif isinstance(data, Sequence) and not isinstance(data, str):
+        return [_to_place(v, place, pin_memory) for v in data]
+    return data
+
+
+def _put(out_queue, done_event, item):
+    while not done_event.is_set():
+        try:
+            out_queue.put(item, timeout=_PUT_CHECK_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+# NOTE: thread loop does not hold a reference to _DevicePrefetcher, so that
+#       the stage can be released (which sets done_event and stops the
+#       thread) once the loop over it is broken, instead of keeping the
+#       inner iterator and its worker processes alive
+def _prefetch_loop(
+    iterator,
+    place,
+    pin_memory,
+    out_queue,
+    done_event,
+    stats,
+    legacy_expected_place,
+):
+    core.set_current_thread_name("DevicePrefetch_" + str(id(out_queue)))
+    _set_expected_place(legacy_expected_place)
+
+    while not done_event.is_set():
+        try:
+            data = next(iterator)
+            start = time.time()
+            data = _to_place(data, place, pin_memory)
+            copy_time = time.time() - start
+        except StopIteration:
+            _put(out_queue, done_event, _PrefetchEnd())
+            return
+        except:
+            _put(out_queue, done_event, _PrefetchError(sys.exc_info()))
+            return
+
+        with stats.lock:
+            stats.copy_time += copy_time
+            stats.max_copy_time = max(stats.max_copy_time, copy_time)
+        if not _put(out_queue, done_event, data):
+            return
+
+
+class _DevicePrefetcher:
+    """
+    Device prefetch stage on the output of a DataLoader iterator. Batches
+    are read from :attr:`iterator` in CPU place and copied to the target
+    place by a thread, at most :attr:`depth` batches are kept resident on
+    the target place, so that copy of next batches is overlapped with the
+    computing of current step.
+
+    Host tensors are copied to pinned memory before copying to CUDA place
+    asynchronously. On CPU place the stage performs a plain copy, which
+    makes the stage testable on CPU-only machines.
+
+    Metrics of the stage can be got by :code:`stats`, including the queue
+    depth when batches are taken, the copy time in thread and the stall
+    time main process waited for an empty queue.
+
+    Args:
+        iterator(_DataLoaderIterBase): the iterator reading batches in CPU
+            place.
+        place(Place): the target place to copy batches to.
+        depth(int): the max number of batches resident on target place.
+        pin_memory(bool): whether to copy to pinned memory before copying
+            to CUDA place. Default True.
+    """
+
+    def __init__(self, iterator, place, depth, pin_memory=True):
+        assert depth > 0, "depth of device prefetch should be positive"
+        self._iterator = iterator
+        self._place = place
+        self._depth = depth
+        self._pin_memory = pin_memory and isinstance(place, core.CUDAPlace)
+
+        self._queue = queue.Queue(maxsize=depth)
+        self._done_event = threading.Event()
+        # NOTE: thread exits after putting the end flag, nothing will be
+        #       put to the queue after it is taken
+        self._exhausted = False
+        self._stats = _PrefetchStats()
+        # NOTE: batches buffered in this stage have been output by the
+        #       inner iterator but not consumed yet, count the batches
+        #       output by this stage instead
+        self._iteration_state = None
+        inner_state = getattr(iterator, '_iteration_state', None)
+        if inner_state is not None:
+            self._iteration_state = _IterationState(
+                inner_state.batch_sampler, inner_state.sampler_state
+            )
+
+        self._thread = threading.Thread(
+            target=_prefetch_loop,
+            args=(
+                iterator,
+                place,
+                self._pin_memory,
+                self._queue,
+                self._done_event,
+                self._stats,
+                _current_expected_place(),
+            ),
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._exhausted:
+            raise StopIteration
+        queue_depth = self._queue.qsize()
+        start = time.time()
+        data = self._queue.get()
+        stall_time = time.time() - start
+
+        if isinstance(data, _PrefetchEnd):
+            self._exhausted = True
+            self._done_event.set()
+            raise StopIteration
+        if isinstance(data, _PrefetchError):
+            self._exhausted = True
+            self._done_event.set()
+            raise data.exc_info[1].with_traceback(data.exc_info[2])
+
+        with self._stats.lock:
+            self._stats.num_batches += 1
+            if self._iteration_state is not None:
+                self._iteration_state.num_yielded_batches += 1
+            self._stats.stall_time += stall_time
+            self._stats.queue_depth_sum += queue_depth
+        return data
+
+    def __len__(self):
+        return len(self._iterator)
+
+    def state_dict(self):
+        if self._iteration_state is None:
+            raise NotImplementedError(
+                "state_dict is only supported when the inner iterator "
+                "records iteration state, but got iterator {}".format(
+                    type(self._iterator)
+                )
+            )
+        with self._stats.lock:
+            return self._iteration_state.state_dict()
+
+    def stats(self):
+        """
+        Get the metrics of the device prefetch stage.
+
+        Returns:
+            dict: the metrics, including ``num_batches`` (batches output),
+                ``queue_depth`` (current batches resident on target place),
+                ``avg_queue_depth`` (average batches resident when a batch
+                is taken), ``copy_time``/``max_copy_time`` (total and max
+                seconds of copying batches to target place) and
+                ``stall_time`` (total seconds waiting for an empty queue).
+        """
+        return self._stats.to_dict(self._queue.qsize())
+
+    def shutdown(self):
+        self._done_event.set()
+        if self._thread is not None and (
+            self._thread is not threading.current_thread()
+        ):
+            self._thread.join(timeout=_SHUTDOWN_TIMEOUT)
+        self._thread = None
+
+    def __del__(self):
+        self._done_event.set()
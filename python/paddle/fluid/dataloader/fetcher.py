@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 import logging
 from ..log_helper import get_logger
 from collections.abc import Sequence, Mapping
@@ -25,6 +26,9 @@ class _DatasetFetcher:
         self.auto_collate_batch = auto_collate_batch
         self.collate_fn = collate_fn
         self.drop_last = drop_last
+        # recorder of stage latencies with a `record(stage, seconds)`
+        # method set by DataLoader iterator, None for not recording
+        self.metrics = None
 
     # NOTE: fetch function here perform the whole pipeline of dataset
     #       reading and data trasforms of a batch in each calling, this
@@ -40,6 +44,18 @@ class _DatasetFetcher:
             "'fetch' not implement for class {}".format(self.__class__.__name__)
         )
 
+    def _collate(self, data, start):
+        # record latency of getitem stage starting from start and
+        # latency of collate_fn
+        if self.metrics is not None:
+            collate_start = time.perf_counter()
+            self.metrics.record('getitem', collate_start - start)
+        if self.collate_fn:
+            data = self.collate_fn(data)
+        if self.metrics is not None:
+            self.metrics.record('collate', time.perf_counter() - collate_start)
+        return data
+
     def _log_warning(self):
         # only log warning on GPU 0 when distributed launch
         from ...distributed import get_world_size, get_rank
@@ -86,7 +102,7 @@ class _IterableDatasetFetcher(_DatasetFetcher):
         self.dataset_iter = iter(dataset)
 
     def fetch(self, batch_indices, done_event=None):
-
+        start = time.perf_counter()
         if self.auto_collate_batch:
             data = []
             for _ in batch_indices:
@@ -110,17 +126,37 @@ class _IterableDatasetFetcher(_DatasetFetcher):
         else:
             data = next(self.dataset_iter)
 
-        if self.collate_fn:
-            data = self.collate_fn(data)
-        return data
+        return self._collate(data, start)
+
+
+def _has_getitems(dataset):
+    return callable(getattr(dataset, '__getitems__', None))
 
 
 class _MapDatasetFetcher(_DatasetFetcher):
-    def __init__(self, dataset, auto_collate_batch, collate_fn, drop_last):
+    def __init__(
+        self,
+        dataset,
+        auto_collate_batch,
+        collate_fn,
+        drop_last,
+        use_getitems=None,
+    ):
         super().__init__(dataset, auto_collate_batch, collate_fn, drop_last)
+        # NOTE: dataset implements __getitems__ returns a whole batch
+        #       in columnar format, get batch data by a single calling
+        #       instead of calling __getitem__ for each index
+        if use_getitems is None:
+            use_getitems = _has_getitems(dataset)
+        self.use_getitems = use_getitems
 
     def fetch(self, batch_indices, done_event=None):
-        if self.auto_collate_batch:
+        start = time.perf_counter()
+        if self.auto_collate_batch and self.use_getitems:
+            if done_event is not None and done_event.is_set():
+                return None
+            data = self.dataset.__getitems__(batch_indices)
+        elif self.auto_collate_batch:
             data = []
             for idx in batch_indices:
                 if done_event is None or not done_event.is_set():
@@ -135,6 +171,4 @@ class _MapDatasetFetcher(_DatasetFetcher):
         else:
             data = self.dataset[batch_indices]
 
-        if self.collate_fn:
-            data = self.collate_fn(data)
-        return data
+        return self._collate(data, start)
@@ -0,0 +1,217 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import bisect
+import multiprocessing
+import numpy as np
+
+import paddle.profiler as profiler
+from paddle.profiler.utils import in_profiler_mode
+
+# NOTE: stages of DataLoader pipeline whose latencies are recorded:
+#       getitem: reading samples by dataset.__getitem__/__getitems__
+#       collate: merging samples by collate_fn
+#       flatten: flattening batch into fields by _flatten_batch
+#       ipc_put: putting batch into data queue in worker
+#       ipc_get: getting batch from data queue in reader thread
+#       to_tensor: converting batch fields to LoDTensor in reader thread
+#       queue_push: pushing batch into blocking queue in reader thread
+#       next_wait: waiting for a batch in DataLoader iterator __next__
+_STAGES = [
+    'getitem',
+    'collate',
+    'flatten',
+    'ipc_put',
+    'ipc_get',
+    'to_tensor',
+    'queue_push',
+    'next_wait',
+]
+_STAGE_INDEX = {stage: i for i, stage in enumerate(_STAGES)}
+
+# NOTE: upper bounds in seconds of latency histogram buckets, buckets
+#       are exponential from 1us to about 33s, latencies larger than
+#       the last bound fall into an extra overflow bucket
+_TIME_BUCKET_BOUNDS = [1e-6 * 2**i for i in range(26)]
+_NUM_TIME_BUCKETS = len(_TIME_BUCKET_BOUNDS) + 1
+# NOTE: each stage holds bucket counts, latency sum and latency max
+_SUM_OFFSET = _NUM_TIME_BUCKETS
+_MAX_OFFSET = _NUM_TIME_BUCKETS + 1
+_STAGE_SIZE = _NUM_TIME_BUCKETS + 2
+
+_RANGE_PREFIX = "DataLoader::"
+
+
+class _StageHistograms:
+    """
+    Latency histograms of all pipeline stages stored in a flat float64
+    array. If :attr:`shared` is True, the array is allocated in shared
+    memory and can be passed to a worker process, so that the worker
+    records into it and the main process reads it without messages.
+    Each array should be written by a single process.
+    """
+
+    def __init__(self, shared=False):
+        size = len(_STAGES) * _STAGE_SIZE
+        if shared:
+            self._raw = multiprocessing.RawArray('d', size)
+            self._data = np.frombuffer(self._raw, dtype='float64')
+        else:
+            self._raw = None
+            self._data = np.zeros([size], dtype='float64')
+
+    def __getstate__(self):
+        assert (
+            self._raw is not None
+        ), "only shared _StageHistograms can be passed to subprocess"
+        return {'_raw': self._raw}
+
+    def __setstate__(self, state):
+        self._raw = state['_raw']
+        self._data = np.frombuffer(self._raw, dtype='float64')
+
+    def record(self, stage, seconds):
+        base = _STAGE_INDEX[stage] * _STAGE_SIZE
+        data = self._data
+        data[base + bisect.bisect_left(_TIME_BUCKET_BOUNDS, seconds)] += 1
+        data[base + _SUM_OFFSET] += seconds
+        if seconds > data[base + _MAX_OFFSET]:
+            data[base + _MAX_OFFSET] = seconds
+
+    def values(self):
+        return self._data.reshape([len(_STAGES), _STAGE_SIZE]).copy()
+
+
+def _summary(counts, bounds, total=None, max_value=None):
+    num = int(counts.sum())
+    cumsum = np.cumsum(counts)
+
+    def percentile(p):
+        # upper bound of the bucket containing the percentile, which is
+        # no larger than the max value recorded
+        bucket = int(np.searchsorted(cumsum, p * num))
+        if bucket >= len(bounds):
+            return max_value if max_value is not None else bounds[-1]
+        if max_value is not None:
+            return min(bounds[bucket], max_value)
+        return bounds[bucket]
+
+    summary = {
+        'count': num,
+        'p50': percentile(0.5),
+        'p90': percentile(0.9),
+        'p99': percentile(0.99),
+        'histogram': [
+            (bound, int(count))
+            for bound, count in zip(list(bounds) + [float('inf')], counts)
+            if count > 0
+        ],
+    }
+    if total is not None:
+        summary['total'] = total
+        summary['mean'] = total / num
+    if max_value is not None:
+        summary['max'] = max_value
+    return summary
+
+
+class _PipelineMetrics:
+    """
+    Metrics of DataLoader pipeline, including latency histograms of each
+    stage and occupancy histograms of queues.
+
+    Stages in main process (reader thread and iterator) are recorded in a
+    local histogram, and stages in each worker process are recorded in a
+    shared memory histogram of the worker. If profiler is enabled, stages
+    in main process are also recorded as named ranges
+    :code:`DataLoader::<stage>` of :code:`paddle.profiler`.
+
+    Args:
+        num_workers(int): the number of worker processes.
+    """
+
+    def __init__(self, num_workers=0):
+        self._local = _StageHistograms()
+        self.worker_histograms = [
+            _StageHistograms(shared=True) for _ in range(num_workers)
+        ]
+        # queue name -> list of counts of each occupancy value
+        self._occupancy = {}
+
+    def record(self, stage, seconds):
+        self._local.record(stage, seconds)
+
+    def record_occupancy(self, name, size):
+        counts = self._occupancy.setdefault(name, [])
+        if size >= len(counts):
+            counts.extend([0] * (size + 1 - len(counts)))
+        counts[size] += 1
+
+    def stage(self, name):
+        """
+        Context manager recording the latency of a stage in main process.
+        """
+        return _StageRange(self, name)
+
+    def summary(self):
+        values = self._local.values()
+        for histograms in self.worker_histograms:
+            worker_values = histograms.values()
+            values[:, :_MAX_OFFSET] += worker_values[:, :_MAX_OFFSET]
+            values[:, _MAX_OFFSET] = np.maximum(
+                values[:, _MAX_OFFSET], worker_values[:, _MAX_OFFSET]
+            )
+
+        summary = {}
+        for i, stage in enumerate(_STAGES):
+            counts = values[i, :_NUM_TIME_BUCKETS]
+            if counts.sum() == 0:
+                continue
+            summary[stage] = _summary(
+                counts,
+                _TIME_BUCKET_BOUNDS,
+                total=float(values[i, _SUM_OFFSET]),
+                max_value=float(values[i, _MAX_OFFSET]),
+            )
+        for name, counts in self._occupancy.items():
+            counts = np.array(counts)
+            summary[name] = _summary(counts, list(range(len(counts))))
+            summary[name]['mean'] = float(
+                (counts * np.arange(len(counts))).sum() / counts.sum()
+            )
+        return summary
+
+
+class _StageRange:
+    def __init__(self, metrics, name):
+        self._metrics = metrics
+        self._name = name
+        self._event = None
+
+    def __enter__(self):
+        if in_profiler_mode():
+            self._event = profiler.RecordEvent(
+                name=_RANGE_PREFIX + self._name,
+                event_type=profiler.TracerEventType.Dataloader,
+            )
+            self._event.begin()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self._metrics.record(self._name, time.perf_counter() - self._start)
+        if self._event is not None:
+            self._event.end()
+        return False
@@ -0,0 +1,275 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import json
+import mmap
+import numbers
+import numpy as np
+
+import paddle
+from .dataset import Dataset
+from .flat import _flatten_batch, FIELD_PREFIX
+
+from collections.abc import Sequence, Mapping
+
+__all__ = ["MMapRecordDataset", "write_record_dataset"]
+
+_RECORD_VERSION = 1
+# NOTE: byte alignment of each array in data file
+_RECORD_ALIGNMENT = 64
+_DATA_SUFFIX = '.bin'
+_INDEX_SUFFIX = '.idx'
+
+
+def _align(nbytes):
+    return (
+        (nbytes + _RECORD_ALIGNMENT - 1)
+        // _RECORD_ALIGNMENT
+        * _RECORD_ALIGNMENT
+    )
+
+
+def _to_arrays(sample):
+    # convert numbers and Tensors in sample to numpy array, so that each
+    # value is stored as a field in data file instead of in structure
+    if isinstance(sample, np.ndarray):
+        return sample
+    elif isinstance(sample, (paddle.Tensor, paddle.fluid.core.eager.Tensor)):
+        return sample.numpy()
+    elif isinstance(sample, numbers.Number):
+        return np.asarray(sample)
+    elif isinstance(sample, (str, bytes)):
+        raise TypeError(
+            "MMapRecordDataset only supports numpy array, paddle.Tensor "
+            "and number fields, but got {}".format(type(sample))
+        )
+    elif isinstance(sample, Mapping):
+        return {k: _to_arrays(v) for k, v in sample.items()}
+    elif isinstance(sample, Sequence):
+        return [_to_arrays(v) for v in sample]
+    raise TypeError(
+        "MMapRecordDataset only supports numpy array, paddle.Tensor "
+        "and number fields, but got {}".format(type(sample))
+    )
+
+
+def _build_sample(structure, fields):
+    # build a new sample from structure instead of restoring in place,
+    # for structure is shared among all samples
+    if isinstance(structure, str) and structure.startswith(FIELD_PREFIX):
+        return fields[int(structure[len(FIELD_PREFIX) :])]
+    elif isinstance(structure, Mapping):
+        return {k: _build_sample(v, fields) for k, v in structure.items()}
+    elif isinstance(structure, Sequence) and not isinstance(
+        structure, (str, bytes)
+    ):
+        return [_build_sample(v, fields) for v in structure]
+    return structure
+
+
+def write_record_dataset(dataset, path):
+    """
+    Write a map-style dataset into record files which can be loaded by
+    :code:`paddle.io.MMapRecordDataset`. Two files are written: the data
+    file :code:`path + '.bin'` which contains raw bytes of all fields of
+    all samples, and the index file :code:`path + '.idx'` which contains
+    the sample structure, dtype of each field, and the offset and shape
+    of each field in each sample.
+
+    All samples should have the same structure, and fields in the same
+    position should have the same dtype and dimension number, shape of
+    fields can be different among samples. Fields can be numpy array,
+    paddle.Tensor or number, number fields are loaded as 0-D numpy array.
+
+    Args:
+        dataset(Dataset): the map-style dataset to write, should implement
+            :code:`__getitem__` and :code:`__len__`.
+        path(str): path prefix of the record files.
+
+    Returns:
+        None
+
+    Examples:
+
+        .. code-block:: python
+
+            import numpy as np
+            from paddle.io import Dataset, write_record_dataset
+
+            class RandomDataset(Dataset):
+                def __init__(self, num_samples):
+                    self.num_samples = num_samples
+
+                def __getitem__(self, idx):
+                    image = np.random.random([784]).astype('float32')
+                    label = np.random.randint(0, 9, (1, )).astype('int64')
+                    return image, label
+
+                def __len__(self):
+                    return self.num_samples
+
+            write_record_dataset(RandomDataset(10), 'random_dataset')
+    """
+    num_samples = len(dataset)
+    assert num_samples > 0, "dataset to write should not be empty"
+
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.exists(dirname):
+        os.makedirs(dirname)
+
+    structure = None
+    dtypes = None
+    offsets = None
+    shapes = None
+    offset = 0
+    with open(path + _DATA_SUFFIX, 'wb') as f:
+        for idx in range(num_samples):
+            fields, sample_structure = _flatten_batch(_to_arrays(dataset[idx]))
+            if structure is None:
+                structure = sample_structure
+                dtypes = [field.dtype.str for field in fields]
+                offsets = np.zeros([num_samples, len(fields)], dtype='int64')
+                shapes = [
+                    np.zeros([num_samples, field.ndim], dtype='int64')
+                    for field in fields
+                ]
+            elif (
+                sample_structure != structure
+                or [field.dtype.str for field in fields] != dtypes
+            ):
+                raise ValueError(
+                    "sample {} has different structure or dtypes with "
+                    "sample 0, all samples should be in same format".format(idx)
+                )
+
+            for i, field in enumerate(fields):
+                if field.ndim != shapes[i].shape[1]:
+                    raise ValueError(
+                        "field {} of sample {} has different dimension "
+                        "number with sample 0".format(i, idx)
+                    )
+                data = np.ascontiguousarray(field).tobytes()
+                f.write(data)
+                f.write(b'\0' * (_align(len(data)) - len(data)))
+                offsets[idx, i] = offset
+                shapes[i][idx] = field.shape
+                offset += _align(len(data))
+
+    meta = {
+        'version': _RECORD_VERSION,
+        'num_samples': num_samples,
+        'structure': structure,
+        'dtypes': dtypes,
+    }
+    arrays = {'shape_{}'.format(i): shape for i, shape in enumerate(shapes)}
+    with open(path + _INDEX_SUFFIX, 'wb') as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), offsets=offsets, **arrays)
+
+
+class MMapRecordDataset(Dataset):
+    """
+    Map-style dataset reading record files written by
+    :code:`paddle.io.write_record_dataset`. The data file is memory mapped,
+    each field of a sample is returned as a read-only numpy array view on
+    the mapped memory located by the index, without read syscall or copy.
+
+    As the data file is mapped rather than read into process memory, all
+    DataLoader worker processes share the same OS page cache of the file
+    instead of holding a private copy each. The file is mapped lazily on
+    first access in each process.
+
+    Args:
+        path(str): path prefix of the record files, the same as the
+            :attr:`path` of :code:`paddle.io.write_record_dataset`.
+
+    Returns:
+        Dataset: a Dataset reading samples from record files.
+
+    Examples:
+
+        .. code-block:: python
+
+            import numpy as np
+            from paddle.io import (TensorDataset, MMapRecordDataset,
+                                   write_record_dataset)
+            import paddle
+
+            images = np.random.random([10, 784]).astype('float32')
+            labels = np.random.randint(0, 9, (10, 1)).astype('int64')
+            write_record_dataset(TensorDataset([paddle.to_tensor(images),
+                                                paddle.to_tensor(labels)]),
+                                 'mnist_records')
+
+            dataset = MMapRecordDataset('mnist_records')
+            for i in range(len(dataset)):
+                image, label = dataset[i]
+                print(image.shape, label)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path + _INDEX_SUFFIX, 'rb') as f:
+            index = np.load(f)
+            meta = json.loads(str(index['meta']))
+            self._offsets = index['offsets']
+            self._shapes = [
+                index['shape_{}'.format(i)] for i in range(len(meta['dtypes']))
+            ]
+        if meta['version'] != _RECORD_VERSION:
+            raise ValueError(
+                "unsupported record file version {}".format(meta['version'])
+            )
+        self._num_samples = meta['num_samples']
+        self._structure = meta['structure']
+        self._dtypes = [np.dtype(dtype) for dtype in meta['dtypes']]
+        self._buffer = None
+
+    def _get_buffer(self):
+        if self._buffer is None:
+            with open(self.path + _DATA_SUFFIX, 'rb') as f:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._buffer
+
+    def __getstate__(self):
+        # NOTE: do not pickle mapped buffer to worker processes, each
+        #       process maps the data file by itself
+        state = self.__dict__.copy()
+        state['_buffer'] = None
+        return state
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self._num_samples
+        if idx < 0 or idx >= self._num_samples:
+            raise IndexError(
+                "index {} out of range of MMapRecordDataset with {} "
+                "samples".format(idx, self._num_samples)
+            )
+        buffer = self._get_buffer()
+        fields = []
+        for i, dtype in enumerate(self._dtypes):
+            shape = tuple(self._shapes[i][idx])
+            fields.append(
+                np.ndarray(
+                    shape,
+                    dtype=dtype,
+                    buffer=buffer,
+                    offset=int(self._offsets[idx, i]),
+                )
+            )
+        return _build_sample(self._structure, fields)
+
+    def __len__(self):
+        return self._num_samples
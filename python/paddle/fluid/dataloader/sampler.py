@@ -94,6 +94,79 @@ class Sampler:
     # is not needed in same sence, e.g. paddle.io.IterableDataset
 
 
+class _SamplerState:
+    """
+    Record the iteration state of a sampler for checkpointing: the state
+    of numpy random generator to generate indices of current epoch, the
+    number of epochs started and the number of indices consumed in current
+    epoch. After :code:`set_state_dict`, the next epoch started will use
+    the recorded random state and skip the consumed indices directly
+    instead of replaying.
+
+    Args:
+        use_random_state(bool): whether the sampler generates indices
+            randomly and need a random state for each epoch.
+    """
+
+    def __init__(self, use_random_state=True):
+        self.use_random_state = use_random_state
+        self.random_state = None
+        self.epoch = 0
+        self.num_consumed = 0
+        self._resume_state = None
+
+    def start_epoch(self):
+        """
+        Start a new epoch, return the random generator to generate indices
+        and the start index position.
+        """
+        generator = None
+        resume_state, self._resume_state = self._resume_state, None
+        # NOTE: state saved before the first epoch started has no random
+        #       state, the epoch is started freshly
+        if resume_state is not None and (
+            resume_state['random_state'] is not None
+            or not self.use_random_state
+        ):
+            self.random_state = resume_state['random_state']
+            self.epoch = resume_state['epoch']
+            self.num_consumed = resume_state['num_consumed']
+            if self.use_random_state:
+                generator = np.random.RandomState()
+                generator.set_state(self.random_state)
+        else:
+            if resume_state is not None:
+                self.epoch = resume_state['epoch']
+            # NOTE: indices are drawn from global numpy random state as
+            #       before, so that indices under np.random.seed are not
+            #       changed, the state is recorded to draw them again
+            if self.use_random_state:
+                self.random_state = np.random.get_state()
+                generator = np.random
+            self.epoch += 1
+            self.num_consumed = 0
+        return generator, self.num_consumed
+
+    def iter_indices(self, indices):
+        for idx in indices[self.num_consumed :]:
+            self.num_consumed += 1
+            yield idx
+
+    def state_dict(self):
+        return {
+            'random_state': self.random_state,
+            'epoch': self.epoch,
+            'num_consumed': self.num_consumed,
+        }
+
+    def set_state_dict(self, state_dict):
+        self._resume_state = {
+            'random_state': state_dict.get('random_state'),
+            'epoch': state_dict.get('epoch', self.epoch),
+            'num_consumed': state_dict.get('num_consumed', 0),
+        }
+
+
 class SequenceSampler(Sampler):
     """
     Iterate samples sequentially, yield :code:`0, 1, 2, ..., len(data_source) -1`
@@ -135,13 +208,37 @@ class SequenceSampler(Sampler):
 
     def __init__(self, data_source):
         self.data_source = data_source
+        self._state = _SamplerState(use_random_state=False)
 
     def __iter__(self):
-        return iter(range(len(self.data_source)))
+        self._state.start_epoch()
+        return self._state.iter_indices(range(len(self.data_source)))
 
     def __len__(self):
         return len(self.data_source)
 
+    def state_dict(self):
+        """
+        Get the iteration state of the sampler, which contains the number
+        of epochs started and the number of indices consumed in current
+        epoch.
+
+        Returns:
+            dict: the state of the sampler.
+        """
+        return self._state.state_dict()
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state got by :code:`state_dict`, the next
+        iteration of the sampler will start from the next index of the
+        recorded state.
+
+        Args:
+            state_dict(dict): the state of the sampler.
+        """
+        self._state.set_state_dict(state_dict)
+
 
 class RandomSampler(Sampler):
     """
@@ -194,6 +291,7 @@ class RandomSampler(Sampler):
         self.replacement = replacement
         self._num_samples = num_samples
         self.generator = generator
+        self._state = _SamplerState()
 
         if not isinstance(self.replacement, bool):
             raise TypeError(
@@ -220,30 +318,77 @@ class RandomSampler(Sampler):
 
     def __iter__(self):
         n = len(self.data_source)
+        random_state, start = self._state.start_epoch()
         if self.generator:
-            for i in range(self.num_samples):
-                try:
-                    index = next(self.generator)
-                except StopIteration:
-                    return
-                yield index
+            return self._iter_generator(start)
+
+        # NOTE: indices are generated eagerly by the random state of this
+        #       epoch, so that the state can be got once iterator created
+        if self.replacement:
+            indices = random_state.choice(
+                np.arange(n), self.num_samples, replace=True
+            )
         else:
-            if self.replacement:
-                for index in np.random.choice(
-                    np.arange(n), self.num_samples, replace=True
-                ).tolist():
-                    yield index
-            else:
-                for index in np.random.choice(
-                    np.arange(n), n, replace=False
-                ).tolist():
-                    yield index
+            indices = random_state.choice(np.arange(n), n, replace=False)
+        return self._state.iter_indices(indices.tolist())
+
+    def _iter_generator(self, start):
+        # indices drawn from user generator can only be skipped by replaying
+        for i in range(self.num_samples):
+            try:
+                index = next(self.generator)
+            except StopIteration:
+                return
+            if i < start:
+                continue
+            self._state.num_consumed += 1
+            yield index
 
     def __len__(self):
         return self.num_samples
 
+    def state_dict(self):
+        """
+        Get the iteration state of the sampler, which contains the numpy
+        random state to generate indices of current epoch, the number of
+        epochs started and the number of indices consumed in current epoch.
+
+        Returns:
+            dict: the state of the sampler.
+
+        Examples:
+
+            .. code-block:: python
+
+                from paddle.io import RandomSampler
 
-def _weighted_sample(weights, num_samples, replacement=True):
+                sampler = RandomSampler(data_source=list(range(100)))
+                it = iter(sampler)
+                first = [next(it) for _ in range(10)]
+                state = sampler.state_dict()
+
+                resumed = RandomSampler(data_source=list(range(100)))
+                resumed.set_state_dict(state)
+                # resumed sampler yields the same indices as it
+                assert list(resumed) == list(it)
+        """
+        return self._state.state_dict()
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state got by :code:`state_dict`, the next
+        iteration of the sampler will generate indices by the recorded
+        random state and start from the next index of the recorded state without
+        replaying consumed indices (except indices drawn from a user
+        specified :attr:`generator`, which can only be replayed).
+
+        Args:
+            state_dict(dict): the state of the sampler.
+        """
+        self._state.set_state_dict(state_dict)
+
+
+def _weighted_sample(weights, num_samples, replacement=True, random_state=None):
     if isinstance(weights, core.LoDTensor):
         weights = weights.numpy()
     if isinstance(weights, (list, tuple)):
@@ -266,9 +411,10 @@ def _weighted_sample(weights, num_samples, replacement=True):
         )
 
     weights = weights / weights.sum(axis=1)
+    random_state = random_state or np.random
     rets = []
     for i in range(weights.shape[0]):
-        ret = np.random.choice(
+        ret = random_state.choice(
             weights.shape[1], num_samples, replacement, weights[i]
         )
         rets.append(ret)
@@ -312,13 +458,37 @@ class WeightedRandomSampler(Sampler):
         self.weights = weights
         self.num_samples = num_samples
         self.replacement = replacement
+        self._state = _SamplerState()
 
     def __iter__(self):
+        random_state, _ = self._state.start_epoch()
         idxs = _weighted_sample(
-            self.weights, self.num_samples, self.replacement
+            self.weights, self.num_samples, self.replacement, random_state
         )
-        return iter(idxs.reshape((-1)).tolist())
+        return self._state.iter_indices(idxs.reshape((-1)).tolist())
 
     def __len__(self):
         mul = np.prod(self.weights.shape) // self.weights.shape[-1]
         return self.num_samples * mul
+
+    def state_dict(self):
+        """
+        Get the iteration state of the sampler, which contains the numpy
+        random state to generate indices of current epoch, the number of
+        epochs started and the number of indices consumed in current epoch.
+
+        Returns:
+            dict: the state of the sampler.
+        """
+        return self._state.state_dict()
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state got by :code:`state_dict`, the next
+        iteration of the sampler will generate indices by the recorded
+        random state and start from the next index of the recorded state.
+
+        Args:
+            state_dict(dict): the state of the sampler.
+        """
+        self._state.set_state_dict(state_dict)
@@ -0,0 +1,203 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import mmap
+import tempfile
+import numpy as np
+
+# NOTE: byte alignment of each array in a slot
+_SLOT_ALIGNMENT = 64
+# NOTE: a slot is allocated with extra space of first batch size, so
+#       that batches with slightly different size can reuse the slot
+_SLOT_EXTRA_SPACE_RATIO = 0.25
+
+_SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+def _align(nbytes):
+    return (nbytes + _SLOT_ALIGNMENT - 1) // _SLOT_ALIGNMENT * _SLOT_ALIGNMENT
+
+
+class _SharedMemoryBatch:
+    """
+    Message put to data queue in shared memory pool mode, instead of
+    the batch tensors, only the location of the batch in the slot pool
+    and the array metas are sent between processes.
+    """
+
+    def __init__(self, worker_id, slot_id, path, metas):
+        self.worker_id = worker_id
+        self.slot_id = slot_id
+        self.path = path
+        # list of (dtype, shape, offset) for each array
+        self.metas = metas
+
+
+class _SharedMemorySlotPool:
+    """
+    A ring of reusable shared memory slots owned by one DataLoader
+    worker. Free slot ids are passed through :attr:`free_queue`, the
+    worker takes a free slot to write a collated batch in, and the
+    main process puts the slot id back after the batch is consumed.
+
+    Slots are memory mapped files allocated lazily by the worker when
+    writing the first batch and re-allocated when a larger batch comes,
+    batches which cannot be written to a slot (no free slot or not all
+    numpy array) should be sent by the common data queue path.
+
+    Args:
+        worker_id(int): the worker id the pool belongs to.
+        num_slots(int): the number of slots in the pool.
+        free_queue(multiprocessing.SimpleQueue): queue of free slot ids,
+            SimpleQueue is used for putting is synchronous and a freed
+            slot can be got by worker immediately.
+    """
+
+    def __init__(self, worker_id, num_slots, free_queue):
+        self.worker_id = worker_id
+        self.num_slots = num_slots
+        self.free_queue = free_queue
+        for slot_id in range(num_slots):
+            self.free_queue.put(slot_id)
+
+        # worker side slot states, slot_id -> (path, size, mmap)
+        self._slots = {}
+        self._alloc_cnt = 0
+
+    def _alloc_slot(self, slot_id, nbytes):
+        self._free_slot(slot_id)
+        size = _align(int(nbytes * (1 + _SLOT_EXTRA_SPACE_RATIO)))
+        path = os.path.join(
+            _SHM_DIR,
+            "paddle_dataloader_{}_{}_{}_{}".format(
+                os.getpid(), self.worker_id, slot_id, self._alloc_cnt
+            ),
+        )
+        self._alloc_cnt += 1
+        fd = os.open(path, os.O_CREAT | os.O_RDWR | os.O_TRUNC, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            buf = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self._slots[slot_id] = (path, size, buf)
+        return self._slots[slot_id]
+
+    def _free_slot(self, slot_id):
+        if slot_id in self._slots:
+            path, _, buf = self._slots.pop(slot_id)
+            buf.close()
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def put_batch(self, batch):
+        """
+        Write a flattened batch into a free slot, called in worker.
+
+        Args:
+            batch(list of numpy.ndarray): the flattened batch.
+
+        Returns:
+            _SharedMemoryBatch|None: the batch message to send to main
+                process, None if the batch cannot be written to slot.
+        """
+        if len(batch) == 0 or not all(
+            isinstance(b, np.ndarray) and b.dtype != np.object_ for b in batch
+        ):
+            return None
+
+        nbytes = sum(_align(b.nbytes) for b in batch)
+        # NOTE: worker is the only consumer of free_queue, get will not
+        #       block if free_queue is not empty
+        if self.free_queue.empty():
+            return None
+        slot_id = self.free_queue.get()
+
+        if slot_id in self._slots and self._slots[slot_id][1] >= nbytes:
+            path, _, buf = self._slots[slot_id]
+        else:
+            path, _, buf = self._alloc_slot(slot_id, nbytes)
+
+        metas = []
+        offset = 0
+        for b in batch:
+            dst = np.ndarray(b.shape, dtype=b.dtype, buffer=buf, offset=offset)
+            dst[...] = b
+            metas.append((b.dtype.str, b.shape, offset))
+            offset += _align(b.nbytes)
+        return _SharedMemoryBatch(self.worker_id, slot_id, path, metas)
+
+    def close(self):
+        for slot_id in list(self._slots.keys()):
+            self._free_slot(slot_id)
+
+
+class _SharedMemorySlotReader:
+    """
+    Main process side of :code:`_SharedMemorySlotPool`, maps the slots
+    written by workers and wraps batch arrays as numpy views on the
+    mapped memory without unpickling or copying.
+
+    Args:
+        pools(list of _SharedMemorySlotPool): slot pools of all workers.
+    """
+
+    def __init__(self, pools):
+        self._pools = pools
+        # (worker_id, slot_id) -> (path, mmap)
+        self._mapped = {}
+
+    def _get_buffer(self, shm_batch):
+        key = (shm_batch.worker_id, shm_batch.slot_id)
+        mapped = self._mapped.get(key)
+        if mapped is not None and mapped[0] == shm_batch.path:
+            return mapped[1]
+        # slot re-allocated by worker for larger batch, remap it
+        if mapped is not None:
+            mapped[1].close()
+        fd = os.open(shm_batch.path, os.O_RDWR)
+        try:
+            buf = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+        self._mapped[key] = (shm_batch.path, buf)
+        return buf
+
+    def read(self, shm_batch):
+        """
+        Get the arrays of a batch as views of the slot memory, the views
+        are only valid before the slot is released.
+        """
+        buf = self._get_buffer(shm_batch)
+        return [
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=buf, offset=offset)
+            for dtype, shape, offset in shm_batch.metas
+        ]
+
+    def release(self, shm_batch):
+        self._pools[shm_batch.worker_id].free_queue.put(shm_batch.slot_id)
+
+    def close(self):
+        for path, buf in self._mapped.values():
+            buf.close()
+            # NOTE: workers unlink slot files on exit, unlink here again
+            #       in case workers exit unexpectedly
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._mapped = {}
@@ -14,6 +14,7 @@
 
 import os
 import sys
+import time
 import paddle
 import numpy as np
 import traceback
@@ -49,11 +50,20 @@ class _DatasetKind:
 
     @staticmethod
     def create_fetcher(
-        kind, dataset, auto_collate_batch, collate_fn, drop_last
+        kind,
+        dataset,
+        auto_collate_batch,
+        collate_fn,
+        drop_last,
+        use_getitems=None,
     ):
         if kind == _DatasetKind.MAP:
             return _MapDatasetFetcher(
-                dataset, auto_collate_batch, collate_fn, drop_last
+                dataset,
+                auto_collate_batch,
+                collate_fn,
+                drop_last,
+                use_getitems,
             )
         elif kind == _DatasetKind.ITER:
             return _IterableDatasetFetcher(
@@ -276,6 +286,9 @@ def _worker_loop(
     num_workers,
     use_shared_memory,
     base_seed,
+    shm_pool=None,
+    use_getitems=None,
+    metrics=None,
 ):
     try:
         # NOTE: [ mmap files clear ] When the child process exits unexpectedly,
@@ -313,8 +326,14 @@ def _worker_loop(
             if init_fn is not None:
                 init_fn(worker_id)
             fetcher = _DatasetKind.create_fetcher(
-                dataset_kind, dataset, auto_collate_batch, collate_fn, drop_last
+                dataset_kind,
+                dataset,
+                auto_collate_batch,
+                collate_fn,
+                drop_last,
+                use_getitems,
             )
+            fetcher.metrics = metrics
         except:
             init_exception = _WorkerException(worker_id)
 
@@ -330,9 +349,18 @@ def _worker_loop(
             if isinstance(data, _ResumeIteration):
                 out_queue.put((data, None, None))
                 iterator_drained = False
-                fetcher = _DatasetKind.create_fetcher(
-                    dataset_kind, dataset, auto_collate_batch, collate_fn, True
-                )
+                # NOTE: only IterableDataset fetcher holds iteration state
+                #       which should be recreated for a new epoch, fetcher
+                #       of map-style dataset can be reused directly
+                if dataset_kind == _DatasetKind.ITER:
+                    fetcher = _DatasetKind.create_fetcher(
+                        dataset_kind,
+                        dataset,
+                        auto_collate_batch,
+                        collate_fn,
+                        drop_last,
+                    )
+                    fetcher.metrics = metrics
                 continue
 
             # None as poison piil, so worker event should be set
@@ -371,7 +399,23 @@ def _worker_loop(
             else:
                 if isinstance(batch, _WorkerException):
                     out_queue.put((idx, batch, None))
+                start = time.perf_counter()
                 batch, structure = _flatten_batch(batch)
+                put_start = time.perf_counter()
+                if metrics is not None:
+                    metrics.record('flatten', put_start - start)
+                # NOTE: in shared memory pool mode, write batch into a
+                #       reusable slot and only send slot location, fall
+                #       back to common path if batch cannot be written
+                if shm_pool is not None:
+                    shm_batch = shm_pool.put_batch(batch)
+                    if shm_batch is not None:
+                        out_queue.put((idx, shm_batch, structure))
+                        if metrics is not None:
+                            metrics.record(
+                                'ipc_put', time.perf_counter() - put_start
+                            )
+                        continue
                 if use_shared_memory:
 
                     def numpy2lodtensor(arr):
@@ -388,6 +432,8 @@ def _worker_loop(
                     out_queue.put((idx, tensor_list, structure))
                 else:
                     out_queue.put((idx, batch, structure))
+                if metrics is not None:
+                    metrics.record('ipc_put', time.perf_counter() - put_start)
     except KeyboardInterrupt:
         # NOTE: Main process will raise KeyboardInterrupt anyways, ignore it in child process
         pass
@@ -396,3 +442,5 @@ def _worker_loop(
     finally:
         if use_shared_memory:
             _cleanup_mmap()
+        if shm_pool is not None:
+            shm_pool.close()
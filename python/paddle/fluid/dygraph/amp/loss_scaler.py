@@ -23,6 +23,7 @@ from paddle.fluid.data_feeder import check_type
 from ...wrapped_decorator import signature_safe_contextmanager, wrap_decorator
 import warnings
 import numpy as np
+import paddle
 from paddle import _C_ops, _legacy_C_ops
 from collections import defaultdict
 from enum import Enum
@@ -68,6 +69,12 @@ class AmpScaler:
         decr_every_n_nan_or_inf(int, optional): Decreases loss scaling every n
                                     accumulated steps with nan or inf gradients. Default is 2.
         use_dynamic_loss_scaling(bool, optional): Whether to use dynamic loss scaling. If False, fixed loss_scaling is used. If True, the loss scaling is updated dynamicly. Default is True.
+        use_device_found_inf(bool, optional): Whether to keep the check of nan or inf gradients on device, which is only supported in eager mode.
+                                If True, the update of optimizer is masked on device when nan or inf is found, i.e. parameters and optimizer states
+                                are restored to their values before the update, which is the same as skipping it. The loss scaling is updated on
+                                device, and optimizer states kept on host (e.g. the beta pows of Adam and AdamW) are moved to device, so there is
+                                no synchronization with host in each step. Lamb masks its update in the kernel, the other optimizers copy the updated
+                                parameters and their states before the update in each step. Default is False.
     Returns:
         An AmpScaler object.
 
@@ -103,6 +110,7 @@ class AmpScaler:
         incr_every_n_steps=1000,
         decr_every_n_nan_or_inf=1,
         use_dynamic_loss_scaling=True,
+        use_device_found_inf=False,
     ):
 
         tracer = _dygraph_tracer()
@@ -155,6 +163,16 @@ class AmpScaler:
             self._cache_founf_inf = None
             self._optimizer_states = defaultdict(_refresh_optimizer_state)
 
+            if use_device_found_inf and not in_dygraph_mode():
+                warnings.warn(
+                    'use_device_found_inf is only supported in eager mode, so it makes no effect.'
+                )
+                use_device_found_inf = False
+            self._use_device_found_inf = use_device_found_inf
+            if self._use_device_found_inf:
+                self._good_steps = to_variable(np.array([0]).astype(np.int32))
+                self._bad_steps = to_variable(np.array([0]).astype(np.int32))
+
     def scale(self, var):
         """
         Multiplies a variable(Tensor) by the scale factor and returns scaled outputs.
@@ -239,7 +257,10 @@ class AmpScaler:
 
         optimize_ops, params_grads = (None, None)
 
-        if self._found_inf:
+        if self._use_device_found_inf:
+            with self._found_inf_guard(optimizer):
+                optimize_ops, params_grads = optimizer.minimize(*args, **kwargs)
+        elif self._found_inf:
             self._cache_founf_inf = True
         else:
             optimize_ops, params_grads = optimizer.minimize(*args, **kwargs)
@@ -274,7 +295,22 @@ class AmpScaler:
         elif optimizer_state["state"] is OptimizerState.STEPPED:
             raise RuntimeError("unscale_() is being called after step().")
 
-        if getattr(optimizer, '_param_groups', None) and isinstance(
+        # NOTE: gradients may still be reduced asynchronously by the optimizer
+        #       (e.g. dp_comm_overlap of hybrid parallel), wait for them before
+        #       they are unscaled in place
+        wait_grads = getattr(optimizer, '_wait_grads', None)
+        if wait_grads is not None:
+            wait_grads()
+
+        if in_dygraph_mode() and hasattr(optimizer, '_get_param_index'):
+            # NOTE: The index of parameters is cached by the optimizer, and the
+            #       gradients of all groups are bucketed by dtype on c++ side.
+            (
+                param_grads_fp16,
+                param_grads_bf16,
+                param_grads_fp32,
+            ) = core.eager.get_grads_lists(optimizer._get_param_index().params)
+        elif getattr(optimizer, '_param_groups', None) and isinstance(
             optimizer._param_groups[0], dict
         ):
             param_grads = []
@@ -380,14 +416,171 @@ class AmpScaler:
                     self._temp_found_inf_fp32,
                 )
 
-        self._found_inf = (
-            self._temp_found_inf_fp16
-            or self._temp_found_inf_bf16
-            or self._temp_found_inf_fp32
-        )
+        if self._use_device_found_inf:
+            self._found_inf = self._device_found_inf(
+                [
+                    (param_grads_fp16, self._temp_found_inf_fp16),
+                    (param_grads_bf16, self._temp_found_inf_bf16),
+                    (param_grads_fp32, self._temp_found_inf_fp32),
+                ]
+            )
+        else:
+            self._found_inf = (
+                self._temp_found_inf_fp16
+                or self._temp_found_inf_bf16
+                or self._temp_found_inf_fp32
+            )
 
         optimizer_state["state"] = OptimizerState.UNSCALED
 
+    def _device_found_inf(self, grads_and_found_infs):
+        """
+        Merges found_inf of the gradient lists on device, and sets the
+        gradients to zero if nan or inf is found.
+        """
+        found_inf = None
+        for grads, temp_found_inf in grads_and_found_infs:
+            if len(grads) == 0:
+                continue
+            if found_inf is None:
+                found_inf = temp_found_inf
+            else:
+                found_inf = _C_ops.logical_or(found_inf, temp_found_inf)
+        if found_inf is None:
+            return to_variable(np.array([0]).astype(np.bool_))
+
+        for grads, _ in grads_and_found_infs:
+            if len(grads) == 0:
+                continue
+            # NOTE: With stop_update, update_loss_scaling only sets the
+            #       gradients to zero when found_inf is true, which is checked
+            #       on device. The loss scaling is updated in _update.
+            _C_ops.update_loss_scaling_(
+                grads,
+                found_inf,
+                self._scale,
+                self._good_steps,
+                self._bad_steps,
+                self._incr_every_n_steps,
+                self._decr_every_n_nan_or_inf,
+                self._incr_ratio,
+                self._decr_ratio,
+                True,
+            )
+        return found_inf
+
+    @signature_safe_contextmanager
+    def _found_inf_guard(self, optimizer):
+        """
+        Masks the update of optimizer by found_inf on device, which is the
+        same as skipping the update without reading found_inf on host. The
+        accumulators kept on host (e.g. beta pows) are created on, or moved
+        to, the device of found_inf, since masking them on host would copy
+        found_inf to host. Lamb masks its update by found_inf in the kernel.
+        For the other optimizers, the parameters of each optimize operator,
+        with their accumulators and master weights, are copied before the
+        operator and restored right after it where found_inf is true.
+        """
+        real_optimizer = optimizer
+        while hasattr(real_optimizer, "_inner_opt"):
+            real_optimizer = real_optimizer._inner_opt
+
+        found_inf = self._found_inf
+        keep_on_device = not found_inf.place.is_cpu_place()
+        # NOTE: the lamb kernel skips the update of parameters, moments and
+        #       beta pows by found_inf on device, once the beta pows are on
+        #       device as well
+        mask_in_kernel = isinstance(real_optimizer, paddle.optimizer.Lamb)
+
+        def get_states(params):
+            master_weights = getattr(real_optimizer, "_master_weights", {})
+            states = []
+            for param in params:
+                states.append(param)
+                for accumulators in real_optimizer._accumulators.values():
+                    if param.name in accumulators:
+                        states.append(accumulators[param.name])
+                if param.name in master_weights:
+                    states.append(master_weights[param.name])
+            return states
+
+        def mask(update, get_params):
+            def masked_update(*args, **kwargs):
+                states = get_states(get_params(*args, **kwargs))
+                with paddle.no_grad():
+                    snapshots = [
+                        (state, paddle.assign(state))
+                        for state in states
+                        if state._is_initialized()
+                    ]
+                    result = update(*args, **kwargs)
+                    for state, old_state in snapshots:
+                        paddle.assign(
+                            paddle.where(found_inf, old_state, state), state
+                        )
+                return result
+
+            return masked_update
+
+        def get_param(block, param_and_grad):
+            if isinstance(param_and_grad, dict):
+                param_and_grad = param_and_grad['params']
+            return [param_and_grad[0]]
+
+        def get_group_params(block, group, *args):
+            return group.params
+
+        def get_params(block, parameters_and_grads, *args, **kwargs):
+            if isinstance(parameters_and_grads, dict):
+                parameters_and_grads = parameters_and_grads['params']
+            return [
+                param
+                for param, grad in parameters_and_grads
+                if grad is not None and not param.stop_gradient
+            ]
+
+        wrapped_names = []
+        if keep_on_device:
+            # NOTE: the tensor objects are kept, as they may be referenced by
+            #       the optimizer elsewhere, e.g. by the multi tensor groups
+            for accumulators in real_optimizer._accumulators.values():
+                for accumulator in accumulators.values():
+                    if accumulator.place.is_cpu_place():
+                        accumulator._copy_to(
+                            found_inf.place, True
+                        )._share_buffer_to(accumulator)
+            add_accumulator = real_optimizer._add_accumulator
+
+            def add_accumulator_on_device(*args, **kwargs):
+                if kwargs.get('device') == 'cpu':
+                    kwargs['device'] = None
+                return add_accumulator(*args, **kwargs)
+
+            real_optimizer._add_accumulator = add_accumulator_on_device
+            wrapped_names.append("_add_accumulator")
+        if mask_in_kernel:
+            origin_found_inf = real_optimizer._get_auxiliary_var('found_inf')
+            real_optimizer._set_auxiliary_var('found_inf', found_inf)
+        else:
+            for name, get_update_params in (
+                ("_append_optimize_op", get_param),
+                ("_append_fused_optimize_op", get_group_params),
+                ("_append_optimize_multi_tensor_op", get_params),
+            ):
+                update = getattr(real_optimizer, name, None)
+                if update is not None:
+                    setattr(
+                        real_optimizer, name, mask(update, get_update_params)
+                    )
+                    wrapped_names.append(name)
+        try:
+            yield
+        finally:
+            for name in wrapped_names:
+                delattr(real_optimizer, name)
+            if mask_in_kernel:
+                real_optimizer._set_auxiliary_var('found_inf', origin_found_inf)
+
     def _update(self):
         """
         Updates the loss_scaling.
@@ -395,6 +588,10 @@ class AmpScaler:
         if not self._enable:
             return
 
+        if self._use_device_found_inf:
+            self._update_on_device()
+            return
+
         if self._cache_founf_inf:
             self._incr_count = 0
             self._decr_count = self._decr_count + 1
@@ -417,6 +614,36 @@ class AmpScaler:
 
         return
 
+    def _update_on_device(self):
+        """
+        Updates the loss_scaling by found_inf on device, the same as _update.
+        """
+        good_steps = paddle.where(
+            self._found_inf,
+            paddle.zeros_like(self._good_steps),
+            self._good_steps + 1,
+        )
+        bad_steps = paddle.where(
+            self._found_inf,
+            self._bad_steps + 1,
+            paddle.zeros_like(self._bad_steps),
+        )
+        need_incr = good_steps == self._incr_every_n_steps
+        need_decr = bad_steps == self._decr_every_n_nan_or_inf
+        self._scale = paddle.where(
+            need_decr,
+            self._scale * self._decr_ratio,
+            paddle.where(
+                need_incr, self._scale * self._incr_ratio, self._scale
+            ),
+        )
+        self._good_steps = paddle.where(
+            need_incr, paddle.zeros_like(good_steps), good_steps
+        )
+        self._bad_steps = paddle.where(
+            need_decr, paddle.zeros_like(bad_steps), bad_steps
+        )
+
     def is_enable(self):
         """
         Enable loss scaling or not.
@@ -545,6 +772,9 @@ class AmpScaler:
             decr_count(int): The number of recent consecutive skipped steps.
             use_dynamic_loss_scaling(bool): Whether to use dynamic loss scaling. If False, fixed loss_scaling is used. If True, the loss scaling is updated dynamicly. Default is True.
         """
+        if self._enable and self._use_device_found_inf:
+            self._incr_count = int(self._good_steps.numpy()[0])
+            self._decr_count = int(self._bad_steps.numpy()[0])
         return (
             {
                 "scale": self._scale.numpy(),
@@ -587,3 +817,10 @@ class AmpScaler:
         self._incr_count = state_dict["incr_count"]
         self._decr_count = state_dict["decr_count"]
         self._use_dynamic_loss_scaling = state_dict["use_dynamic_loss_scaling"]
+        if self._use_device_found_inf:
+            self._good_steps = to_variable(
+                np.array([self._incr_count]).astype(np.int32)
+            )
+            self._bad_steps = to_variable(
+                np.array([self._decr_count]).astype(np.int32)
+            )
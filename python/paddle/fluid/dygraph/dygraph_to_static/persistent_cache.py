@@ -0,0 +1,342 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import inspect
+import os
+import pickle
+import stat
+import tempfile
+
+import paddle.version as fluid_version
+from paddle.fluid import framework
+from paddle.fluid.dygraph import layers
+from paddle.fluid.layers.utils import map_structure
+from paddle.fluid.dygraph.dygraph_to_static import logging_utils
+from paddle.fluid.dygraph.dygraph_to_static.utils import func_to_source_code
+
+__all__ = ['set_cache_dir']
+
+CACHE_DIR_ENV_NAME = 'TRANSLATOR_CACHE_DIR'
+
+_CODE_DIR = 'code'
+_PROGRAM_DIR = 'program'
+# NOTE: bump it once the format of cached files is changed
+_CACHE_FORMAT_VERSION = 1
+# NOTE: values of these types in attributes of layers are hashed into key
+#       of cached programs, since they may change the traced program
+_PRIMITIVE_TYPES = (bool, int, float, str, type(None))
+
+
+class _VarRef:
+    """
+    Placeholder of a Variable in pickled inputs and outputs of a program.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+
+def _version_str():
+    return "{}-{}-{}".format(
+        fluid_version.full_version,
+        fluid_version.commit,
+        _CACHE_FORMAT_VERSION,
+    )
+
+
+def _file_hash(path, file_hashes):
+    if path not in file_hashes:
+        try:
+            with open(path, 'rb') as f:
+                file_hashes[path] = hashlib.sha256(f.read()).hexdigest()
+        except (OSError, TypeError):
+            file_hashes[path] = ''
+    return file_hashes[path]
+
+
+def _source_file(obj):
+    try:
+        return inspect.getsourcefile(obj)
+    except TypeError:
+        return None
+
+
+def _layer_signature(class_instance, file_hashes):
+    """
+    Signature of the layer decorated by `to_static`, including the types
+    and primitive attributes of sublayers, the source files defining them,
+    and the names, shapes and dtypes of parameters and buffers.
+    """
+    if class_instance is None:
+        return []
+    signature = []
+    for name, layer in class_instance.named_sublayers(include_self=True):
+        layer_type = type(layer)
+        attrs = sorted(
+            (k, v)
+            for k, v in vars(layer).items()
+            if not k.startswith('_') and isinstance(v, _PRIMITIVE_TYPES)
+        )
+        signature.append(
+            (
+                name,
+                layer_type.__module__,
+                layer_type.__qualname__,
+                _file_hash(_source_file(layer_type), file_hashes),
+                attrs,
+            )
+        )
+    for name, param in class_instance.named_parameters():
+        signature.append(
+            (name, param.name, tuple(param.shape), str(param.dtype))
+        )
+    for name, buffer in class_instance.named_buffers():
+        signature.append(
+            (name, buffer.name, tuple(buffer.shape), str(buffer.dtype))
+        )
+    return signature
+
+
+def _is_untrusted_dir(path):
+    """
+    Whether an existing directory is writable by other users, i.e. it is
+    world-writable or owned by another user. Files in such a directory may
+    be replaced by others to run arbitrary code once loaded.
+    """
+    if os.name != 'posix':
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return bool(st.st_mode & stat.S_IWOTH) or st.st_uid != os.getuid()
+
+
+class PersistentCache:
+    """
+    Opt-in on-disk cache of the transformed code of dygraph functions and
+    the programs traced by `to_static`, so that a warm start of process
+    skips AST transformation and tracing.
+
+    The transformed code is keyed on the source code of function and the
+    Paddle version. The program is keyed on the source code of function,
+    the source files defining the function and the layers, the Paddle
+    version, the input specs of `CacheKey`, and the signature of the
+    decorated layer.
+
+    Note:
+        Cached code is executed and cached programs are unpickled when
+        loaded, so the cache directory must be trusted and writable only by
+        the current user. Files are not loaded from a directory which is
+        world-writable or owned by another user.
+
+        Functions called by the decorated function in other source files
+        are not hashed into the key, so the cache directory should be
+        cleared once these functions are changed. Error messages raised in
+        functions loaded from cached code point to the transformed code
+        instead of the original dygraph code.
+    """
+
+    def __init__(self):
+        # NOTE: None means to use the environment variable
+        self._cache_dir = None
+        self._warned_dirs = set()
+
+    @property
+    def cache_dir(self):
+        if self._cache_dir is not None:
+            return self._cache_dir
+        return os.environ.get(CACHE_DIR_ENV_NAME, '')
+
+    @cache_dir.setter
+    def cache_dir(self, cache_dir):
+        self._cache_dir = cache_dir
+
+    def enabled(self):
+        return bool(self.cache_dir)
+
+    def _path(self, sub_dir, key, suffix):
+        return os.path.join(self.cache_dir, sub_dir, key + suffix)
+
+    def _read(self, path):
+        # NOTE: cached code is executed and cached programs are unpickled,
+        #       refuse to load files that other users may have replaced
+        for dir_name in (self.cache_dir, os.path.dirname(path)):
+            if _is_untrusted_dir(dir_name):
+                if dir_name not in self._warned_dirs:
+                    self._warned_dirs.add(dir_name)
+                    logging_utils.warn(
+                        "Dy2static cache directory {} is writable by other "
+                        "users, the cache in it is not loaded.".format(dir_name)
+                    )
+                return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, path, data):
+        # NOTE: write to a temporary file and rename it, so that processes
+        #       sharing the cache directory never read a partial file
+        dir_name = os.path.dirname(path)
+        try:
+            os.makedirs(dir_name, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=dir_name, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging_utils.warn(
+                "Failed to write dy2static cache file {}: {}".format(path, e)
+            )
+
+    def code_key(self, source_code):
+        return hashlib.sha256(
+            (_version_str() + '\n' + source_code).encode('utf-8')
+        ).hexdigest()
+
+    def load_code(self, source_code):
+        data = self._read(
+            self._path(_CODE_DIR, self.code_key(source_code), '.py')
+        )
+        return None if data is None else data.decode('utf-8')
+
+    def save_code(self, source_code, transformed_code):
+        self._write(
+            self._path(_CODE_DIR, self.code_key(source_code), '.py'),
+            transformed_code.encode('utf-8'),
+        )
+
+    def program_key(self, cache_key):
+        """
+        Returns the hash string of a `CacheKey`, or None if the function
+        has no source code.
+        """
+        function = cache_key.function_spec.dygraph_function
+        try:
+            source_code = func_to_source_code(function)
+        except (OSError, TypeError):
+            return None
+        file_hashes = {}
+        key = [
+            _version_str(),
+            source_code,
+            _file_hash(_source_file(function), file_hashes),
+            repr(cache_key.input_args_with_spec),
+            repr(cache_key.input_kwargs_with_spec),
+            cache_key.kwargs.get('with_hook', False),
+            cache_key.kwargs.get('is_train', False),
+            _layer_signature(cache_key.class_instance, file_hashes),
+        ]
+        return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+    def load_program(self, key):
+        """
+        Returns the dict of cached `main_program` and `startup_program`
+        descs, and `inputs` and `outputs` with Variables replaced by
+        `_VarRef`, or None if not cached.
+        """
+        data = self._read(self._path(_PROGRAM_DIR, key, '.pkl'))
+        if data is None:
+            return None
+        try:
+            return pickle.loads(data)
+        except Exception as e:
+            logging_utils.warn(
+                "Failed to load dy2static cache of program {}: {}".format(
+                    key, e
+                )
+            )
+            return None
+
+    def save_program(self, key, concrete_program):
+        def to_ref(x):
+            if isinstance(x, framework.Variable):
+                return _VarRef(x.name)
+            return x
+
+        inputs = list(concrete_program.inputs)
+        # NOTE: the first input is the decorated layer if it is a method
+        if inputs and isinstance(inputs[0], layers.Layer):
+            inputs = inputs[1:]
+        main_program = concrete_program.main_program
+        startup_program = concrete_program.startup_program
+        try:
+            data = pickle.dumps(
+                {
+                    'main_program': main_program.desc.serialize_to_string(),
+                    'startup_program': startup_program.desc.serialize_to_string(),
+                    'inputs': map_structure(to_ref, inputs),
+                    'outputs': map_structure(to_ref, concrete_program.outputs),
+                }
+            )
+        except Exception as e:
+            logging_utils.warn(
+                "Failed to save dy2static cache of program {}: {}".format(
+                    key, e
+                )
+            )
+            return
+        self._write(self._path(_PROGRAM_DIR, key, '.pkl'), data)
+
+
+_PERSISTENT_CACHE = PersistentCache()
+
+
+def set_cache_dir(cache_dir):
+    """
+    Sets the directory of the persistent cache of dygraph to static
+    translation. Once set, the transformed code of functions decorated by
+    `to_static` and the traced programs are saved into the directory, and
+    reused by later processes to skip AST transformation and tracing.
+
+    There are two means to set the cache directory:
+
+    1. Call function `set_cache_dir`
+
+    2. Set environment variable `TRANSLATOR_CACHE_DIR`
+
+    **Note**:
+    `set_cache_dir` has a higher priority than the environment variable.
+    The cache is keyed on the Paddle version and the source code of the
+    decorated function and layers, the directory should be cleared once
+    other functions called by them are changed.
+
+    **Warning**:
+    Cached code is executed and cached programs are unpickled when loaded,
+    so a file in the cache directory runs arbitrary code in the process.
+    The directory must be trusted and writable only by the current user,
+    never a shared or world-writable one. The cache is not loaded from a
+    directory which is world-writable or owned by another user.
+
+    Args:
+        cache_dir(str|None): The cache directory. An empty string disables
+            the cache, and None falls back to the environment variable.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+
+            paddle.jit.set_cache_dir('./dy2static_cache')
+
+            @paddle.jit.to_static
+            def func(x):
+                return x + 1
+
+            func(paddle.ones([2]))
+    """
+    _PERSISTENT_CACHE.cache_dir = cache_dir
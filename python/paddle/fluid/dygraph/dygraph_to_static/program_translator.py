@@ -13,17 +13,19 @@
 # limitations under the License.
 
 import collections
+import paddle
 from paddle.utils import gast
 import inspect
 import textwrap
 import threading
 import weakref
 
+from paddle.fluid import core
 from paddle.fluid import framework
 from paddle.fluid import _non_static_mode
 from paddle.fluid.dygraph import layers
 from paddle.fluid.data_feeder import check_type
-from paddle.fluid.layers.utils import flatten
+from paddle.fluid.layers.utils import flatten, map_structure, pack_sequence_as
 from paddle.fluid.dygraph.base import param_guard
 from paddle.fluid.dygraph.base import switch_to_static_graph
 from paddle.fluid.dygraph.dygraph_to_static import DygraphToStaticAst
@@ -41,6 +43,10 @@ from paddle.fluid.dygraph.dygraph_to_static.origin_info import (
 from paddle.fluid.dygraph.dygraph_to_static.partial_program import (
     partial_program_from,
 )
+from paddle.fluid.dygraph.dygraph_to_static.persistent_cache import (
+    _PERSISTENT_CACHE,
+    _VarRef,
+)
 from paddle.fluid.dygraph.dygraph_to_static.utils import ast_to_func
 from paddle.fluid.dygraph.dygraph_to_static.utils import ast_to_source_code
 from paddle.fluid.dygraph.dygraph_to_static.utils import func_to_source_code
@@ -67,6 +73,9 @@ __all__ = ['ProgramTranslator', 'convert_to_static']
 # Once exceeding the threshold, we will raise warning to users to make sure the conversion is as expected.
 MAX_TRACED_PROGRAM_COUNT = 10
 
+# Python constants whose values are checked in the call guard of StaticFunction.
+_GUARD_CONSTANT_TYPES = (bool, int, float, str, type(None))
+
 
 class FunctionCache:
     """
@@ -117,6 +126,16 @@ class FunctionCache:
         func = unwrap(func)
         source_code = func_to_source_code(func)
 
+        # NOTE: reuse the transformed code in persistent cache directly, the
+        #       origin info map is not created in this case
+        if source_code not in self._code_to_ast_caches and (
+            _PERSISTENT_CACHE.enabled()
+        ):
+            transformed_code = _PERSISTENT_CACHE.load_code(source_code)
+            if transformed_code is not None:
+                static_func, _ = ast_to_func(gast.parse(transformed_code), func)
+                return static_func
+
         # TODO(liym27):
         #  Consider this case: source_code in self._code_to_ast_caches,
         #  but actually they are methods in different classes.
@@ -128,6 +147,10 @@ class FunctionCache:
             root = attach_origin_info(root, func)
             root_wrapper = self._dygraph_to_static.get_static_ast(root)
             self._code_to_ast_caches[source_code] = root_wrapper
+            if _PERSISTENT_CACHE.enabled():
+                _PERSISTENT_CACHE.save_code(
+                    source_code, ast_to_source_code(root_wrapper.node)
+                )
 
         # Get static function from AST
         static_func, file_name = ast_to_func(root_wrapper.node, func)
@@ -315,7 +338,10 @@ class StaticFunction:
 
         self._input_spec = input_spec
         self._function_spec = FunctionSpec(function, input_spec)
-        self._program_cache = ProgramCache()
+        self._program_cache = ProgramCache(
+            max_size=kwargs.get("max_program_cache_size", None),
+            dynamic_shape_threshold=kwargs.get("dynamic_shape_threshold", None),
+        )
         self._descriptor_cache = weakref.WeakKeyDictionary()
         # Note: Hold a reference to ProgramTranslator for switching `enable_to_static`.
         self._program_trans = ProgramTranslator()
@@ -323,6 +349,8 @@ class StaticFunction:
         self._training = True
         self._cuda_graph_capture_mode = ""
         self._cuda_graph_pool_id = 0
+        # (guard of the last call, its CacheKey, hash id of the CacheKey)
+        self._last_call = None
 
         self._property = kwargs.get("property", False)
 
@@ -433,12 +461,35 @@ class StaticFunction:
             )
 
         # 2. trace ops from dygraph layers and cache the generated program.
-        args, kwargs = self._function_spec.unified_args_and_kwargs(args, kwargs)
+        # NOTE: if the call has the same guard as the last call, reuse the cached
+        # program directly without unifying arguments and hashing CacheKey.
+        is_train = self._is_train_mode()
+        guard = self._call_guard(args, kwargs, is_train)
+        cached = None
+        if guard is not None and self._last_call is not None:
+            if guard == self._last_call[0]:
+                cached = self._program_cache.get(*self._last_call[1:])
+        if cached is None:
+            args, kwargs = self._function_spec.unified_args_and_kwargs(
+                args, kwargs
+            )
 
         try:
-            concrete_program, partial_program_layer = self.get_concrete_program(
-                *args, **kwargs, is_train=self._is_train_mode()
-            )
+            if cached is None:
+                (
+                    concrete_program,
+                    partial_program_layer,
+                ) = self.get_concrete_program(
+                    *args, **kwargs, is_train=is_train
+                )
+                if guard is not None:
+                    self._last_call = (
+                        guard,
+                        self._program_cache._recent_cache_key,
+                        self._program_cache._recent_key,
+                    )
+            else:
+                concrete_program, partial_program_layer = cached
             # 3. synchronize self.training attribute.
             if isinstance(self._class_instance, layers.Layer):
                 partial_program_layer.training = self._class_instance.training
@@ -469,6 +520,33 @@ class StaticFunction:
                 )
                 raise e
 
+    def _call_guard(self, args, kwargs, is_train):
+        """
+        Returns a cheap signature of the call, including the shapes, dtypes and
+        names of Tensors and the values of Python constants, which determines the
+        CacheKey of the call. Returns None if the call contains keyword arguments,
+        default arguments or other types of arguments.
+        """
+        if kwargs or len(args) != len(self._function_spec.args_name):
+            return None
+        guard = [is_train]
+        # NOTE: only the pattern of names is hashed into CacheKey
+        names = []
+        for arg in args:
+            if isinstance(arg, (core.VarBase, core.eager.Tensor)):
+                name = arg.name
+                if name in names:
+                    name_idx = names.index(name)
+                else:
+                    name_idx = len(names)
+                    names.append(name)
+                guard.append((tuple(arg.shape), arg.dtype, name_idx))
+            elif isinstance(arg, _GUARD_CONSTANT_TYPES):
+                guard.append((type(arg), arg))
+            else:
+                return None
+        return tuple(guard)
+
     def _is_train_mode(self):
         if self._class_instance is not None:
             if not hasattr(self._class_instance, 'training'):
@@ -1025,6 +1103,53 @@ class ConcreteProgram:
             **kwargs
         )
 
+    @staticmethod
+    @switch_to_static_graph
+    def from_persistent_cache(func_spec, cached, class_instance, **kwargs):
+        """
+        Builds ConcreteProgram from the programs loaded from persistent
+        cache without tracing the function.
+
+        Args:
+            func_spec(FunctionSpec): A FunctionSpec instance for decorated function.
+            cached(dict): The cached program descs, inputs and outputs returned
+                by `PersistentCache.load_program`.
+            class_instance(Layer): The decorated layer, or None.
+        """
+        _verify_init_in_dynamic_mode(class_instance)
+
+        main_program = framework.Program.parse_from_string(
+            cached['main_program']
+        )
+        startup_program = framework.Program.parse_from_string(
+            cached['startup_program']
+        )
+        main_program.random_seed = framework.default_main_program().random_seed
+        startup_program.random_seed = (
+            framework.default_startup_program().random_seed
+        )
+
+        global_block = main_program.global_block()
+
+        def to_var(x):
+            if isinstance(x, _VarRef):
+                return global_block.var(x.name)
+            return x
+
+        static_inputs = tuple(map_structure(to_var, cached['inputs']))
+        if class_instance:
+            static_inputs = tuple([class_instance] + list(static_inputs))
+
+        return ConcreteProgram(
+            inputs=static_inputs,
+            outputs=map_structure(to_var, cached['outputs']),
+            parameters=_extract_indeed_params_buffers(class_instance),
+            function=func_spec.dygraph_function,
+            main_program=main_program,
+            startup_program=startup_program,
+            **kwargs
+        )
+
 
 def _extract_indeed_params_buffers(class_instance):
     """
@@ -1040,23 +1165,113 @@ def _extract_indeed_params_buffers(class_instance):
 class ProgramCache:
     """
     Wrapper class for the program functions defined by dygraph function.
+
+    Args:
+        max_size(int|None): The max number of cached programs, the least
+            recently used program is evicted once exceeded. None for
+            unbounded. Default None.
+        dynamic_shape_threshold(int|None): If an axis of an input takes
+            more than `dynamic_shape_threshold` distinct sizes, the axis is
+            promoted to `None` in the InputSpec of later calls, so that
+            they share a single dynamic-shape program instead of retracing
+            for each size. None to disable. Default None.
     """
 
-    def __init__(self):
+    def __init__(self, max_size=None, dynamic_shape_threshold=None):
+        assert (
+            max_size is None or max_size > 0
+        ), "max_size of ProgramCache should be None or positive"
+        assert (
+            dynamic_shape_threshold is None or dynamic_shape_threshold > 0
+        ), "dynamic_shape_threshold of ProgramCache should be None or positive"
         # {hash_id : (concrete_program, partial_layer)}
         self._caches = collections.OrderedDict()
         # trace mostly recent used program
         self._recent_key = None
         self._recent_cache_key = None
+        self._max_size = max_size
+        self._dynamic_shape_threshold = dynamic_shape_threshold
+        # {(index of flattened input, axis) : set of distinct sizes}
+        self._seen_sizes = collections.defaultdict(set)
+        # {index of flattened input : set of axes promoted to None}
+        self._dynamic_axes = collections.defaultdict(set)
+        self._num_evicted = 0
+
+    def _bucket_shapes(self, cache_key):
+        """
+        Records the sizes of each axis of input specs, and replaces the
+        InputSpec whose axes are promoted to dynamic.
+        """
+        flat_args = flatten(cache_key.input_args_with_spec)
+        flat_kwargs = flatten(cache_key.input_kwargs_with_spec)
+        promoted = False
+        for i, spec in enumerate(flat_args + flat_kwargs):
+            if not isinstance(spec, paddle.static.InputSpec):
+                continue
+            for axis, size in enumerate(spec.shape):
+                if size < 0 or axis in self._dynamic_axes[i]:
+                    continue
+                seen_sizes = self._seen_sizes[(i, axis)]
+                seen_sizes.add(size)
+                if len(seen_sizes) > self._dynamic_shape_threshold:
+                    self._dynamic_axes[i].add(axis)
+                    logging_utils.log(
+                        1,
+                        "Axis {} of input {} takes {} distinct sizes, it is "
+                        "promoted to None to reuse a dynamic-shape program.".format(
+                            axis, spec.name, len(seen_sizes)
+                        ),
+                    )
+            promoted = promoted or bool(self._dynamic_axes[i])
+        if not promoted:
+            return
 
-    def _build_once(self, cache_key):
-        concrete_program = ConcreteProgram.from_func_spec(
-            func_spec=cache_key.function_spec,
-            input_spec=cache_key.input_args_with_spec,
-            input_kwargs_spec=cache_key.input_kwargs_with_spec,
-            class_instance=cache_key.class_instance,
-            **cache_key.kwargs
+        def promote(structure, offset):
+            flat = flatten(structure)
+            for i, spec in enumerate(flat):
+                axes = self._dynamic_axes.get(offset + i)
+                if axes and isinstance(spec, paddle.static.InputSpec):
+                    shape = [
+                        None if axis in axes else size
+                        for axis, size in enumerate(spec.shape)
+                    ]
+                    flat[i] = paddle.static.InputSpec(
+                        shape, spec.dtype, spec.name
+                    )
+            return pack_sequence_as(structure, flat)
+
+        cache_key.input_args_with_spec = promote(
+            cache_key.input_args_with_spec, 0
         )
+        cache_key.input_kwargs_with_spec = promote(
+            cache_key.input_kwargs_with_spec, len(flat_args)
+        )
+
+    def _build_once(self, cache_key):
+        concrete_program = None
+        persistent_key = None
+        if _PERSISTENT_CACHE.enabled():
+            persistent_key = _PERSISTENT_CACHE.program_key(cache_key)
+        if persistent_key is not None:
+            cached = _PERSISTENT_CACHE.load_program(persistent_key)
+            if cached is not None:
+                concrete_program = ConcreteProgram.from_persistent_cache(
+                    func_spec=cache_key.function_spec,
+                    cached=cached,
+                    class_instance=cache_key.class_instance,
+                    **cache_key.kwargs
+                )
+
+        if concrete_program is None:
+            concrete_program = ConcreteProgram.from_func_spec(
+                func_spec=cache_key.function_spec,
+                input_spec=cache_key.input_args_with_spec,
+                input_kwargs_spec=cache_key.input_kwargs_with_spec,
+                class_instance=cache_key.class_instance,
+                **cache_key.kwargs
+            )
+            if persistent_key is not None:
+                _PERSISTENT_CACHE.save_program(persistent_key, concrete_program)
         return concrete_program, partial_program_from(concrete_program)
 
     def __getitem__(self, item):
@@ -1065,6 +1280,8 @@ class ProgramCache:
                 'type(item) should be CacheKey, but received %s'
                 % type_name(item)
             )
+        if self._dynamic_shape_threshold is not None:
+            self._bucket_shapes(item)
         item_id = hash(item)
         self._recent_cache_key = item
         self._recent_key = item_id
@@ -1075,13 +1292,36 @@ class ProgramCache:
             if current_tracing_count > MAX_TRACED_PROGRAM_COUNT:
                 logging_utils.warn(
                     "Current traced program number: {} > `max_tracing_count`:{}. Too much cached programs will bring expensive overhead. "
-                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors.".format(
+                    "The reason may be: (1) passing tensors with different shapes, (2) passing python objects instead of tensors. "
+                    "Consider setting `dynamic_shape_threshold` or `max_program_cache_size` in `to_static`.".format(
                         current_tracing_count, MAX_TRACED_PROGRAM_COUNT
                     )
                 )
+            # Note: evict the least recently used programs, the program just built is
+            # the most recently used one and never evicted here.
+            while (
+                self._max_size is not None
+                and len(self._caches) > self._max_size
+            ):
+                self._caches.popitem(last=False)
+                self._num_evicted += 1
+        else:
+            self._caches.move_to_end(item_id)
 
         return self._caches[item_id]
 
+    def get(self, item, item_id):
+        """
+        Returns the cached program of a CacheKey with its precomputed hash id,
+        or None if it is not cached.
+        """
+        cached = self._caches.get(item_id, None)
+        if cached is not None:
+            self._recent_cache_key = item
+            self._recent_key = item_id
+            self._caches.move_to_end(item_id)
+        return cached
+
     def get_program(self, item):
         if not isinstance(item, CacheKey):
             raise ValueError(
@@ -1105,6 +1345,10 @@ class ProgramCache:
     def __len__(self):
         return len(self._caches)
 
+    @property
+    def num_evicted(self):
+        return self._num_evicted
+
     def concrete_programs(self):
         return [cp for key, (cp, _) in self._caches.items()]
 
@@ -44,6 +44,9 @@ from paddle.fluid.dygraph.dygraph_to_static.logging_utils import (
     set_code_level,
     set_verbosity,
 )
+from paddle.fluid.dygraph.dygraph_to_static.persistent_cache import (
+    set_cache_dir,
+)
 from paddle.fluid.dygraph.dygraph_to_static.program_translator import (
     ProgramTranslator,
     StaticFunction,
@@ -80,6 +83,7 @@ __all__ = [
     'dygraph_to_static_func',
     'set_code_level',
     'set_verbosity',
+    'set_cache_dir',
     'save',
     'load',
     'not_to_static',
@@ -202,7 +206,12 @@ def copy_decorator_attrs(original_func, decorated_obj):
 
 
 def declarative(
-    function=None, input_spec=None, build_strategy=None, property=False
+    function=None,
+    input_spec=None,
+    build_strategy=None,
+    property=False,
+    max_program_cache_size=None,
+    dynamic_shape_threshold=None,
 ):
     """
     Converts imperative dygraph APIs into declarative function APIs. Decorator
@@ -222,6 +231,13 @@ def declarative(
             of the computational graph. For more information about build_strategy,
             please refer to :code:`paddle.static.BuildStrategy`. The default is None.
         property(bool, Optional): whether the fucntion is python property. The default is False.
+        max_program_cache_size(int|None, Optional): the max number of programs cached for the function,
+            the least recently used program is evicted once exceeded. None means unbounded. The default is None.
+        dynamic_shape_threshold(int|None, Optional): if an axis of an input Tensor takes more than
+            `dynamic_shape_threshold` distinct sizes, the axis is promoted to `None` in InputSpec, and later
+            calls share a single dynamic-shape program instead of retracing for each size. Note that the
+            function should not depend on the size of the promoted axis in Python control flow.
+            None means disabled. The default is None.
 
 
     Returns:
@@ -262,6 +278,8 @@ def declarative(
                 input_spec=input_spec,
                 build_strategy=build_strategy,
                 property=property,
+                max_program_cache_size=max_program_cache_size,
+                dynamic_shape_threshold=dynamic_shape_threshold,
             ),
         )
 
@@ -33,6 +33,8 @@ from . import framework
 from .incubate.checkpoint import auto_checkpoint as acp
 from .compiler import _prune_feed_ops
 
+import collections
+import weakref
 from functools import lru_cache
 
 __all__ = ['Executor', 'global_scope', 'scope_guard']
@@ -535,23 +537,26 @@ def _get_strong_program_cache_key_for_new_exe(program, feed, fetch_list):
 
 
 def _get_strong_program_cache_key(program, feed, fetch_list):
-    # TODO(zhiqiu): use hash_str to generate cache key as above
-    def _get_varname_from_block(block):
-        block_str = []
-        for var_name in list(block.vars.keys()):
-            block_str.append(var_name)
-        return "\n".join(block_str)
-
     inner_program = (
         program._program
         if isinstance(program, compiler.CompiledProgram)
         else program
     )
-    return (
-        _get_varname_from_block(inner_program.blocks[0])
-        + str(id(program))
-        + _get_program_cache_key(feed, fetch_list)
-    )
+    # NOTE: hash string of desc is cached in C++ and only recomputed when
+    #       desc is changed, so that the key is not rebuilt from all vars
+    #       in each run. Rebuilt programs share cache only if their content,
+    #       including var names, is the same, e.g. built under the same
+    #       unique_name.guard(), as var names are part of desc and fetch list
+    key = inner_program.desc.cached_hash_str()
+    # NOTE: build strategy of CompiledProgram and pipeline options are not
+    #       in program desc, distinguish these programs by id
+    if (
+        isinstance(program, compiler.CompiledProgram)
+        or getattr(program, '_pipeline_opt', None)
+        or getattr(program, '_heter_pipeline_opt', None)
+    ):
+        key += str(id(program))
+    return key + _get_program_cache_key(feed, fetch_list)
 
 
 def _get_program_cache_key(feed, fetch_list):
@@ -620,6 +625,76 @@ def _as_lodtensor(data, place, dtype=None):
     return tensor
 
 
+def _as_feed_tensor(data, place, dtype=None, buffer=None):
+    """
+    Convert fed data to LoDTensor, sharing memory with data if possible.
+
+    LoDTensor is fed as it is. DLPack capsules and objects supporting
+    :code:`__dlpack__` are converted without copy. Objects supporting
+    :code:`__array_interface__` are viewed as numpy.ndarray without copy.
+    If :attr:`buffer` is given, numpy.ndarray is copied into it instead of
+    a newly created LoDTensor.
+
+    Args:
+        data(LoDTensor|numpy.ndarray|PyCapsule|object): the fed data.
+        place(core.Place): the place of created tensor.
+        dtype(core.VarDesc.VarType|str): the expected data type of created
+            tensor.
+        buffer(LoDTensor): the reusable tensor to copy numpy.ndarray into.
+
+    Returns:
+        LoDTensor
+    """
+    if isinstance(data, core.LoDTensor):
+        return data
+    # NOTE: numpy scalars also have __array_interface__, but scalars are
+    #       fed as tensors of shape [1] in the dtype of the variable
+    if np.isscalar(data):
+        return _as_lodtensor(data, place, dtype)
+    if not isinstance(data, np.ndarray):
+        if type(data).__name__ == 'PyCapsule':
+            return core.from_dlpack(data)
+        if hasattr(data, '__dlpack__'):
+            return core.from_dlpack(data.__dlpack__())
+        if hasattr(data, '__array_interface__'):
+            data = np.asarray(data)
+    if buffer is None or not isinstance(data, np.ndarray):
+        return _as_lodtensor(data, place, dtype)
+    buffer.set(data, place)
+    return buffer
+
+
+class _FeedPlan:
+    """
+    Feed columns of a program with feed operators, which are parsed once
+    and cached for the program object. The shape and dtype of the last
+    checked feed and the reusable feed buffer of each column are also kept
+    in the plan.
+    """
+
+    def __init__(self, program):
+        global_block = program.global_block()
+        # list of (feed target name, col, variable, need check)
+        self.columns = []
+        for op in global_block.ops:
+            if op.desc.type() != 'feed':
+                break
+            name = op.desc.output('Out')[0]
+            var = global_block.var(name)
+            self.columns.append(
+                (
+                    name,
+                    op.desc.attr('col'),
+                    var,
+                    var.dtype != core.VarDesc.VarType.STRINGS,
+                )
+            )
+        # feed target name -> (shape, dtype) of the last checked feed
+        self.signatures = {}
+        # feed target name -> reusable LoDTensor
+        self.buffers = {}
+
+
 class FetchHandler:
     def __init__(self, var_dict=None, period_secs=60):
         assert var_dict is not None
@@ -736,6 +811,83 @@ class _StandaloneExecutor:
         return res
 
 
+def _get_executor_cache_capacity():
+    # NOTE: 0 or negative capacity for unbounded caches
+    return int(os.environ.get('FLAGS_executor_cache_capacity', 128))
+
+
+class _LRUCache:
+    """
+    Size bounded LRU cache shared by the program, context, scope and
+    trainer caches of Executor. Items of all caches with the same key are
+    grouped together and counted as one entry, the least recently used
+    group is evicted once the number of groups exceeds :attr:`capacity`,
+    which keeps the cached program, context and scope of a key consistent.
+
+    Args:
+        capacity(int): the max number of keys, 0 or negative for
+            unbounded.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # key -> {cache name -> (value, on_evict)}
+        self._groups = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, name, key):
+        group = self._groups.get(key)
+        if group is None or name not in group:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._groups.move_to_end(key)
+        return group[name][0]
+
+    def put(self, name, key, value, on_evict=None):
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = {}
+        group[name] = (value, on_evict)
+        self._groups.move_to_end(key)
+        while self.capacity > 0 and len(self._groups) > self.capacity:
+            _, evicted = self._groups.popitem(last=False)
+            self.evictions += 1
+            self._release(evicted)
+
+    def values(self, name):
+        return [
+            group[name][0] for group in self._groups.values() if name in group
+        ]
+
+    @staticmethod
+    def _release(group):
+        for value, on_evict in group.values():
+            if on_evict is not None:
+                on_evict(value)
+
+    def clear(self, release=True):
+        groups = list(self._groups.values())
+        self._groups.clear()
+        if release:
+            for group in groups:
+                self._release(group)
+
+    def __len__(self):
+        return len(self._groups)
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._groups),
+            'capacity': self.capacity,
+        }
+
+
 class _ExecutorCache:
     class _CachedData:
         def __init__(
@@ -991,17 +1143,20 @@ class Executor:
             self.place = expected_place
         else:
             self.place = framework._get_paddle_place(place)
-        self.program_caches = dict()
-        self.ctx_caches = dict()
-        self.trainer_caches = dict()
-        self.scope_caches = dict()
-        self.var_caches = dict()
-        self.pruned_program_caches = dict()
+        # NOTE: program, ctx, scope, trainer and pruned program caches are
+        #       stored in a shared LRU cache bounded by the number of keys
+        self._caches = _LRUCache(_get_executor_cache_capacity())
+        # NOTE: feed plans are kept by program identity instead of hash of
+        #       desc, which would serialize the program freshly cloned in
+        #       each run without program cache. A plan is released with its
+        #       program, so plans of cached programs live as long as the
+        #       program caches
+        self._feed_plans = weakref.WeakKeyDictionary()
+        self._feed_buffer_names = set()
         p = core.Place()
         p.set_place(self.place)
         self._default_executor = core.Executor(p)
         self._closed = False
-        self.pruned_program_scope_caches = dict()
         self._prepare_to_run_called = False
 
         self._auto_checkpoint_name = unique_name.generate(
@@ -1024,40 +1179,79 @@ class Executor:
         self._executor_cache.clear()
 
     def _get_scope_cache(self, program_cache_key):
-        return self.scope_caches.get(program_cache_key, None)
+        return self._caches.get('scope', program_cache_key)
 
     def _get_ctx_cache(self, program_cache_key):
-        return self.ctx_caches.get(program_cache_key, None)
+        return self._caches.get('ctx', program_cache_key)
 
     def _get_trainer_cache(self, program_cache_key):
-        return self.trainer_caches.get(program_cache_key, None)
+        return self._caches.get('trainer', program_cache_key)
 
     def _get_program_cache(self, program_cache_key):
-        return self.program_caches.get(program_cache_key, None)
+        return self._caches.get('program', program_cache_key)
 
     def _add_program_cache(self, program_cache_key, program):
-        self.program_caches[program_cache_key] = program
+        self._caches.put('program', program_cache_key, program)
 
     def _get_pruned_program_cache(self, program_cache_key):
-        return self.pruned_program_caches.get(program_cache_key, None)
+        return self._caches.get('pruned_program', program_cache_key)
 
     def _add_pruned_program_cache(self, program_cache_key, program):
-        self.pruned_program_caches[program_cache_key] = program
+        self._caches.put('pruned_program', program_cache_key, program)
 
     def _get_pruned_program_scope_cache(self, program_cache_key):
-        return self.pruned_program_scope_caches.get(program_cache_key, None)
+        return self._caches.get('pruned_program_scope', program_cache_key)
 
     def _add_pruned_program_scope_cache(self, program_cache_key, program):
-        self.pruned_program_scope_caches[program_cache_key] = program
+        self._caches.put('pruned_program_scope', program_cache_key, program)
 
     def _add_ctx_cache(self, ctx_cache_key, ctx):
-        self.ctx_caches[ctx_cache_key] = ctx
+        self._caches.put('ctx', ctx_cache_key, ctx)
 
     def _add_trainer_cache(self, trainer_cache_key, ctx):
-        self.trainer_caches[trainer_cache_key] = ctx
+        self._caches.put(
+            'trainer',
+            trainer_cache_key,
+            ctx,
+            on_evict=self._default_executor.release_trainer,
+        )
+
+    def _add_scope_cache(self, scope_cache_key, scope, on_evict=None):
+        self._caches.put('scope', scope_cache_key, scope, on_evict)
 
-    def _add_scope_cache(self, scope_cache_key, scope):
-        self.scope_caches[scope_cache_key] = scope
+    def cache_info(self):
+        """
+        Get the statistics of the program caches of Executor, which are
+        bounded by the number of cached programs set by the environment
+        variable :code:`FLAGS_executor_cache_capacity` (default 128, 0 for
+        unbounded), least recently used programs are evicted first.
+
+        Returns:
+            dict: the statistics, including ``hits``, ``misses``,
+                ``evictions``, ``size`` and ``capacity`` of the caches of
+                Executor, and the statistics of the standalone executor
+                cache in ``standalone``.
+
+        Examples:
+            .. code-block:: python
+
+                import paddle
+
+                paddle.enable_static()
+                exe = paddle.static.Executor(paddle.CPUPlace())
+                print(exe.cache_info())
+        """
+        info = self._caches.info()
+        standalone_info = (
+            self._executor_cache._get_cached_program_and_executor.cache_info()
+        )
+        info['standalone'] = {
+            'hits': standalone_info.hits,
+            'misses': standalone_info.misses,
+            'size': standalone_info.currsize,
+            'capacity': standalone_info.maxsize,
+        }
+        return info
 
     # just for testing, will be removed later
     @lru_cache()
@@ -1066,24 +1260,80 @@ class Executor:
             f"use_program_cache is force set to {use_program_cache} by FLAGS_FORCE_USE_PROGRAM_CACHE"
         )
 
+    def _get_feed_plan(self, program):
+        plan = self._feed_plans.get(program)
+        if plan is None:
+            plan = _FeedPlan(program)
+            self._feed_plans[program] = plan
+        return plan
+
     def _feed_data(self, program, feed, feed_var_name, scope):
         # feed var to framework
-        global_block = program.global_block()
-        for op in global_block.ops:
-            if op.desc.type() == 'feed':
-                feed_target_name = op.desc.output('Out')[0]
-                cur_feed = feed[feed_target_name]
-                var = global_block.var(feed_target_name)
-                if var.dtype != core.VarDesc.VarType.STRINGS:
-                    if not isinstance(cur_feed, core.LoDTensor):
-                        cur_feed = _as_lodtensor(
-                            cur_feed, self.place, var.dtype
-                        )
+        # NOTE: feed columns are parsed once for each program, and the check
+        #       of a feed is skipped if its shape and dtype are same as the
+        #       last checked feed of the column
+        plan = self._get_feed_plan(program)
+        for feed_target_name, idx, var, need_check in plan.columns:
+            cur_feed = feed[feed_target_name]
+            if need_check:
+                buffer = None
+                if feed_target_name in self._feed_buffer_names:
+                    buffer = plan.buffers.get(feed_target_name)
+                    if buffer is None:
+                        buffer = core.LoDTensor()
+                        plan.buffers[feed_target_name] = buffer
+                cur_feed = _as_feed_tensor(
+                    cur_feed, self.place, var.dtype, buffer
+                )
+                signature = (tuple(cur_feed.shape()), cur_feed._dtype())
+                if plan.signatures.get(feed_target_name) != signature:
                     check_feed_shape_type(var, cur_feed)
-                idx = op.desc.attr('col')
-                core.set_feed_variable(scope, cur_feed, feed_var_name, idx)
-            else:
-                break
+                    plan.signatures[feed_target_name] = signature
+            core.set_feed_variable(scope, cur_feed, feed_var_name, idx)
+
+    def register_feed_buffers(self, feed_names):
+        """
+        Register reusable feed buffers for the given feed variables. Once
+        registered, numpy.ndarray fed to these variables is copied into a
+        buffer kept by Executor for each program instead of a newly created
+        tensor in each run, which reduces the overhead of feeding for small
+        batch and low latency inference.
+
+        Feeding LoDTensor, DLPack capsules or objects supporting
+        :code:`__dlpack__` is always zero-copy, and objects supporting
+        :code:`__array_interface__` are viewed as numpy.ndarray without
+        copy before fed.
+
+        Note:
+            The buffer is overwritten by the next run, so the fed variables
+            fetched with :code:`return_numpy=False` should be copied before
+            the next run.
+
+        Args:
+            feed_names(list|tuple|str): the names of feed variables.
+
+        Returns:
+            None
+
+        Examples:
+            .. code-block:: python
+
+                import numpy as np
+                import paddle
+
+                paddle.enable_static()
+                x = paddle.static.data(name='x', shape=[-1, 4], dtype='float32')
+                out = paddle.scale(x, scale=2.0)
+
+                exe = paddle.static.Executor(paddle.CPUPlace())
+                exe.register_feed_buffers(['x'])
+                for _ in range(10):
+                    data = np.random.random([1, 4]).astype('float32')
+                    res = exe.run(feed={'x': data}, fetch_list=[out])
+        """
+        if isinstance(feed_names, str):
+            feed_names = [feed_names]
+        self._feed_buffer_names.update(feed_names)
 
     def _fetch_data(self, fetch_list, fetch_var_name, scope):
         outs = [
@@ -1287,9 +1537,10 @@ class Executor:
         """
         if not self._closed:
             self._closed = True
-            for k, trainer_instance in self.trainer_caches.items():
+            for trainer_instance in self._caches.values('trainer'):
                 self._default_executor.release_trainer(trainer_instance)
                 del trainer_instance
+            self._caches.clear(release=False)
             self._default_executor.close()
 
     def _run_parallel(
@@ -1424,6 +1675,8 @@ class Executor:
                 If the parameter is True, the model may run faster in the following cases:
                 the input program is :code:`paddle.static.Program`, and the parameters(program, feed Tensor name
                 and fetch_list Tensor) of this interface remains unchanged during running.
+                Programs rebuilt with the same content share the cache only if their
+                variable names are the same, e.g. built under :code:`paddle.utils.unique_name.guard()`.
                 The default is False.
             return_merged(bool): This parameter indicates whether fetched Tensors (the Tensors
                 specified in the fetch list) should be merged according to the execution device dimension.
@@ -1962,11 +2215,15 @@ class Executor:
             )
 
         if use_program_cache:
-            cache_key = _get_strong_program_cache_key(program, feed, fetch_list)
+            # NOTE: cached scope is a sub-scope of scope, distinguish the
+            #       same program run in different scopes
+            cache_key = _get_strong_program_cache_key(
+                program, feed, fetch_list
+            ) + str(id(scope))
             cached_program = self._get_program_cache(cache_key)
             cached_ctx = self._get_ctx_cache(cache_key)
             cached_scope = self._get_scope_cache(cache_key)
-            if cached_program is None:
+            if cached_program is None or cached_ctx is None:
                 cached_program = _add_feed_fetch_ops(
                     program=program,
                     feed=feed,
@@ -1988,8 +2245,19 @@ class Executor:
                 self._default_executor.create_variables(
                     cached_program.desc, cached_scope, 0
                 )
+                # NOTE: sub-scope is owned by scope and cannot be deleted
+                #       alone, release its variables once evicted
+                local_var_names = [
+                    name
+                    for name, var in cached_program.global_block().vars.items()
+                    if not var.persistable
+                ]
                 self._add_ctx_cache(cache_key, cached_ctx)
-                self._add_scope_cache(cache_key, cached_scope)
+                self._add_scope_cache(
+                    cache_key,
+                    cached_scope,
+                    on_evict=lambda s, names=local_var_names: s.erase(names),
+                )
             program = cached_program
             ctx = cached_ctx
             scope = cached_scope
@@ -19,6 +19,7 @@ import threading
 import paddle
 import time
 import copy
+import weakref
 
 from .framework import (
     Program,
@@ -47,7 +48,12 @@ from .dataloader.dataloader_iter import (
     _DatasetKind,
     default_collate_fn,
 )
-from .dataloader.batch_sampler import _InfiniteIterableSampler
+from .dataloader.batch_sampler import (
+    _InfiniteIterableSampler,
+    _SubsetBatchSampler,
+)
+from .dataloader.fetcher import _has_getitems
+from .dataloader.device_prefetcher import _DevicePrefetcher
 from .layers.io import (
     monkey_patch_reader_methods,
     _copy_reader_var_,
@@ -79,13 +85,21 @@ USE_PINNED_MEMORY = None
 # AutoTune Flags
 USE_AUTOTUNE = False
 TUNING_STEPS = 500
+ONLINE_TUNING = False
+# candidates of prefetch_factor to search, ordered by memory cost
+PREFETCH_FACTOR_CANDIDATES = [1, 2, 4, 8]
+# an option is only switched from the user config when it is faster
+# than the user config by more than the tolerance
+TUNING_TOLERANCE = 0.1
 
 
-def set_autotune_config(use_autotune, tuning_steps=500):
+def set_autotune_config(use_autotune, tuning_steps=500, online_tuning=False):
     global USE_AUTOTUNE
     USE_AUTOTUNE = use_autotune
     global TUNING_STEPS
     TUNING_STEPS = tuning_steps
+    global ONLINE_TUNING
+    ONLINE_TUNING = online_tuning
 
 
 def keep_data_loader_order(*args):
@@ -176,6 +190,9 @@ class AuToTune:
     def __init__(self, loader):
         self.loader = loader
         self.max_num_worker = multiprocessing.cpu_count() / 2
+        # tuning result of each option and the costs evaluated, None
+        # if auto tuning is not performed
+        self.report = None
 
     def __call__(self):
         # use default loader
@@ -187,6 +204,12 @@ class AuToTune:
         if auto_tune_loader is None:
             return self.loader.num_workers
 
+        best_num_workers = self.tune_num_workers(auto_tune_loader)
+        self.report = {'num_workers': best_num_workers, 'costs': {}}
+        self.tune_options(auto_tune_loader, best_num_workers)
+        return best_num_workers
+
+    def tune_num_workers(self, auto_tune_loader):
         # pick the best num_workers
         auto_tune_start = time.time()
         logging.debug("========= DataLoader Auto Tune =========")
@@ -250,6 +273,14 @@ class AuToTune:
         loader = copy.copy(self.loader)
         batch_size = self.loader.batch_sampler.batch_size
         if isinstance(
+            self.loader.batch_sampler, paddle.io.BucketedBatchSampler
+        ):
+            # NOTE: mini-batches of bucketed batch sampler are dynamic,
+            #       use the first mini-batches as the tuning data
+            loader.batch_sampler = _SubsetBatchSampler(
+                self.loader.batch_sampler, TUNING_STEPS
+            )
+        elif isinstance(
             self.loader.batch_sampler, paddle.io.DistributedBatchSampler
         ):
             dataset = self.loader.batch_sampler.dataset
@@ -292,7 +323,7 @@ class AuToTune:
         num_workers = best_workers + 1
         boundary = 1
         while num_workers < num_work_boundary and step < 5:
-            self.loader.num_workers = num_workers
+            reader.num_workers = num_workers
             time = self.evaluate_reader_cost(reader)
             logging.debug(
                 "for back num_workers: "
@@ -308,6 +339,53 @@ class AuToTune:
             boundary *= 0.80
         return best_workers
 
+    def get_option_candidates(self, num_workers):
+        candidates = []
+        if num_workers > 0:
+            candidates.append(('prefetch_factor', PREFETCH_FACTOR_CANDIDATES))
+            candidates.append(('use_shared_memory', [True, False]))
+        # columnar reading changes the input format of collate_fn, only
+        # tune it when default collate_fn is used
+        if self.loader._use_getitems and self.loader.collate_fn is None:
+            candidates.append(('_use_getitems', [True, False]))
+        return candidates
+
+    def tune_options(self, reader, num_workers):
+        # search options one by one with other options fixed, for each
+        # option, the first candidate(cheapest in memory) whose cost is
+        # within TUNING_TOLERANCE of the best cost is picked
+        reader.num_workers = num_workers
+        for name, values in self.get_option_candidates(num_workers):
+            user_value = getattr(self.loader, name)
+            costs = {}
+            for value in values:
+                setattr(reader, name, value)
+                costs[value] = self.evaluate_reader_cost(reader)
+            if user_value not in costs:
+                setattr(reader, name, user_value)
+                costs[user_value] = self.evaluate_reader_cost(reader)
+
+            min_cost = min(costs.values())
+            best_value = user_value
+            if costs[user_value] > min_cost * (1 + TUNING_TOLERANCE):
+                for value in values:
+                    if costs[value] <= min_cost * (1 + TUNING_TOLERANCE):
+                        best_value = value
+                        break
+            logging.debug(
+                "tuning {}: costs {}, best {}".format(name, costs, best_value)
+            )
+
+            setattr(reader, name, best_value)
+            setattr(self.loader, name, best_value)
+            self.report[name] = best_value
+            self.report['costs'][name] = costs
+
+        self.loader.use_shared_memory_pool = (
+            self.loader.use_shared_memory_pool and self.loader.use_shared_memory
+        )
+        logging.info("auto_tune dataLoader report: " + str(self.report))
+
 
 class DataLoader:
     """
@@ -386,7 +464,11 @@ class DataLoader:
             for :attr:`batch_sampler`, see :attr:`batch_size`. Default False
         collate_fn(callable, optional): function to generate mini-batch data by merging
             the sample list, None for only stack each fields of sample in axis
-            0(same as :attr::`np.stack(..., axis=0)`). Default None
+            0(same as :attr::`np.stack(..., axis=0)`). If :attr:`dataset`
+            implements :code:`__getitems__`, batch data is read in columnar
+            format by a single :code:`__getitems__` calling and passed to
+            :attr:`collate_fn` directly, None for only converting each column
+            to numpy array without stacking. Default None
         num_workers(int, optional): the number of subprocess to load data, 0 for no
             subprocess used and loading data in main process. Default 0
         use_buffer_reader (bool, optional): whether to use bufferred reader.
@@ -402,11 +484,37 @@ class DataLoader:
             space of '/dev/shm' on Linux operating sysytem) is large enough.
             Shared memory will only be enabled in multi-process mode(num_workers
             > 0). Default True.
+        use_shared_memory_pool (bool, optional): whether to transport batch
+            data from subprocesses through a pool of preallocated and reusable
+            shared memory slots of each worker, only slot location and array
+            metas are put into inter-process queue, which avoids allocating
+            and cleaning up shared memory for each batch. Batches contain
+            data other than numpy array fall back to the common path. Only
+            enabled when :attr:`use_shared_memory` is True in multi-process
+            mode(num_workers > 0). Default False.
         timeout(int, optional): the timeout value for getting data form output queue
             of subprocesses. Default 0.
         worker_init_fn(callable, optional): init function which will be called with
             worker id on each subproces starting if not set as None. Default
             None.
+        persistent_workers(bool, optional): whether to keep subprocesses alive
+            after a dataset has been consumed once. If True, subprocesses
+            are started only once and reused in following epochs, which
+            keeps the dataset objects (e.g. opened files and caches) and
+            the state initialized by :attr:`worker_init_fn` in workers,
+            only batch indices of the new epoch are sent to workers. Only
+            enabled in multi-process mode(num_workers > 0). Default False.
+        device_prefetch_depth(int, optional): the number of batches kept
+            resident on target place by a device prefetch stage. If
+            positive, batches are read in CPU place and copied to target
+            place (through pinned memory for CUDA place) by a separate
+            thread ahead of consuming, which overlaps the copy with the
+            computing of previous steps. Metrics of the stage can be got
+            by :code:`device_prefetch_stats`. Only enabled in dynamic
+            graph mode. Default 0, disabled.
+        collect_metrics(bool, optional): whether to record the latency of
+            each pipeline stage and the occupancy of queues, the metrics
+            can be got by :code:`pipeline_metrics`. Default False.
 
     Returns:
         DataLoader: an iterable object for data iterating, each elemnet of the generated data is a Tensor.
@@ -497,6 +605,9 @@ class DataLoader:
         timeout=0,
         worker_init_fn=None,
         persistent_workers=False,
+        use_shared_memory_pool=False,
+        device_prefetch_depth=0,
+        collect_metrics=False,
     ):
         self.return_list = return_list
         self.collate_fn = collate_fn
@@ -536,6 +647,9 @@ class DataLoader:
         self.use_shared_memory = use_shared_memory
         if use_shared_memory and num_workers == 0:
             self.use_shared_memory = False
+        self.use_shared_memory_pool = (
+            use_shared_memory_pool and self.use_shared_memory
+        )
 
         assert timeout >= 0, "timeout should be a non-negative value"
         self.timeout = timeout
@@ -586,15 +700,50 @@ class DataLoader:
         self.drop_last = drop_last
         self.auto_collate_batch = self.batch_sampler is not None
 
+        # read batch data in columnar format by dataset.__getitems__
+        self._use_getitems = self.dataset_kind == _DatasetKind.MAP and (
+            _has_getitems(dataset)
+        )
+
         self.pin_memory = False
         if _non_static_mode():
             self.pin_memory = (
                 True if use_pinned_memory() is None else use_pinned_memory()
             )
 
+        assert (
+            isinstance(device_prefetch_depth, int)
+            and device_prefetch_depth >= 0
+        ), "device_prefetch_depth should be a non-negative integer"
+        self._device_prefetch_depth = 0
+        if _non_static_mode():
+            self._device_prefetch_depth = device_prefetch_depth
+        elif device_prefetch_depth > 0:
+            warnings.warn(
+                "device_prefetch_depth is only supported in dynamic graph "
+                "mode, device prefetch stage is disabled"
+            )
+        # NOTE: weak reference to the device prefetch stage of the last
+        #       iterator, a strong one would keep the inner iterator and
+        #       its worker processes alive after breaking out of the loop
+        self._device_prefetcher = None
+        self._device_prefetch_stats = None
+
+        self._collect_metrics = collect_metrics
+        self._pipeline_metrics = None
+
         self._persistent_workers = persistent_workers
         self._iterator = None
-        self.num_workers = AuToTune(self).__call__()
+        # iteration state of the last iterator created for state_dict
+        self._last_iteration_state = None
+        auto_tune = AuToTune(self)
+        self.num_workers = auto_tune()
+        # NOTE: report of the options tuned, online tuning updates the
+        #       'online' field of the report in iterating
+        self.autotune_report = auto_tune.report
+        self._online_tuning = (
+            USE_AUTOTUNE and ONLINE_TUNING and self.num_workers > 0
+        )
 
     def __len__(self):
         if self.dataset_kind == _DatasetKind.ITER:
@@ -606,20 +755,227 @@ class DataLoader:
                 return len(self.dataset)
 
     def __iter__(self):
+        # NOTE: stop the device prefetch thread of last epoch before the
+        #       persistent iterator is reset
+        prefetcher = (
+            self._device_prefetcher()
+            if self._device_prefetcher is not None
+            else None
+        )
+        if prefetcher is not None:
+            prefetcher.shutdown()
+        self._device_prefetcher = None
         if self.num_workers == 0:
-            return _DataLoaderIterSingleProcess(self)
+            iterator = _DataLoaderIterSingleProcess(self)
         elif self._persistent_workers:
-            if self._iterator is None:
+            # NOTE: iterator may be shutdown on exception, recreate it
+            if self._iterator is None or self._iterator._shutdown:
                 self._iterator = _DataLoaderIterMultiProcess(self)
             else:
                 self._iterator._reset()
-            return self._iterator
+            iterator = self._iterator
         else:
-            return _DataLoaderIterMultiProcess(self)
+            iterator = _DataLoaderIterMultiProcess(self)
+        self._pipeline_metrics = iterator._metrics
+        if self._device_prefetch_depth > 0:
+            iterator = _DevicePrefetcher(
+                iterator, self.places[0], self._device_prefetch_depth
+            )
+            self._device_prefetcher = weakref.ref(iterator)
+            self._device_prefetch_stats = iterator._stats
+        self._last_iteration_state = iterator._iteration_state
+        return iterator
 
     def __call__(self):
         return self.__iter__()
 
+    def pipeline_metrics(self):
+        """
+        Get the metrics of data loading pipeline of current iteration,
+        only available when :attr:`collect_metrics` is True. Latencies
+        of following stages of each batch are recorded:
+
+        - ``getitem``: reading samples from dataset.
+        - ``collate``: merging samples by :attr:`collate_fn`.
+        - ``flatten``: flattening batch into fields.
+        - ``ipc_put``: putting batch into inter-process queue in worker.
+        - ``ipc_get``: getting batch from inter-process queue, including
+          waiting for workers.
+        - ``to_tensor``: converting batch fields to tensors.
+        - ``queue_push``: pushing batch into the blocking queue read by
+          iterator, including waiting for a free space.
+        - ``next_wait``: waiting for a batch in each iteration step.
+
+        Stages in worker processes are recorded in shared memory by each
+        worker, stages in main process are also recorded as named ranges
+        ``DataLoader::<stage>`` of :code:`paddle.profiler` when profiler
+        is enabled. The occupancy of ``blocking_queue`` and the number of
+        ``outstanding_batches`` sent to workers are sampled on each step.
+
+        Returns:
+            dict|None: metric name -> summary of the metric, the summary
+                contains ``count``, ``mean``, ``p50``, ``p90``, ``p99`` and
+                ``histogram`` as a list of (bucket upper bound, count) for
+                all metrics, and ``total``, ``max`` in seconds for stage
+                latencies. Percentiles are upper bounds of histogram
+                buckets. None if metrics are not collected or no iteration
+                started.
+
+        Examples:
+
+            .. code-block:: python
+
+                import numpy as np
+                from paddle.io import Dataset, DataLoader
+
+                class RandomDataset(Dataset):
+                    def __getitem__(self, idx):
+                        return np.random.random([784]).astype('float32')
+
+                    def __len__(self):
+                        return 100
+
+                loader = DataLoader(RandomDataset(), batch_size=10,
+                                    collect_metrics=True)
+                for data in loader:
+                    pass
+                metrics = loader.pipeline_metrics()
+                print(metrics['getitem']['mean'], metrics['next_wait']['p90'])
+        """
+        if self._pipeline_metrics is None:
+            return None
+        return self._pipeline_metrics.summary()
+
+    def device_prefetch_stats(self):
+        """
+        Get the metrics of the device prefetch stage of current iteration,
+        only available when :attr:`device_prefetch_depth` is positive.
+
+        Returns:
+            dict|None: the metrics, including ``num_batches`` (batches
+                output), ``queue_depth`` (current batches resident on target
+                place), ``avg_queue_depth`` (average batches resident when a
+                batch is taken), ``copy_time``/``max_copy_time`` (total and
+                max seconds of copying batches to target place) and
+                ``stall_time`` (total seconds waiting for batch copying).
+                None if device prefetch stage is disabled or no iteration
+                started.
+
+        Examples:
+
+            .. code-block:: python
+
+                import numpy as np
+                import paddle
+                from paddle.io import TensorDataset, DataLoader
+
+                images = paddle.to_tensor(
+                    np.random.random([100, 784]).astype('float32'))
+                loader = DataLoader(TensorDataset([images]), batch_size=10,
+                                    device_prefetch_depth=2)
+                for data in loader:
+                    pass
+                print(loader.device_prefetch_stats())
+        """
+        if self._device_prefetch_stats is None:
+            return None
+        prefetcher = (
+            self._device_prefetcher()
+            if self._device_prefetcher is not None
+            else None
+        )
+        if prefetcher is not None:
+            return prefetcher.stats()
+        # batches resident on target place are released with the stage
+        return self._device_prefetch_stats.to_dict()
+
+    def state_dict(self):
+        """
+        Get the iteration state of DataLoader for checkpointing, which
+        contains the state of batch sampler (e.g. the random state and
+        epoch to generate indices) at the beginning of current epoch and
+        the number of batches consumed by the last iterator, which is kept
+        after the iterator is released. Batches prefetched in worker
+        processes or buffers but not consumed yet are not counted, so they
+        will be loaded again after resuming.
+
+        Only supported in automatic batching mode with :attr:`batch_sampler`
+        implements :code:`state_dict`, e.g. :code:`paddle.io.BatchSampler`
+        and :code:`paddle.io.DistributedBatchSampler`.
+
+        Returns:
+            dict: the state of DataLoader iteration.
+
+        Examples:
+
+            .. code-block:: python
+
+                import numpy as np
+                from paddle.io import Dataset, DataLoader
+
+                class RandomDataset(Dataset):
+                    def __init__(self, num_samples):
+                        self.num_samples = num_samples
+
+                    def __getitem__(self, idx):
+                        image = np.random.random([784]).astype('float32')
+                        label = np.random.randint(0, 9, (1, )).astype('int64')
+                        return image, label
+
+                    def __len__(self):
+                        return self.num_samples
+
+                loader = DataLoader(RandomDataset(100), batch_size=10,
+                                    shuffle=True)
+                for i, data in enumerate(loader):
+                    if i == 3:
+                        state = loader.state_dict()
+                        break
+
+                # resume from the 5th batch of the epoch in another loader
+                resumed_loader = DataLoader(RandomDataset(100), batch_size=10,
+                                            shuffle=True)
+                resumed_loader.set_state_dict(state)
+                for data in resumed_loader:
+                    pass
+        """
+        # NOTE: the state of the last iterator is kept after the iterator
+        #       released, the state of batch sampler counts the batches
+        #       prefetched but not output, which should not be returned
+        if self._last_iteration_state is not None:
+            return self._last_iteration_state.state_dict()
+        if self.batch_sampler is None or not hasattr(
+            self.batch_sampler, 'state_dict'
+        ):
+            raise NotImplementedError(
+                "state_dict is only supported when batch_sampler implements "
+                "state_dict, but got batch_sampler {}".format(
+                    type(self.batch_sampler)
+                )
+            )
+        return self.batch_sampler.state_dict()
+
+    def set_state_dict(self, state_dict):
+        """
+        Set the iteration state got by :code:`state_dict`, the next
+        iteration of DataLoader will start from the next batch of the last
+        consumed batch recorded in the state. Consumed batches are skipped
+        by the batch sampler directly without loading.
+
+        Args:
+            state_dict(dict): the state of DataLoader iteration.
+        """
+        if self.batch_sampler is None or not hasattr(
+            self.batch_sampler, 'set_state_dict'
+        ):
+            raise NotImplementedError(
+                "set_state_dict is only supported when batch_sampler "
+                "implements set_state_dict, but got batch_sampler {}".format(
+                    type(self.batch_sampler)
+                )
+            )
+        self.batch_sampler.set_state_dict(state_dict)
+
     @staticmethod
     def from_generator(
         feed_list=None,
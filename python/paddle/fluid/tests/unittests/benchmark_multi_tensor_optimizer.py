@@ -0,0 +1,116 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of optimizer.step() on a model with thousands of small
+# parameters, where the per parameter operator dispatch dominates, with and
+# without `use_multi_tensor`. Usage:
+#     python benchmark_multi_tensor_optimizer.py --num_params 4000 --device cpu
+
+import argparse
+import time
+
+import paddle
+
+OPTIMIZERS = {
+    'AdamW': lambda params, multi: paddle.optimizer.AdamW(
+        parameters=params, use_multi_tensor=multi
+    ),
+    'Lamb': lambda params, multi: paddle.optimizer.Lamb(
+        parameters=params, use_multi_tensor=multi
+    ),
+    'RMSProp': lambda params, multi: paddle.optimizer.RMSProp(
+        learning_rate=0.001, parameters=params, use_multi_tensor=multi
+    ),
+    'Adagrad': lambda params, multi: paddle.optimizer.Adagrad(
+        learning_rate=0.001, parameters=params, use_multi_tensor=multi
+    ),
+}
+
+
+class SmallParamsNet(paddle.nn.Layer):
+    """
+    Layer norms of a deep transformer: many parameters of hidden_size.
+    """
+
+    def __init__(self, num_params, hidden_size):
+        super().__init__()
+        self.norms = paddle.nn.LayerList(
+            [paddle.nn.LayerNorm(hidden_size) for _ in range(num_params // 2)]
+        )
+
+    def forward(self, x):
+        for norm in self.norms:
+            x = norm(x)
+        return x
+
+
+def synchronize():
+    if paddle.get_device().startswith('gpu'):
+        paddle.device.cuda.synchronize()
+
+
+def benchmark(name, num_params, hidden_size, steps, use_multi_tensor):
+    paddle.seed(2022)
+    model = SmallParamsNet(num_params, hidden_size)
+    optimizer = OPTIMIZERS[name](model.parameters(), use_multi_tensor)
+    x = paddle.randn([4, hidden_size])
+    model(x).mean().backward()
+    # the first step creates the accumulators and fuses the parameters
+    optimizer.step()
+    synchronize()
+    start = time.perf_counter()
+    for _ in range(steps):
+        optimizer.step()
+    synchronize()
+    return (time.perf_counter() - start) / steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_params', type=int, default=4000)
+    parser.add_argument('--hidden_size', type=int, default=64)
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--device', type=str, default='cpu')
+    args = parser.parse_args()
+
+    paddle.set_device(args.device)
+    print(
+        'device: {}, num_params: {}, hidden_size: {}'.format(
+            args.device, args.num_params, args.hidden_size
+        )
+    )
+    print(
+        '{:<10}{:>14}{:>16}{:>10}'.format(
+            'optimizer', 'per param(ms)', 'multi tensor(ms)', 'speedup'
+        )
+    )
+    for name in OPTIMIZERS:
+        per_param_cost = benchmark(
+            name, args.num_params, args.hidden_size, args.steps, False
+        )
+        multi_tensor_cost = benchmark(
+            name, args.num_params, args.hidden_size, args.steps, True
+        )
+        print(
+            '{:<10}{:>14.2f}{:>16.2f}{:>9.1f}x'.format(
+                name,
+                per_param_cost * 1000,
+                multi_tensor_cost * 1000,
+                per_param_cost / multi_tensor_cost,
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
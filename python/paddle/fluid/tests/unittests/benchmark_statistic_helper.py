@@ -0,0 +1,120 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Benchmark of the range algebra used by the profiler summary, comparing
+# the list functions and `TimeRanges` on synthetic traces. Usage:
+#     python benchmark_statistic_helper.py --num_events 1000000
+
+import argparse
+import time
+
+import numpy as np
+
+import paddle.profiler.statistic_helper as statistic_helper
+
+
+def synthetic_trace(num_events, num_streams, seed):
+    """
+    Kernels launched back to back on several streams, with random
+    durations and gaps in nanoseconds, like the device events of a trace.
+    """
+    rng = np.random.RandomState(seed)
+    ranges = []
+    for _ in range(num_streams):
+        num = num_events // num_streams
+        durations = rng.randint(1000, 50000, size=num)
+        gaps = rng.randint(0, 20000, size=num)
+        starts = np.cumsum(durations + gaps) - durations
+        ranges.extend(zip(starts.tolist(), (starts + durations).tolist()))
+    rng.shuffle(ranges)
+    return ranges
+
+
+def timeit(func, repeat):
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        costs.append(time.perf_counter() - start)
+    return min(costs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--num_events', type=int, default=1000000)
+    parser.add_argument('--num_streams', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    computation = synthetic_trace(args.num_events, args.num_streams, 1)
+    communication = synthetic_trace(args.num_events // 10, args.num_streams, 2)
+    merged1 = statistic_helper.merge_self_ranges(list(computation))
+    merged2 = statistic_helper.merge_self_ranges(list(communication))
+    time_ranges1 = statistic_helper.TimeRanges(computation)
+    time_ranges2 = statistic_helper.TimeRanges(communication)
+
+    cases = [
+        (
+            'merge',
+            lambda: statistic_helper.merge_self_ranges(list(computation)),
+            lambda: statistic_helper.TimeRanges(computation),
+        ),
+        (
+            'union',
+            lambda: statistic_helper.merge_ranges(merged1, merged2, True),
+            lambda: time_ranges1.union(time_ranges2),
+        ),
+        (
+            'intersection',
+            lambda: statistic_helper.intersection_ranges(
+                merged1, merged2, True
+            ),
+            lambda: time_ranges1.intersection(time_ranges2),
+        ),
+        (
+            'subtract',
+            lambda: statistic_helper.subtract_ranges(merged1, merged2, True),
+            lambda: time_ranges1.subtract(time_ranges2),
+        ),
+        (
+            'sum',
+            lambda: statistic_helper.sum_ranges(merged1),
+            lambda: time_ranges1.sum(),
+        ),
+    ]
+    print(
+        'num_events: {}, num_streams: {}'.format(
+            args.num_events, args.num_streams
+        )
+    )
+    print(
+        '{:<14}{:>12}{:>14}{:>10}'.format(
+            'operation', 'list(s)', 'TimeRanges(s)', 'speedup'
+        )
+    )
+    for name, list_func, time_ranges_func in cases:
+        list_cost = timeit(list_func, args.repeat)
+        time_ranges_cost = timeit(time_ranges_func, args.repeat)
+        print(
+            '{:<14}{:>12.4f}{:>14.4f}{:>9.1f}x'.format(
+                name,
+                list_cost,
+                time_ranges_cost,
+                list_cost / time_ranges_cost,
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import test_collective_api_base as test_base
+
+import paddle
+from paddle.distributed.fleet.utils.hybrid_parallel_util import (
+    FusedAllReduceReducer,
+)
+
+
+class TestCollectiveAllreduceOverlap(test_base.TestCollectiveAPIRunnerBase):
+    def __init__(self):
+        self.global_ring_id = 0
+
+    def get_model(self, main_prog, startup_program, rank, indata=None):
+        nranks = paddle.distributed.get_world_size()
+        acc_steps = 2
+        # the gradient of each parameter is a slice of indata, and the small
+        # bucket size splits the parameters into several buckets
+        chunks = np.split(indata.reshape([-1]), 10)
+        params = [
+            paddle.create_parameter([chunk.size], str(indata.dtype))
+            for chunk in chunks
+        ]
+        reducer = FusedAllReduceReducer(
+            params, None, acc_steps=acc_steps, bucket_size=2 * chunks[0].nbytes
+        )
+        for step in range(2):
+            for _ in range(acc_steps):
+                loss = paddle.add_n(
+                    [
+                        paddle.sum(param * paddle.to_tensor(chunk))
+                        for param, chunk in zip(params, chunks)
+                    ]
+                )
+                loss.backward()
+            reducer.wait()
+            grads = [param.grad.numpy() for param in params]
+            for param in params:
+                # the released buffer is created again in the next step
+                param.clear_gradient(set_to_zero=step > 0)
+        # the gradients are the mean of the accumulated ones of all ranks
+        grads = np.concatenate(grads).reshape(indata.shape)
+        return [grads * nranks / acc_steps]
+
+
+if __name__ == "__main__":
+    test_base.runtime_main(TestCollectiveAllreduceOverlap, "allreduce")
@@ -352,6 +352,117 @@ class TestAmpScaler(unittest.TestCase):
     def test_nan_inf(self):
         self.nan_inf()
 
+    def run_device_found_inf(self, inp_np, opt_name, **kwargs):
+        paddle.seed(10)
+        with fluid.dygraph.guard():
+            model = SimpleConv(
+                num_channels=3,
+                num_filters=64,
+                filter_size=7,
+                stride=2,
+                act='relu',
+            )
+            optimizer = getattr(paddle.optimizer, opt_name)(
+                learning_rate=0.01, parameters=model.parameters(), **kwargs
+            )
+            scaler = paddle.amp.GradScaler(
+                init_loss_scaling=1024,
+                decr_every_n_nan_or_inf=1,
+                use_device_found_inf=True,
+            )
+            params_init = [param.numpy() for param in model.parameters()]
+            data = fluid.dygraph.to_variable(inp_np)
+            out = model(data)
+            loss = paddle.mean(out)
+            scaled_loss = scaler.scale(loss)
+            scaled_loss.backward()
+            scaler.step(optimizer)
+            scaler.update()
+            # found_inf is not consumed by the optimizer after the step, and
+            # the masked optimize operators are removed
+            self.assertIsNone(optimizer._get_auxiliary_var('found_inf'))
+            self.assertNotIn('_append_optimize_op', vars(optimizer))
+            return scaler, model, params_init, optimizer
+
+    def test_step_on_device(self):
+        inp_np = np.random.random(size=[1, 3, 128, 128]).astype(np.float32)
+        scaler, model, params_init, _ = self.run_device_found_inf(inp_np, 'SGD')
+        self.assertFalse(scaler._found_inf.numpy()[0])
+        self.assertEqual(float(scaler._scale), 1024)
+        self.assertEqual(scaler.state_dict()['incr_count'], 1)
+
+        paddle.seed(10)
+        with fluid.dygraph.guard():
+            model_no_scaler = SimpleConv(
+                num_channels=3,
+                num_filters=64,
+                filter_size=7,
+                stride=2,
+                act='relu',
+            )
+            optimizer = paddle.optimizer.SGD(
+                learning_rate=0.01, parameters=model_no_scaler.parameters()
+            )
+            loss = paddle.mean(model_no_scaler(paddle.to_tensor(inp_np)))
+            loss.backward()
+            optimizer.step()
+        for param, param_no_scaler in zip(
+            model.parameters(), model_no_scaler.parameters()
+        ):
+            np.testing.assert_allclose(
+                param.numpy(), param_no_scaler.numpy(), rtol=1e-05
+            )
+
+    def test_nan_inf_on_device(self):
+        inp_np = np.random.random(size=[1, 3, 128, 128]).astype(np.float32)
+        inp_np[0][1][2][3] = np.nan
+        for opt_name, kwargs in [
+            ('SGD', {}),
+            ('Momentum', {'weight_decay': 0.1}),
+            ('Adam', {}),
+            ('AdamW', {'weight_decay': 0.1}),
+            ('Lamb', {}),
+            ('Lamb', {'use_multi_tensor': True}),
+        ]:
+            scaler, model, params_init, _ = self.run_device_found_inf(
+                inp_np, opt_name, **kwargs
+            )
+            self.assertTrue(scaler._found_inf.numpy()[0])
+            self.assertEqual(float(scaler._scale), 512)
+            self.assertEqual(scaler.state_dict()['decr_count'], 0)
+            for param, param_init in zip(model.parameters(), params_init):
+                # the gradients are set to zero, and the update is masked
+                np.testing.assert_array_equal(
+                    param.grad.numpy(), np.zeros_like(param_init)
+                )
+                np.testing.assert_array_equal(param.numpy(), param_init)
+
+    def test_mask_optimizer_states_on_device(self):
+        inp_np = np.random.random(size=[1, 3, 128, 128]).astype(np.float32)
+        inp_np[0][1][2][3] = np.nan
+        for opt_name, kwargs in [
+            ('Adam', {}),
+            ('AdamW', {}),
+            ('Lamb', {}),
+            ('Lamb', {'use_multi_tensor': True}),
+        ]:
+            scaler, model, _, optimizer = self.run_device_found_inf(
+                inp_np, opt_name, **kwargs
+            )
+            # beta pows are kept on device, and not advanced by the masked
+            # update
+            for param in model.parameters():
+                beta1_pow = optimizer._get_accumulator('beta1_pow_acc', param)
+                beta2_pow = optimizer._get_accumulator('beta2_pow_acc', param)
+                self.assertEqual(
+                    str(beta1_pow.place), str(scaler._found_inf.place)
+                )
+                self.assertEqual(
+                    str(beta2_pow.place), str(scaler._found_inf.place)
+                )
+                np.testing.assert_allclose(beta1_pow.numpy(), [0.9])
+                np.testing.assert_allclose(beta2_pow.numpy(), [0.999])
+
     def step_update_exception(self):
         def func1():
             model = paddle.nn.Conv2D(3, 2, 3, bias_attr=True)
@@ -31,6 +31,9 @@ class TestHybridParallel(TestMultipleGpus):
         self.run_mnist_2gpu('hybrid_parallel_mp_amp.py')
         self.run_mnist_2gpu('hybrid_parallel_mp_amp.py', eager_mode=False)
 
+    def test_hybrid_parallel_mp_amp_device_found_inf(self):
+        self.run_mnist_2gpu('hybrid_parallel_mp_amp_device_found_inf.py')
+
     def test_hybrid_parallel_mp_fp16(self):
         self.run_mnist_2gpu('hybrid_parallel_mp_fp16.py')
         self.run_mnist_2gpu('hybrid_parallel_mp_fp16.py', eager_mode=False)
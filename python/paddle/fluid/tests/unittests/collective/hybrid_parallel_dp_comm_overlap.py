@@ -0,0 +1,135 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+import paddle.distributed.fleet as fleet
+
+batch_size = 8
+in_size = 16
+hidden_size = 32
+out_size = 4
+
+
+class SimpleNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear1 = paddle.nn.Linear(in_size, hidden_size)
+        self.linear2 = paddle.nn.Linear(hidden_size, hidden_size)
+        self.linear3 = paddle.nn.Linear(hidden_size, out_size)
+
+    def forward(self, x):
+        x = paddle.nn.functional.relu(self.linear1(x))
+        x = paddle.nn.functional.relu(self.linear2(x))
+        return self.linear3(x)
+
+
+class TestDpCommOverlap(unittest.TestCase):
+    def setUp(self):
+        # NOTE: gradients of data parallel are all-reduced by the optimizer
+        #       only if the parallel mode is not pure data parallel
+        self.hybrid_configs = {
+            "dp_degree": 2,
+            "mp_degree": 2,
+            "pp_degree": 1,
+            "dp_comm_overlap": True,
+        }
+        strategy = fleet.DistributedStrategy()
+        strategy.hybrid_configs = self.hybrid_configs
+        fleet.init(is_collective=True, strategy=strategy)
+
+    def build_optimizer(self, model, acc_steps):
+        optimizer = paddle.optimizer.Adam(
+            learning_rate=0.01, parameters=model.parameters()
+        )
+        strategy = fleet.DistributedStrategy()
+        strategy.hybrid_configs = dict(
+            self.hybrid_configs, dp_accumulate_steps=acc_steps
+        )
+        return fleet.distributed_optimizer(optimizer, strategy=strategy)
+
+    def train(self, acc_steps, dp_acc_steps):
+        hcg = fleet.get_hybrid_communicate_group()
+        dp_world_size = hcg.get_data_parallel_world_size()
+        dp_id = hcg.get_data_parallel_rank()
+        paddle.seed(2022)
+        np.random.seed(2022)
+
+        # model a is trained on the global batch by a single rank
+        model_a = SimpleNet()
+        optimizer_a = paddle.optimizer.Adam(
+            learning_rate=0.01, parameters=model_a.parameters()
+        )
+        scaler_a = paddle.amp.GradScaler(init_loss_scaling=2**5)
+
+        model_b = SimpleNet()
+        model_b.set_state_dict(model_a.state_dict())
+        model_b = fleet.distributed_model(model_b)
+        optimizer_b = self.build_optimizer(model_b, dp_acc_steps)
+        scaler_b = fleet.distributed_scaler(
+            paddle.amp.GradScaler(init_loss_scaling=2**5)
+        )
+        self.assertIsNotNone(optimizer_b._dp_reducer)
+
+        local_batch_size = batch_size // dp_world_size
+        for _ in range(5):
+            # the gradients of acc_steps micro batches are accumulated
+            for _ in range(acc_steps):
+                data = np.random.random([batch_size, in_size]).astype('float32')
+                label = np.random.random([batch_size, out_size]).astype(
+                    'float32'
+                )
+
+                loss_a = paddle.nn.functional.mse_loss(
+                    model_a(paddle.to_tensor(data)), paddle.to_tensor(label)
+                )
+                scaler_a.scale(loss_a / acc_steps).backward()
+
+                start = dp_id * local_batch_size
+                end = start + local_batch_size
+                loss_b = paddle.nn.functional.mse_loss(
+                    model_b(paddle.to_tensor(data[start:end])),
+                    paddle.to_tensor(label[start:end]),
+                )
+                scaler_b.scale(loss_b / acc_steps).backward()
+
+            scaler_a.minimize(optimizer_a, loss_a)
+            optimizer_a.clear_grad()
+            # gradients are unscaled by the scaler after the all-reduce in
+            # flight is finished
+            scaler_b.minimize(optimizer_b, loss_b)
+            optimizer_b.clear_grad()
+
+            for param_a, param_b in zip(
+                model_a.parameters(), model_b.parameters()
+            ):
+                np.testing.assert_allclose(
+                    param_a.numpy(), param_b.numpy(), rtol=1e-5, atol=1e-6
+                )
+
+    def test_dp_comm_overlap(self):
+        self.train(acc_steps=1, dp_acc_steps=1)
+        # gradient accumulation out of pipeline parallel
+        self.train(acc_steps=2, dp_acc_steps=2)
+        # the backward passes after the all-reduce is launched are found
+        # before the gradients are used
+        with self.assertRaises(RuntimeError):
+            self.train(acc_steps=2, dp_acc_steps=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
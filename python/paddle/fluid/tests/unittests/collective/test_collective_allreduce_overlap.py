@@ -0,0 +1,105 @@
+#   Copyright (c) 2020 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+import unittest
+
+from test_collective_api_base import TestDistBase
+from test_parallel_dygraph_dataparallel import (
+    get_cluster_from_args,
+    start_local_trainers,
+    start_local_trainers_cpu,
+)
+
+import paddle
+from paddle.distributed.utils.launch_utils import watch_local_trainers
+
+paddle.enable_static()
+
+
+class TestCollectiveAllreduceOverlap(TestDistBase):
+    def _setup_config(self):
+        pass
+
+    def test_allreduce_overlap_gloo_dygraph(self):
+        self.check_with_place(
+            "collective_allreduce_overlap_dygraph.py",
+            "allreduce",
+            "gloo",
+            "2",
+            static_mode="0",
+            dtype="float32",
+        )
+
+    def test_allreduce_overlap_nccl_dygraph(self):
+        if paddle.fluid.core.is_compiled_with_cuda():
+            self.check_with_place(
+                "collective_allreduce_overlap_dygraph.py",
+                "allreduce",
+                "nccl",
+                static_mode="0",
+                dtype="float32",
+            )
+
+
+class TestHybridDpCommOverlap(unittest.TestCase):
+    def _run_4trainers(self, target_file_name, use_gpu):
+        # NOTE: data parallel of hybrid parallel is overlapped only if the
+        #       parallel mode is not pure data parallel, dp_degree=2 and
+        #       mp_degree=2 needs 4 trainers
+        cluster, pod = get_cluster_from_args(['0', '1', '2', '3'])
+        if use_gpu:
+            procs = start_local_trainers(
+                cluster,
+                pod,
+                training_script=target_file_name,
+                training_script_args=[],
+            )
+        else:
+            procs = start_local_trainers_cpu(
+                cluster.trainers_endpoints(),
+                training_script=target_file_name,
+                training_script_args=[],
+            )
+
+        while True:
+            alive = watch_local_trainers(procs, cluster.trainers_nranks())
+
+            if not alive:
+                print("Local procs complete, POD info:{}".format(pod))
+                break
+            time.sleep(3)
+
+    def test_dp_comm_overlap_gloo(self):
+        self._run_4trainers(
+            os.path.abspath('hybrid_parallel_dp_comm_overlap.py'),
+            use_gpu=False,
+        )
+
+    def test_dp_comm_overlap_nccl(self):
+        # GradScaler is only enabled on GPU, where gradients are unscaled
+        # in place after the async all-reduce
+        if (
+            paddle.fluid.core.is_compiled_with_cuda()
+            and paddle.fluid.core.get_cuda_device_count() >= 4
+        ):
+            self._run_4trainers(
+                os.path.abspath('hybrid_parallel_dp_comm_overlap.py'),
+                use_gpu=True,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Microbenchmark of the per-call dispatch overhead of to_static functions,
+# with and without the call guard fast path. Usage:
+#     python benchmark_call_guard.py --loop_num 1000
+
+import argparse
+import time
+from unittest import mock
+
+import paddle
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import (
+    StaticFunction,
+)
+
+
+def scale_add(x, y, scale=1.0):
+    return x * scale + y
+
+
+def timeit(func, loop_num, repeat):
+    costs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loop_num):
+            func()
+        costs.append((time.perf_counter() - start) / loop_num)
+    return min(costs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--loop_num', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    paddle.disable_static()
+    func = paddle.jit.to_static(scale_add)
+    x, y = paddle.ones([2, 3]), paddle.ones([2, 3])
+    # trace the program before timing
+    func(x, y, 2.0)
+
+    def call():
+        func(x, y, 2.0)
+
+    fast_cost = timeit(call, args.loop_num, args.repeat)
+    with mock.patch.object(StaticFunction, '_call_guard', return_value=None):
+        slow_cost = timeit(call, args.loop_num, args.repeat)
+    print('{:<16}{:>14}'.format('dispatch', 'per-call(us)'))
+    print('{:<16}{:>14.1f}'.format('with guard', fast_cost * 1e6))
+    print('{:<16}{:>14.1f}'.format('without guard', slow_cost * 1e6))
+    print('{:<16}{:>13.1f}x'.format('speedup', slow_cost / fast_cost))
+
+
+if __name__ == '__main__':
+    main()
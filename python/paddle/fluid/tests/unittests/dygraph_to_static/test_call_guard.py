@@ -0,0 +1,124 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import (
+    CacheKey,
+    ProgramCache,
+    StaticFunction,
+)
+
+
+def scale_add(x, y, scale=1.0):
+    return x * scale + y
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear = paddle.nn.Linear(4, 4)
+
+    @paddle.jit.to_static
+    def forward(self, x):
+        return self.linear(x)
+
+
+class TestCallGuard(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def count_slow_calls(self, func, inputs):
+        with mock.patch.object(
+            StaticFunction,
+            'get_concrete_program',
+            autospec=True,
+            side_effect=StaticFunction.get_concrete_program,
+        ) as mock_get:
+            for args in inputs:
+                func(*args)
+        return mock_get.call_count
+
+    def test_fast_path(self):
+        func = paddle.jit.to_static(scale_add)
+        x, y = paddle.ones([2, 3]), paddle.ones([2, 3])
+        num = self.count_slow_calls(func, [(x, y, 2.0)] * 5)
+        self.assertEqual(num, 1)
+        np.testing.assert_allclose(func(x, y, 2.0).numpy(), np.full([2, 3], 3))
+
+        # guard misses on different shapes, constants or name patterns
+        num = self.count_slow_calls(
+            func,
+            [
+                (paddle.ones([3, 3]), paddle.ones([3, 3]), 2.0),
+                (x, y, 3.0),
+                (x, x, 3.0),
+            ],
+        )
+        self.assertEqual(num, 3)
+        np.testing.assert_allclose(func(x, x, 3.0).numpy(), np.full([2, 3], 4))
+        self.assertEqual(func.get_traced_count(), 4)
+
+    def test_full_path(self):
+        func = paddle.jit.to_static(scale_add)
+        x, y = paddle.ones([2, 3]), paddle.ones([2, 3])
+        # default arguments and numpy arrays always go through full path
+        num = self.count_slow_calls(func, [(x, y)] * 3)
+        self.assertEqual(num, 3)
+        num = self.count_slow_calls(func, [(x, np.ones([2, 3]), 1.0)] * 3)
+        self.assertEqual(num, 3)
+
+    def test_train_eval(self):
+        net = Net()
+        x = paddle.ones([2, 4])
+        net(x)
+        net.eval()
+        net(x)
+        self.assertEqual(net.forward.get_traced_count(), 2)
+        _, (_, partial_layer) = net.forward.program_cache.last()
+        self.assertFalse(partial_layer.training)
+
+    def test_skip_cache_lookup(self):
+        func = paddle.jit.to_static(scale_add)
+        x, y = paddle.ones([2, 3]), paddle.ones([2, 3])
+        func(x, y, 2.0)
+        # calls hit by the guard skip building and hashing CacheKey and
+        # looking up ProgramCache
+        with mock.patch.object(
+            CacheKey,
+            '__hash__',
+            autospec=True,
+            side_effect=CacheKey.__hash__,
+        ) as mock_hash, mock.patch.object(
+            ProgramCache,
+            '__getitem__',
+            autospec=True,
+            side_effect=ProgramCache.__getitem__,
+        ) as mock_getitem:
+            for _ in range(5):
+                func(x, y, 2.0)
+            self.assertEqual(mock_hash.call_count, 0)
+            self.assertEqual(mock_getitem.call_count, 0)
+            # guard miss goes through the cache lookup
+            func(x, y, 3.0)
+            self.assertGreater(mock_hash.call_count, 0)
+            self.assertEqual(mock_getitem.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
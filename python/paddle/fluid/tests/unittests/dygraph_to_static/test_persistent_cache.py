@@ -0,0 +1,134 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.fluid.dygraph.dygraph_to_static import program_translator
+from paddle.fluid.dygraph.dygraph_to_static.program_translator import (
+    ConcreteProgram,
+    FunctionCache,
+)
+from paddle.fluid.dygraph.dygraph_to_static.persistent_cache import (
+    _PERSISTENT_CACHE,
+)
+from paddle.fluid.dygraph.dygraph_to_static.utils import func_to_source_code
+from paddle.static import InputSpec
+
+
+class Net(paddle.nn.Layer):
+    def __init__(self, hidden=8):
+        super().__init__()
+        self.linear = paddle.nn.Linear(4, hidden)
+
+    @paddle.jit.to_static(input_spec=[InputSpec([None, 4], 'float32')])
+    def forward(self, x):
+        out = self.linear(x)
+        if paddle.mean(out) > 0:
+            out = out * 2
+        return out, {'sum': paddle.sum(out)}
+
+
+def add_one(x):
+    if x.shape[0] > 1:
+        x = x + 1
+    return x
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        paddle.jit.set_cache_dir(self.temp_dir.name)
+
+    def tearDown(self):
+        paddle.jit.set_cache_dir(None)
+        self.temp_dir.cleanup()
+
+    def create_net(self, hidden=8):
+        # same parameter names as in a new process
+        with paddle.utils.unique_name.guard():
+            return Net(hidden)
+
+    def test_program_cache(self):
+        x = paddle.rand([3, 4])
+        net = self.create_net()
+        out, extra = net(x)
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.temp_dir.name, 'program'))), 1
+        )
+
+        with mock.patch.object(
+            ConcreteProgram,
+            'from_func_spec',
+            side_effect=AssertionError('should load from cache'),
+        ):
+            warm_net = self.create_net()
+            warm_net.set_state_dict(net.state_dict())
+            warm_out, warm_extra = warm_net(x)
+        np.testing.assert_allclose(warm_out.numpy(), out.numpy(), rtol=1e-05)
+        np.testing.assert_allclose(
+            warm_extra['sum'].numpy(), extra['sum'].numpy(), rtol=1e-05
+        )
+
+        # backward works with the cached program
+        loss = paddle.mean(warm_out)
+        loss.backward()
+        self.assertIsNotNone(warm_net.linear.weight.grad)
+
+        # layers with different parameter shapes are traced again
+        self.create_net(hidden=16)(x)
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.temp_dir.name, 'program'))), 2
+        )
+
+    def test_code_cache(self):
+        static_func = FunctionCache().convert_with_cache(add_one)
+        self.assertEqual(
+            len(os.listdir(os.path.join(self.temp_dir.name, 'code'))), 1
+        )
+        with mock.patch.object(
+            program_translator.DygraphToStaticAst,
+            'get_static_ast',
+            side_effect=AssertionError('should load from cache'),
+        ):
+            warm_func = FunctionCache().convert_with_cache(add_one)
+        x = paddle.ones([2, 3])
+        np.testing.assert_array_equal(
+            warm_func(x).numpy(), static_func(x).numpy()
+        )
+
+    def test_disabled(self):
+        paddle.jit.set_cache_dir('')
+        FunctionCache().convert_with_cache(add_one)
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    @unittest.skipIf(os.name != 'posix', 'file mode is only checked on posix')
+    def test_untrusted_dir(self):
+        FunctionCache().convert_with_cache(add_one)
+        source_code = func_to_source_code(add_one)
+        self.assertIsNotNone(_PERSISTENT_CACHE.load_code(source_code))
+        # cached code in a world-writable directory is not loaded
+        os.chmod(self.temp_dir.name, 0o777)
+        self.assertIsNone(_PERSISTENT_CACHE.load_code(source_code))
+        os.chmod(self.temp_dir.name, 0o700)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+
+
+def reduce_sum(x, y):
+    return paddle.sum(x, axis=1) + y
+
+
+class TestProgramCacheLRU(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_eviction(self):
+        func = paddle.jit.to_static(reduce_sum, max_program_cache_size=2)
+        y = paddle.ones([1])
+        for seq_len in [3, 4, 3, 5]:
+            x = paddle.ones([2, seq_len])
+            np.testing.assert_allclose(
+                func(x, y).numpy(), np.full([2], seq_len + 1.0)
+            )
+        self.assertEqual(func.get_traced_count(), 2)
+        self.assertEqual(func.program_cache.num_evicted, 1)
+
+        # 4 has been evicted as the least recently used one, 3 is still cached
+        func(paddle.ones([2, 3]), y)
+        self.assertEqual(func.program_cache.num_evicted, 1)
+        func(paddle.ones([2, 4]), y)
+        self.assertEqual(func.program_cache.num_evicted, 2)
+
+    def test_unbounded(self):
+        func = paddle.jit.to_static(reduce_sum)
+        y = paddle.ones([1])
+        for seq_len in range(1, 6):
+            func(paddle.ones([2, seq_len]), y)
+        self.assertEqual(func.get_traced_count(), 5)
+
+
+class TestDynamicShapeFallback(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def test_promote(self):
+        threshold = 3
+        func = paddle.jit.to_static(
+            reduce_sum, dynamic_shape_threshold=threshold
+        )
+        y = paddle.ones([1])
+        for seq_len in range(1, 10):
+            x = paddle.ones([2, seq_len])
+            np.testing.assert_allclose(
+                func(x, y).numpy(), np.full([2], seq_len + 1.0)
+            )
+        # one program for each of the first sizes and one dynamic program
+        self.assertEqual(func.get_traced_count(), threshold + 1)
+        _, (concrete_program, _) = func.program_cache.last()
+        x_var = concrete_program.inputs[0]
+        self.assertEqual(x_var.shape[0], 2)
+        self.assertEqual(x_var.shape[1], -1)
+
+        # batch axis is not promoted, new batch size is traced again
+        func(paddle.ones([3, 4]), y)
+        self.assertEqual(func.get_traced_count(), threshold + 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,9 @@
 # limitations under the License.
 
 import unittest
+
+import numpy as np
+
 import paddle
 
 
@@ -56,5 +59,57 @@ class TestAdagradOpV2Group(TestAdagradOpV2):
         adagrad.clear_grad()
 
 
+class TestAdagradMultiTensor(unittest.TestCase):
+    def _adagrad_optimize_dygraph(
+        self, place, use_param_group=False, use_multi_tensor=False
+    ):
+        paddle.disable_static()
+        paddle.seed(10)
+        paddle.set_device(place)
+
+        input = paddle.randn((5, 5))
+        model = paddle.nn.Sequential(
+            paddle.nn.Linear(5, 5),
+            paddle.nn.Linear(5, 5, paddle.ParamAttr(learning_rate=0.5)),
+            paddle.nn.Linear(5, 5),
+        )
+        parameters = list(model.parameters())
+        if use_param_group:
+            parameters = [
+                {'params': parameters[:4], 'weight_decay': 0.001},
+                {'params': parameters[4:], 'learning_rate': 0.1},
+            ]
+        optimizer = paddle.optimizer.Adagrad(
+            learning_rate=0.01,
+            parameters=parameters,
+            initial_accumulator_value=0.1,
+            use_multi_tensor=use_multi_tensor,
+        )
+
+        for idx in range(3):
+            output = model(input)
+            loss = paddle.mean(output)
+            loss.backward()
+            optimizer.step()
+            optimizer.clear_grad()
+
+        return [param.numpy() for param in model.parameters()]
+
+    def test_main(self):
+        places = ['cpu']
+        if paddle.is_compiled_with_cuda():
+            places.append('gpu')
+        for place in places:
+            for use_param_group in [True, False]:
+                params1 = self._adagrad_optimize_dygraph(
+                    place, use_param_group, use_multi_tensor=True
+                )
+                params2 = self._adagrad_optimize_dygraph(
+                    place, use_param_group, use_multi_tensor=False
+                )
+                for param1, param2 in zip(params1, params2):
+                    np.testing.assert_allclose(param1, param2, rtol=1e-05)
+
+
 if __name__ == "__main__":
     unittest.main()
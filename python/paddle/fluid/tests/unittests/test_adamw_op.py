@@ -746,5 +746,112 @@ class TestAdamWOpLayerwiseLR(TestAdamWOp):
         paddle.disable_static()
 
 
+class TestAdamWOpMultiTensor(unittest.TestCase):
+    def _adamw_optimize_dygraph(
+        self,
+        place,
+        use_param_group=False,
+        use_amp=False,
+        use_multi_tensor=False,
+    ):
+        paddle.disable_static()
+        paddle.seed(10)
+        paddle.set_device(place)
+
+        input = paddle.randn((5, 5))
+        model = paddle.nn.Sequential(
+            paddle.nn.Linear(5, 5),
+            paddle.nn.Linear(5, 5, paddle.ParamAttr(learning_rate=0.5)),
+            paddle.nn.Linear(5, 5),
+        )
+        if use_amp:
+            model = paddle.amp.decorate(models=model, level='O2')
+            scaler = paddle.amp.GradScaler(init_loss_scaling=1024)
+
+        parameters = list(model.parameters())
+        if use_param_group:
+            parameters = [
+                {
+                    'params': parameters[:4],
+                    'weight_decay': 0.001,
+                    'beta1': 0.1,
+                    'beta2': 0.99,
+                },
+                {'params': parameters[4:], 'learning_rate': 0.1},
+            ]
+
+        def lr_ratio(param):
+            return 0.5 if param.name.endswith('b_0') else 1.0
+
+        optimizer = paddle.optimizer.AdamW(
+            parameters=parameters,
+            apply_decay_param_fun=lambda name: name.endswith('w_0'),
+            # lr_ratio is only implemented on GPU
+            lr_ratio=lr_ratio if place == 'gpu' else None,
+            multi_precision=use_amp,
+            use_multi_tensor=use_multi_tensor,
+        )
+
+        for idx in range(3):
+            if use_amp:
+                with paddle.amp.auto_cast(level='O2'):
+                    output = model(input)
+                    loss = paddle.mean(output)
+                scaled = scaler.scale(loss)
+                scaled.backward()
+                scaler.step(optimizer)
+                scaler.update()
+            else:
+                output = model(input)
+                loss = paddle.mean(output)
+                loss.backward()
+                optimizer.step()
+            optimizer.clear_grad()
+
+        return [param.numpy() for param in model.parameters()], optimizer
+
+    def _get_places(self):
+        places = ['cpu']
+        if paddle.is_compiled_with_cuda():
+            places.append('gpu')
+        return places
+
+    def _check_with_place(self, place, use_param_group, use_amp):
+        params1, _ = self._adamw_optimize_dygraph(
+            place, use_param_group, use_amp, use_multi_tensor=True
+        )
+        params2, _ = self._adamw_optimize_dygraph(
+            place, use_param_group, use_amp, use_multi_tensor=False
+        )
+        for param1, param2 in zip(params1, params2):
+            np.testing.assert_allclose(param1, param2, rtol=1e-05)
+
+    def test_main(self):
+        for place in self._get_places():
+            for use_param_group in [True, False]:
+                self._check_with_place(place, use_param_group, False)
+        if paddle.is_compiled_with_cuda():
+            self._check_with_place('gpu', False, True)
+
+    def test_state_dict(self):
+        _, optimizer = self._adamw_optimize_dygraph(
+            'cpu', use_multi_tensor=True
+        )
+        state_dict = {
+            key: value.numpy()
+            for key, value in optimizer.state_dict().items()
+            if isinstance(value, paddle.Tensor)
+        }
+        for key, value in state_dict.items():
+            # every beta pow is updated once per step
+            if 'beta1_pow_acc' in key:
+                np.testing.assert_allclose(value, [0.9**4], rtol=1e-06)
+        optimizer.set_state_dict(state_dict)
+        self.assertEqual(len(optimizer._multi_tensor_groups), 0)
+        for key, value in optimizer.state_dict().items():
+            if key in state_dict:
+                np.testing.assert_array_equal(value.numpy(), state_dict[key])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,156 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.incubate.checkpoint import AsyncCheckpointSaver, load_checkpoint
+from paddle.incubate.checkpoint.async_checkpoint import INDEX_FILE_NAME
+
+NUM_SHARDS = 3
+
+
+class SimpleNet(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.linear1 = paddle.nn.Linear(16, 32)
+        self.linear2 = paddle.nn.Linear(32, 8)
+        self.register_buffer('step', paddle.to_tensor([0], dtype='int64'))
+
+    def forward(self, x):
+        return self.linear2(self.linear1(x))
+
+
+class TestAsyncCheckpoint(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'step_0')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_save_and_load(self):
+        net = SimpleNet()
+        state_dict = {
+            key: value.numpy() for key, value in net.state_dict().items()
+        }
+        with AsyncCheckpointSaver(num_shards=NUM_SHARDS) as saver:
+            future = saver.save(net.state_dict(), self.path)
+            # the snapshot is not changed by the following updates
+            for param in net.parameters():
+                param.set_value(np.zeros(param.shape, dtype='float32'))
+            self.assertEqual(future.result(), self.path)
+
+        files = sorted(os.listdir(self.path))
+        self.assertIn(INDEX_FILE_NAME, files)
+        self.assertEqual(len(files), NUM_SHARDS + 1)
+
+        expected = net.state_dict()
+        for mmap in [False, True]:
+            loaded = load_checkpoint(self.path, mmap=mmap)
+            self.assertEqual(list(loaded.keys()), list(expected.keys()))
+            for key, value in state_dict.items():
+                self.assertEqual(loaded[key].name, expected[key].name)
+                np.testing.assert_array_equal(loaded[key].numpy(), value)
+
+    def test_load_keys(self):
+        net = SimpleNet()
+        with AsyncCheckpointSaver(num_shards=NUM_SHARDS) as saver:
+            saver.save(net.state_dict(), self.path)
+        keys = ['linear2.bias', 'linear1.weight']
+        loaded = load_checkpoint(self.path, keys=keys, return_numpy=True)
+        # keys are returned in the saved order
+        self.assertEqual(
+            list(loaded.keys()), ['linear1.weight', 'linear2.bias']
+        )
+        for key in keys:
+            self.assertTrue(isinstance(loaded[key], np.ndarray))
+            np.testing.assert_array_equal(
+                loaded[key], net.state_dict()[key].numpy()
+            )
+
+        loaded = load_checkpoint(self.path, keys='linear1')
+        self.assertEqual(
+            list(loaded.keys()), ['linear1.weight', 'linear1.bias']
+        )
+
+        with self.assertRaises(KeyError):
+            load_checkpoint(self.path, keys=['not_exist'])
+
+    def test_optimizer_state_dict(self):
+        net = SimpleNet()
+        opt = paddle.optimizer.Adam(
+            learning_rate=paddle.optimizer.lr.StepDecay(0.1, step_size=2),
+            parameters=net.parameters(),
+        )
+        net(paddle.randn([4, 16])).mean().backward()
+        opt.step()
+        state_dict = opt.state_dict()
+        with AsyncCheckpointSaver(num_shards=NUM_SHARDS) as saver:
+            saver.save(state_dict, self.path)
+        loaded = load_checkpoint(self.path)
+        self.assertEqual(loaded['LR_Scheduler'], state_dict['LR_Scheduler'])
+        for key, value in state_dict.items():
+            if isinstance(value, paddle.Tensor):
+                np.testing.assert_array_equal(
+                    loaded[key].numpy(), value.numpy()
+                )
+
+    def test_overwrite(self):
+        saver = AsyncCheckpointSaver(num_shards=NUM_SHARDS)
+        for i in range(3):
+            saver.save({'step': np.array([i])}, self.path)
+        saver.close()
+        self.assertEqual(load_checkpoint(self.path)['step'][0], 2)
+
+    def test_release_done_saves(self):
+        saver = AsyncCheckpointSaver(num_shards=NUM_SHARDS)
+        for i in range(5):
+            path = os.path.join(self.temp_dir.name, 'step_{}'.format(i))
+            saver.save({'step': np.array([i])}, path)
+        error_path = os.path.join(self.temp_dir.name, 'error')
+        saver.save({'layer': paddle.nn.Linear(2, 2)}, error_path)
+        # callbacks of saves run in the writing threads
+        saver._pool.shutdown()
+        # only the failed save is kept to be raised by `wait`
+        self.assertEqual(list(saver._pending.keys()), [error_path])
+        with self.assertRaises(ValueError):
+            saver.wait()
+
+    def test_incomplete_checkpoint(self):
+        with self.assertRaises(ValueError):
+            load_checkpoint(self.path)
+
+    def test_error(self):
+        saver = AsyncCheckpointSaver(num_shards=NUM_SHARDS)
+        with self.assertRaises(TypeError):
+            saver.save([paddle.randn([2])], self.path)
+        future = saver.save({'layer': paddle.nn.Linear(2, 2)}, self.path)
+        with self.assertRaises(ValueError):
+            future.result()
+        self.assertFalse(
+            os.path.exists(os.path.join(self.path, INDEX_FILE_NAME))
+        )
+        with self.assertRaises(ValueError):
+            saver.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,6 +17,8 @@ import unittest
 import numpy as np
 from paddle.io import (
     BatchSampler,
+    BucketedBatchSampler,
+    DistributedBatchSampler,
     Dataset,
     Sampler,
     SequenceSampler,
@@ -288,5 +290,210 @@ class TestWeightedRandomSampler(unittest.TestCase):
             self.assertTrue(True)
 
 
+class TestSamplerStateDict(unittest.TestCase):
+    def check_resume(self, create_sampler, num_consumed):
+        sampler = create_sampler()
+        it = iter(sampler)
+        for _ in range(num_consumed):
+            next(it)
+        state = sampler.state_dict()
+        remained = list(it)
+
+        resumed = create_sampler()
+        resumed.set_state_dict(state)
+        self.assertEqual(list(resumed), remained)
+
+    def test_random_sampler(self):
+        dataset = RandomDataset(100, 10)
+        self.check_resume(lambda: RandomSampler(dataset), 17)
+        self.check_resume(
+            lambda: RandomSampler(dataset, replacement=True, num_samples=50),
+            9,
+        )
+
+    def test_random_sampler_global_seed(self):
+        # indices are drawn from the global numpy random state as before
+        dataset = RandomDataset(100, 10)
+        np.random.seed(2022)
+        indices = list(RandomSampler(dataset))
+        np.random.seed(2022)
+        expected = np.random.choice(np.arange(100), 100, replace=False)
+        self.assertEqual(indices, expected.tolist())
+
+    def test_sequence_sampler(self):
+        dataset = RandomDataset(100, 10)
+        self.check_resume(lambda: SequenceSampler(dataset), 31)
+
+    def test_weighted_random_sampler(self):
+        probs = np.random.random(20).astype('float32')
+        self.check_resume(lambda: WeightedRandomSampler(probs, 30, True), 7)
+
+    def test_batch_sampler(self):
+        dataset = RandomDataset(100, 10)
+        for shuffle in [True, False]:
+            for drop_last in [True, False]:
+                self.check_resume(
+                    lambda: BatchSampler(
+                        dataset=dataset,
+                        batch_size=8,
+                        shuffle=shuffle,
+                        drop_last=drop_last,
+                    ),
+                    5,
+                )
+
+    def test_batch_sampler_without_sampler_state(self):
+        class MySampler(Sampler):
+            def __iter__(self):
+                return iter(range(50))
+
+            def __len__(self):
+                return 50
+
+        self.check_resume(
+            lambda: BatchSampler(sampler=MySampler(), batch_size=8), 2
+        )
+
+    def test_distributed_batch_sampler(self):
+        dataset = RandomDataset(100, 10)
+
+        def create_sampler():
+            sampler = DistributedBatchSampler(
+                dataset, batch_size=8, num_replicas=2, rank=1, shuffle=True
+            )
+            sampler.set_epoch(3)
+            return sampler
+
+        self.check_resume(create_sampler, 3)
+
+    def test_state_content(self):
+        dataset = RandomDataset(100, 10)
+        sampler = BatchSampler(dataset=dataset, batch_size=8, shuffle=True)
+        it = iter(sampler)
+        next(it)
+        next(it)
+        state = sampler.state_dict()
+        self.assertEqual(state['num_consumed_batches'], 2)
+        self.assertEqual(state['sampler']['epoch'], 1)
+        self.assertEqual(state['sampler']['num_consumed'], 16)
+        self.assertIsNotNone(state['sampler']['random_state'])
+
+
+class TestBucketedBatchSampler(unittest.TestCase):
+    def setUp(self):
+        self.lengths = np.random.RandomState(0).randint(1, 50, [200])
+        self.dataset = list(range(200))
+
+    def create_sampler(self, **kwargs):
+        kwargs.setdefault('lengths', self.lengths)
+        kwargs.setdefault('max_tokens', 100)
+        kwargs.setdefault('num_replicas', 1)
+        kwargs.setdefault('rank', 0)
+        return BucketedBatchSampler(self.dataset, **kwargs)
+
+    def check_budget(self, batches, max_tokens, batch_size=None):
+        for batch in batches:
+            if len(batch) > 1:
+                self.assertLessEqual(
+                    self.lengths[batch].max() * len(batch), max_tokens
+                )
+            if batch_size is not None:
+                self.assertLessEqual(len(batch), batch_size)
+
+    def test_sorted(self):
+        sampler = self.create_sampler()
+        batches = list(sampler)
+        self.assertEqual(len(batches), len(sampler))
+        self.assertEqual(sorted(sum(batches, [])), self.dataset)
+        self.check_budget(batches, 100)
+        # samples sorted by length, lengths of batches are not decreasing
+        max_lengths = [self.lengths[batch].max() for batch in batches]
+        self.assertEqual(max_lengths, sorted(max_lengths))
+
+    def test_buckets(self):
+        sampler = self.create_sampler(
+            batch_size=3, bucket_boundaries=[10, 20, 30], shuffle=True, seed=3
+        )
+        batches = list(sampler)
+        self.assertEqual(sorted(sum(batches, [])), self.dataset)
+        self.check_budget(batches, 100, 3)
+        for batch in batches:
+            bucket_ids = np.searchsorted(
+                [10, 20, 30], self.lengths[batch], side='right'
+            )
+            self.assertEqual(len(set(bucket_ids.tolist())), 1)
+
+        # deterministic with the same seed and epoch
+        self.assertNotEqual(list(sampler), batches)
+        same_sampler = self.create_sampler(
+            batch_size=3, bucket_boundaries=[10, 20, 30], shuffle=True, seed=3
+        )
+        self.assertEqual(list(same_sampler), batches)
+
+    def test_len_while_iterating(self):
+        # batch number changes with the shuffle of each epoch
+        sampler = self.create_sampler(shuffle=True, bucket_boundaries=[25])
+        for _ in range(4):
+            expected_len = len(sampler)
+            batches = []
+            for batch in sampler:
+                # the batch number of the current epoch, though epoch is
+                # increased when iteration starts
+                self.assertEqual(len(sampler), expected_len)
+                batches.append(batch)
+            self.assertEqual(len(batches), expected_len)
+
+    def test_length_fn(self):
+        sampler = self.create_sampler(
+            lengths=None, length_fn=lambda idx: self.lengths[idx]
+        )
+        self.assertEqual(list(sampler), list(self.create_sampler()))
+
+    def test_long_sample(self):
+        sampler = BucketedBatchSampler(
+            [0, 1], lengths=[500, 3], max_tokens=100, num_replicas=1, rank=0
+        )
+        self.assertEqual(list(sampler), [[1], [0]])
+
+    def test_distributed(self):
+        for drop_last in [True, False]:
+            shards = [
+                list(
+                    self.create_sampler(
+                        shuffle=True,
+                        num_replicas=3,
+                        rank=rank,
+                        drop_last=drop_last,
+                    )
+                )
+                for rank in range(3)
+            ]
+            self.assertEqual(len(set(len(shard) for shard in shards)), 1)
+            indices = sum(sum(shards, []), [])
+            if drop_last:
+                self.assertEqual(len(indices), len(set(indices)))
+            else:
+                self.assertEqual(set(indices), set(self.dataset))
+
+    def test_state_dict(self):
+        sampler = self.create_sampler(shuffle=True)
+        it = iter(sampler)
+        for _ in range(4):
+            next(it)
+        state = sampler.state_dict()
+        self.assertEqual(state['num_consumed_batches'], 4)
+        resumed = self.create_sampler(shuffle=True)
+        resumed.set_state_dict(state)
+        self.assertEqual(list(resumed), list(it))
+
+    def test_wrong_args(self):
+        with self.assertRaises(AssertionError):
+            BucketedBatchSampler(self.dataset, lengths=self.lengths)
+        with self.assertRaises(AssertionError):
+            BucketedBatchSampler(self.dataset, max_tokens=100)
+        with self.assertRaises(AssertionError):
+            self.create_sampler(bucket_boundaries=[20, 10])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,7 @@ import json
 import paddle
 import paddle.nn as nn
 from paddle.io import DataLoader, Dataset
+from paddle.fluid.dataloader.dataloader_iter import _OnlinePrefetchTuner
 import sys
 import os
 
@@ -96,6 +97,70 @@ class TestAutoTune(unittest.TestCase):
         )
 
 
+class TestAutoTuneOptions(unittest.TestCase):
+    def setUp(self):
+        self.dataset = RandomDataset(10)
+
+    def tearDown(self):
+        paddle.incubate.autotune.set_config(
+            config={"dataloader": {"enable": False}}
+        )
+
+    def test_autotune_report(self):
+        paddle.incubate.autotune.set_config(
+            config={
+                "dataloader": {
+                    "enable": True,
+                    "tuning_steps": 1,
+                    "online_tuning": True,
+                }
+            }
+        )
+        loader = DataLoader(self.dataset, batch_size=1, num_workers=2)
+        report = loader.autotune_report
+        self.assertIsNotNone(report)
+        self.assertEqual(report['num_workers'], loader.num_workers)
+        if loader.num_workers > 0:
+            self.assertEqual(report['prefetch_factor'], loader.prefetch_factor)
+            self.assertEqual(
+                report['use_shared_memory'], loader.use_shared_memory
+            )
+            self.assertTrue(loader._online_tuning)
+        for _ in loader:
+            pass
+
+    def test_autotune_disabled(self):
+        paddle.incubate.autotune.set_config(
+            config={"dataloader": {"enable": False}}
+        )
+        loader = DataLoader(self.dataset, batch_size=1, num_workers=0)
+        self.assertIsNone(loader.autotune_report)
+        self.assertFalse(loader._online_tuning)
+
+
+class TestOnlinePrefetchTuner(unittest.TestCase):
+    def test_increase_when_starved(self):
+        report = {}
+        tuner = _OnlinePrefetchTuner(2, 4, report, window=10)
+        for _ in range(10):
+            factor = tuner.step(0.01, 0, 1)
+        self.assertEqual(factor, 3)
+        self.assertEqual(report['online'][0]['prefetch_factor'], 3)
+        for _ in range(20):
+            factor = tuner.step(0.01, 0, 1)
+        # bounded by max_prefetch_factor
+        self.assertEqual(factor, 4)
+
+    def test_decrease_when_over_prefetched(self):
+        tuner = _OnlinePrefetchTuner(4, 8, window=10)
+        for _ in range(10):
+            factor = tuner.step(0.0, 6, 1)
+        self.assertEqual(factor, 3)
+        for _ in range(10):
+            factor = tuner.step(0.0, 1, 1)
+        self.assertEqual(factor, 3)
+
+
 class TestAutoTuneAPI(unittest.TestCase):
     def test_set_config_warnings(self):
         with warnings.catch_warnings(record=True) as w:
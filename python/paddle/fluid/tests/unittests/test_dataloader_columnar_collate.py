@@ -0,0 +1,106 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.fluid.dataloader.collate import default_columnar_collate_fn
+from paddle.fluid.dataloader.fetcher import _MapDatasetFetcher
+
+SAMPLE_NUM = 100
+BATCH_SIZE = 8
+
+
+class ColumnarDataset(Dataset):
+    def __init__(self, num_samples):
+        self.ids = np.arange(num_samples).astype('int64')
+        self.values = np.arange(num_samples).astype('float32') * 0.5
+        self.getitem_calls = 0
+        self.getitems_calls = 0
+
+    def __getitem__(self, idx):
+        self.getitem_calls += 1
+        return {'id': self.ids[idx], 'value': self.values[idx]}
+
+    def __getitems__(self, indices):
+        self.getitems_calls += 1
+        return {'id': self.ids[indices], 'value': self.values[indices]}
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class TestColumnarCollateFn(unittest.TestCase):
+    def test_main(self):
+        ids = np.arange(4).astype('int64')
+        batch = {'id': ids, 'label': [1, 2, 3, 4], 'name': ['a', 'b']}
+        out = default_columnar_collate_fn(batch)
+        self.assertIs(out['id'], ids)
+        self.assertTrue(isinstance(out['label'], np.ndarray))
+        np.testing.assert_array_equal(out['label'], np.array([1, 2, 3, 4]))
+        self.assertEqual(out['name'], ['a', 'b'])
+
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            default_columnar_collate_fn(object())
+
+
+class TestMapDatasetFetcherGetitems(unittest.TestCase):
+    def test_fetch(self):
+        dataset = ColumnarDataset(SAMPLE_NUM)
+        fetcher = _MapDatasetFetcher(
+            dataset, True, default_columnar_collate_fn, False
+        )
+        data = fetcher.fetch([3, 1, 2])
+        np.testing.assert_array_equal(data['id'], np.array([3, 1, 2]))
+        self.assertEqual(dataset.getitems_calls, 1)
+        self.assertEqual(dataset.getitem_calls, 0)
+
+
+class TestColumnarDataLoader(unittest.TestCase):
+    def run_main(self, num_workers):
+        paddle.disable_static()
+        dataset = ColumnarDataset(SAMPLE_NUM)
+        loader = DataLoader(
+            dataset,
+            batch_size=BATCH_SIZE,
+            num_workers=num_workers,
+            drop_last=True,
+        )
+        for i, data in enumerate(loader):
+            ids = data['id'].numpy()
+            values = data['value'].numpy()
+            self.assertEqual(ids.shape, (BATCH_SIZE,))
+            expected = np.arange(i * BATCH_SIZE, (i + 1) * BATCH_SIZE)
+            np.testing.assert_array_equal(ids, expected)
+            np.testing.assert_allclose(values, expected * 0.5)
+        self.assertEqual(i + 1, SAMPLE_NUM // BATCH_SIZE)
+        if num_workers == 0:
+            self.assertEqual(dataset.getitem_calls, 0)
+
+    def test_single_process(self):
+        self.run_main(0)
+
+    def test_multi_process(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform != 'darwin' and sys.platform != 'win32':
+            self.run_main(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
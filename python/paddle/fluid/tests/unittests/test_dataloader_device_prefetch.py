@@ -0,0 +1,162 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import time
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.fluid.dataloader.device_prefetcher import _DevicePrefetcher
+
+IMAGE_SIZE = 16
+SAMPLE_NUM = 40
+BATCH_SIZE = 4
+DEPTH = 2
+
+
+class RandomDataset(Dataset):
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([IMAGE_SIZE]).astype('float32')
+        label = np.array([idx]).astype('int64')
+        return {'image': image, 'label': label}
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+def error_reader():
+    for i in range(5):
+        yield [paddle.to_tensor(np.array([i]))]
+    raise ValueError("error batch")
+
+
+class TestDevicePrefetch(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def create_loader(self, num_workers, depth, **kwargs):
+        return DataLoader(
+            RandomDataset(),
+            places=paddle.CPUPlace(),
+            batch_size=BATCH_SIZE,
+            num_workers=num_workers,
+            device_prefetch_depth=depth,
+            **kwargs
+        )
+
+    def read_all(self, loader, step_time=0):
+        images, labels = [], []
+        for data in loader:
+            self.assertTrue(data['image'].place.is_cpu_place())
+            images.append(data['image'].numpy())
+            labels.append(data['label'].numpy())
+            # simulate computing of a training step
+            time.sleep(step_time)
+        return np.concatenate(images), np.concatenate(labels)
+
+    def run_main(self, num_workers):
+        expected_images, expected_labels = self.read_all(
+            self.create_loader(num_workers, 0)
+        )
+        loader = self.create_loader(num_workers, DEPTH)
+        self.assertIsNone(loader.device_prefetch_stats())
+        images, labels = self.read_all(loader, step_time=0.01)
+        np.testing.assert_array_equal(images, expected_images)
+        np.testing.assert_array_equal(labels, expected_labels)
+
+        stats = loader.device_prefetch_stats()
+        self.assertEqual(stats['num_batches'], SAMPLE_NUM // BATCH_SIZE)
+        self.assertLessEqual(stats['queue_depth'], DEPTH)
+        self.assertLessEqual(stats['avg_queue_depth'], DEPTH)
+        # copy is hidden behind step time, batches are mostly ready
+        self.assertGreater(stats['avg_queue_depth'], 0)
+        self.assertGreaterEqual(stats['copy_time'], 0)
+        self.assertGreaterEqual(stats['stall_time'], 0)
+
+    def test_single_process(self):
+        self.run_main(0)
+
+    def test_multi_process(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        self.run_main(2)
+
+    def test_break_and_restart(self):
+        loader = self.create_loader(0, DEPTH)
+        for i, _ in enumerate(loader):
+            if i == 2:
+                break
+        _, labels = self.read_all(loader)
+        self.assertEqual(
+            sorted(labels.flatten().tolist()), list(range(SAMPLE_NUM))
+        )
+
+    def test_state_dict(self):
+        loader = self.create_loader(0, DEPTH)
+        for i, _ in enumerate(loader):
+            if i == 2:
+                # wait for prefetch stage filled
+                time.sleep(0.1)
+                break
+        self.assertEqual(loader.state_dict()['num_consumed_batches'], 3)
+
+    def test_state_dict_without_iteration_state(self):
+        prefetcher = _DevicePrefetcher(
+            iter([[paddle.to_tensor(np.array([0]))]]), paddle.CPUPlace(), 2
+        )
+        with self.assertRaises(NotImplementedError):
+            prefetcher.state_dict()
+        prefetcher.shutdown()
+
+    def test_error(self):
+        prefetcher = _DevicePrefetcher(error_reader(), paddle.CPUPlace(), 2)
+        for i in range(5):
+            data = next(prefetcher)
+            self.assertEqual(int(data[0].numpy()[0]), i)
+        # error raised in prefetch thread is raised in main thread
+        with self.assertRaises(ValueError):
+            next(prefetcher)
+
+        # error ends the stage, following next does not block
+        with self.assertRaises(StopIteration):
+            next(prefetcher)
+
+    def test_next_after_end(self):
+        prefetcher = _DevicePrefetcher(
+            iter([[paddle.to_tensor(np.array([0]))]]), paddle.CPUPlace(), 2
+        )
+        self.assertEqual(len(list(prefetcher)), 1)
+        # thread exited after the end flag, next should not block
+        for _ in range(2):
+            with self.assertRaises(StopIteration):
+                next(prefetcher)
+
+    def test_release_after_break(self):
+        loader = self.create_loader(0, DEPTH)
+        for i, _ in enumerate(loader):
+            if i == 2:
+                break
+        # DataLoader does not keep the stage of the broken loop alive
+        self.assertIsNone(loader._device_prefetcher())
+        self.assertEqual(loader.device_prefetch_stats()['num_batches'], 3)
+        self.assertEqual(loader.state_dict()['num_consumed_batches'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
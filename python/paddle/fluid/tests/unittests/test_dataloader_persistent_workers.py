@@ -0,0 +1,104 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+from paddle.fluid.dataloader import dataloader_iter
+from paddle.io import DataLoader, Dataset, get_worker_info
+
+SAMPLE_NUM = 40
+BATCH_SIZE = 4
+EPOCH_NUM = 3
+
+
+class PidDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+        self.init_pid = -1
+
+    def __getitem__(self, idx):
+        return np.array([idx, os.getpid(), self.init_pid]).astype('int64')
+
+    def __len__(self):
+        return self.sample_num
+
+
+def worker_init_fn(worker_id):
+    get_worker_info().dataset.init_pid = os.getpid()
+
+
+class TestPersistentWorkers(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def create_loader(self, persistent_workers):
+        return DataLoader(
+            PidDataset(SAMPLE_NUM),
+            batch_size=BATCH_SIZE,
+            num_workers=2,
+            worker_init_fn=worker_init_fn,
+            persistent_workers=persistent_workers,
+        )
+
+    def run_epoch(self, loader, stop_batch=None):
+        datas = []
+        for i, data in enumerate(loader):
+            if stop_batch is not None and i >= stop_batch:
+                break
+            datas.append(data.numpy())
+        return np.concatenate(datas)
+
+    def test_workers_reused(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        loader = self.create_loader(True)
+        pids = None
+        for _ in range(EPOCH_NUM):
+            data = self.run_epoch(loader)
+            self.assertEqual(
+                sorted(data[:, 0].tolist()), list(range(SAMPLE_NUM))
+            )
+            # dataset state set by worker_init_fn is kept across epochs
+            np.testing.assert_array_equal(data[:, 1], data[:, 2])
+            epoch_pids = set(data[:, 1].tolist())
+            if pids is not None:
+                self.assertEqual(pids, epoch_pids)
+            pids = epoch_pids
+
+    def test_epoch_restart_time(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        loader = self.create_loader(True)
+        self.run_epoch(loader)
+        # resuming workers should wait for the event set by the reader
+        # thread instead of polling with a fixed interval
+        with mock.patch.object(
+            dataloader_iter.time, 'sleep', wraps=dataloader_iter.time.sleep
+        ) as sleep:
+            iterator = iter(loader)
+        self.assertIs(iterator, loader._iterator)
+        self.assertTrue(iterator._resume_done_event.is_set())
+        self.assertEqual(iterator._resume_worker_cnt, 0)
+        sleep.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import time
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.fluid.dataloader.metrics import _PipelineMetrics
+
+SAMPLE_NUM = 20
+BATCH_SIZE = 4
+SLEEP_TIME = 0.002
+
+
+class SlowDataset(Dataset):
+    def __getitem__(self, idx):
+        time.sleep(SLEEP_TIME)
+        return np.array([idx]).astype('float32')
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+class TestPipelineMetrics(unittest.TestCase):
+    def test_summary(self):
+        metrics = _PipelineMetrics()
+        for i in range(10):
+            metrics.record('collate', 0.001 * (i + 1))
+        for depth in [0, 1, 1, 2]:
+            metrics.record_occupancy('blocking_queue', depth)
+        summary = metrics.summary()
+        self.assertNotIn('getitem', summary)
+        collate = summary['collate']
+        self.assertEqual(collate['count'], 10)
+        self.assertAlmostEqual(collate['total'], 0.055)
+        self.assertAlmostEqual(collate['mean'], 0.0055)
+        self.assertAlmostEqual(collate['max'], 0.01)
+        self.assertLessEqual(collate['p50'], collate['p90'])
+        self.assertLessEqual(collate['p99'], collate['max'])
+        self.assertEqual(sum(c for _, c in collate['histogram']), 10)
+
+        queue = summary['blocking_queue']
+        self.assertEqual(queue['count'], 4)
+        self.assertAlmostEqual(queue['mean'], 1.0)
+        self.assertEqual(queue['histogram'], [(0, 1), (1, 2), (2, 1)])
+
+
+class TestDataLoaderPipelineMetrics(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def run_main(self, num_workers):
+        loader = DataLoader(
+            SlowDataset(),
+            batch_size=BATCH_SIZE,
+            num_workers=num_workers,
+            collect_metrics=True,
+        )
+        self.assertIsNone(loader.pipeline_metrics())
+        for _ in loader:
+            pass
+        metrics = loader.pipeline_metrics()
+
+        num_batches = SAMPLE_NUM // BATCH_SIZE
+        stages = ['getitem', 'collate', 'flatten', 'to_tensor', 'queue_push']
+        if num_workers > 0:
+            stages += ['ipc_put', 'ipc_get']
+        for stage in stages:
+            self.assertGreaterEqual(metrics[stage]['count'], num_batches)
+        self.assertEqual(metrics['next_wait']['count'], num_batches)
+        self.assertGreaterEqual(
+            metrics['getitem']['mean'], SLEEP_TIME * BATCH_SIZE
+        )
+        self.assertEqual(metrics['blocking_queue']['count'], num_batches)
+        if num_workers > 0:
+            self.assertEqual(
+                metrics['outstanding_batches']['count'], num_batches
+            )
+
+    def test_single_process(self):
+        self.run_main(0)
+
+    def test_multi_process(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        self.run_main(2)
+
+    def test_disabled(self):
+        loader = DataLoader(SlowDataset(), batch_size=BATCH_SIZE)
+        for _ in loader:
+            pass
+        self.assertIsNone(loader.pipeline_metrics())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import unittest
+import multiprocessing
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+from paddle.fluid.dataloader.shm_pool import (
+    _SharedMemorySlotPool,
+    _SharedMemorySlotReader,
+)
+
+IMAGE_SIZE = 16
+SAMPLE_NUM = 64
+BATCH_SIZE = 4
+
+
+class RandomDataset(Dataset):
+    def __init__(self, sample_num):
+        self.sample_num = sample_num
+
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([3, IMAGE_SIZE, IMAGE_SIZE]).astype('float32')
+        label = np.array([idx]).astype('int64')
+        return image, label
+
+    def __len__(self):
+        return self.sample_num
+
+
+class TestSharedMemorySlotPool(unittest.TestCase):
+    def test_put_and_read(self):
+        pool = _SharedMemorySlotPool(0, 2, multiprocessing.SimpleQueue())
+        reader = _SharedMemorySlotReader([pool])
+        batch = [
+            np.random.random([4, 3]).astype('float32'),
+            np.arange(5).astype('int64'),
+        ]
+        shm_batch = pool.put_batch(batch)
+        self.assertIsNotNone(shm_batch)
+        outs = reader.read(shm_batch)
+        self.assertEqual(len(outs), 2)
+        for out, b in zip(outs, batch):
+            np.testing.assert_array_equal(out, b)
+        # views should be released before slot re-allocated
+        del outs, out
+
+        # larger batch re-allocates the slot
+        path = shm_batch.path
+        reader.release(shm_batch)
+        large_batch = [np.ones([1024, 64]).astype('float32')]
+        while True:
+            shm_batch = pool.put_batch(large_batch)
+            if shm_batch.slot_id == 0:
+                break
+            reader.release(shm_batch)
+        self.assertNotEqual(shm_batch.path, path)
+        self.assertFalse(os.path.exists(path))
+        np.testing.assert_array_equal(reader.read(shm_batch)[0], large_batch[0])
+        reader.release(shm_batch)
+
+        pool.close()
+        reader.close()
+
+    def test_fallback(self):
+        pool = _SharedMemorySlotPool(0, 1, multiprocessing.SimpleQueue())
+        self.assertIsNone(pool.put_batch([]))
+        self.assertIsNone(pool.put_batch([np.array(['a', None])]))
+        shm_batch = pool.put_batch([np.ones([2])])
+        self.assertIsNotNone(shm_batch)
+        # no free slot before released
+        self.assertIsNone(pool.put_batch([np.ones([2])]))
+        pool.close()
+
+
+class TestDataLoaderWithSharedMemoryPool(unittest.TestCase):
+    def read_all(self, use_shared_memory_pool):
+        loader = DataLoader(
+            RandomDataset(SAMPLE_NUM),
+            batch_size=BATCH_SIZE,
+            num_workers=2,
+            use_shared_memory_pool=use_shared_memory_pool,
+        )
+        images, labels = [], []
+        for image, label in loader:
+            images.append(image.numpy())
+            labels.append(label.numpy())
+        return np.concatenate(images), np.concatenate(labels)
+
+    def test_main(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        paddle.disable_static()
+        expected_images, expected_labels = self.read_all(False)
+        images, labels = self.read_all(True)
+        np.testing.assert_array_equal(images, expected_images)
+        np.testing.assert_array_equal(labels, expected_labels)
+        self.assertEqual(labels.shape[0], SAMPLE_NUM)
+
+    def test_growing_batch_size(self):
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        paddle.disable_static()
+        # batches get larger, slots are re-allocated by the worker and
+        # remapped by main process when reused
+        batch_sizes = [1, 2, 4, 8, 16, 32]
+        batch_sampler, start = [], 0
+        for batch_size in batch_sizes:
+            batch_sampler.append(list(range(start, start + batch_size)))
+            start += batch_size
+        loader = DataLoader(
+            RandomDataset(SAMPLE_NUM),
+            batch_sampler=batch_sampler,
+            num_workers=1,
+            use_shared_memory_pool=True,
+        )
+        dataset = RandomDataset(SAMPLE_NUM)
+        for (image, label), indices in zip(loader, batch_sampler):
+            self.assertEqual(label.shape[0], len(indices))
+            np.testing.assert_array_equal(
+                label.numpy().reshape([-1]), np.array(indices)
+            )
+            np.testing.assert_array_equal(
+                image.numpy()[-1], dataset[indices[-1]][0]
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, Dataset
+
+SAMPLE_NUM = 50
+BATCH_SIZE = 4
+STOP_BATCH = 5
+
+
+class IndexDataset(Dataset):
+    def __getitem__(self, idx):
+        return np.array([idx]).astype('int64')
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+class TestDataLoaderStateDict(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+
+    def create_loader(self, num_workers):
+        return DataLoader(
+            IndexDataset(),
+            batch_size=BATCH_SIZE,
+            shuffle=True,
+            num_workers=num_workers,
+        )
+
+    def run_resume(self, num_workers):
+        loader = self.create_loader(num_workers)
+        consumed = []
+        for i, data in enumerate(loader):
+            consumed.append(data.numpy())
+            if i + 1 == STOP_BATCH:
+                state = loader.state_dict()
+                break
+        self.assertEqual(state['num_consumed_batches'], STOP_BATCH)
+
+        # the remaining batches of the original epoch
+        loader.set_state_dict(state)
+        expected = [data.numpy() for data in loader]
+
+        resumed_loader = self.create_loader(num_workers)
+        resumed_loader.set_state_dict(state)
+        resumed = [data.numpy() for data in resumed_loader]
+        self.assertEqual(len(resumed), len(expected))
+        for r, e in zip(resumed, expected):
+            np.testing.assert_array_equal(r, e)
+
+        # consumed and resumed batches cover the whole epoch once
+        indices = np.concatenate(consumed + resumed).flatten()
+        self.assertEqual(sorted(indices.tolist()), list(range(SAMPLE_NUM)))
+
+    def test_single_process(self):
+        self.run_resume(0)
+
+    def test_multi_process(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        self.run_resume(2)
+
+    def test_state_dict_after_break(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        loader = self.create_loader(2)
+        for i, data in enumerate(loader):
+            if i + 1 == STOP_BATCH:
+                break
+        # batches prefetched by workers are not counted after the iterator
+        # is released
+        state = loader.state_dict()
+        self.assertEqual(state['num_consumed_batches'], STOP_BATCH)
+
+    def test_resume_at_step_0(self):
+        loader = self.create_loader(0)
+        # saved before the first batch, no random state recorded yet
+        state = loader.state_dict()
+
+        resumed_loader = self.create_loader(0)
+        resumed_loader.set_state_dict(state)
+        resumed = [data.numpy() for data in resumed_loader]
+        indices = np.concatenate(resumed).flatten()
+        self.assertEqual(sorted(indices.tolist()), list(range(SAMPLE_NUM)))
+
+    def test_without_batch_sampler(self):
+        loader = DataLoader(IndexDataset(), batch_size=None)
+        with self.assertRaises(NotImplementedError):
+            loader.state_dict()
+
+
+if __name__ == '__main__':
+    unittest.main()
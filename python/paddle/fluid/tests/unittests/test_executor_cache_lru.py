@@ -0,0 +1,125 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.fluid.executor import _LRUCache, _get_strong_program_cache_key
+
+paddle.enable_static()
+
+
+def build_program(size=4):
+    main_program = paddle.static.Program()
+    startup_program = paddle.static.Program()
+    # NOTE: var names are part of the key, rebuilt programs share the key
+    #       only if they are built with the same names
+    with paddle.static.program_guard(
+        main_program, startup_program
+    ), paddle.utils.unique_name.guard():
+        x = paddle.static.data(name='x', shape=[-1, size], dtype='float32')
+        out = paddle.scale(x, scale=2.0)
+    return main_program, out
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction(self):
+        released = []
+        cache = _LRUCache(2)
+        cache.put('program', 'a', 1)
+        cache.put('scope', 'a', 'scope_a', on_evict=released.append)
+        cache.put('program', 'b', 2)
+        # visit a, so that b is the least recently used
+        self.assertEqual(cache.get('program', 'a'), 1)
+        cache.put('program', 'c', 3)
+        self.assertIsNone(cache.get('program', 'b'))
+        self.assertEqual(len(cache), 2)
+
+        cache.put('program', 'd', 4)
+        # items of a key are evicted together
+        self.assertIsNone(cache.get('program', 'a'))
+        self.assertIsNone(cache.get('scope', 'a'))
+        self.assertEqual(released, ['scope_a'])
+
+        info = cache.info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 3)
+        self.assertEqual(info['evictions'], 2)
+        self.assertEqual(info['size'], 2)
+        self.assertEqual(info['capacity'], 2)
+
+    def test_unbounded(self):
+        cache = _LRUCache(0)
+        for i in range(100):
+            cache.put('program', i, i)
+        self.assertEqual(len(cache), 100)
+        self.assertEqual(sorted(cache.values('program')), list(range(100)))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class TestExecutorCacheKey(unittest.TestCase):
+    def test_content_key(self):
+        program1, out1 = build_program()
+        program2, out2 = build_program()
+        program3, out3 = build_program(size=8)
+        feed = {'x': np.ones([2, 4], dtype='float32')}
+        key1 = _get_strong_program_cache_key(program1, feed, [out1])
+        key2 = _get_strong_program_cache_key(program2, feed, [out2])
+        key3 = _get_strong_program_cache_key(program3, feed, [out3])
+        # programs with the same content share the key
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+        # programs with the same ops but different var names do not
+        program4 = paddle.static.Program()
+        with paddle.static.program_guard(
+            program4, paddle.static.Program()
+        ), paddle.utils.unique_name.guard('renamed_'):
+            x = paddle.static.data(name='x', shape=[-1, 4], dtype='float32')
+            out4 = paddle.scale(x, scale=2.0)
+        self.assertNotEqual(out1.name, out4.name)
+        self.assertNotEqual(
+            key1, _get_strong_program_cache_key(program4, feed, [out4])
+        )
+        # key changes once program is changed
+        with paddle.static.program_guard(program1):
+            paddle.scale(out1, scale=3.0)
+        self.assertNotEqual(
+            key1, _get_strong_program_cache_key(program1, feed, [out1])
+        )
+
+    def test_run_with_cache(self):
+        exe = paddle.static.Executor(paddle.CPUPlace())
+        x = np.random.random([2, 4]).astype('float32')
+        for _ in range(3):
+            # rebuilt programs hit the cache of the first one
+            program, out = build_program()
+            (res,) = exe.run(
+                program,
+                feed={'x': x},
+                fetch_list=[out],
+                use_program_cache=True,
+            )
+            np.testing.assert_allclose(res, x * 2.0, rtol=1e-05)
+        info = exe.cache_info()
+        for name in ['hits', 'misses', 'evictions', 'size', 'capacity']:
+            self.assertIn(name, info)
+        self.assertIn('standalone', info)
+        self.assertGreater(info['hits'] + info['standalone']['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import paddle
+import paddle.fluid.executor as executor
+
+paddle.enable_static()
+
+
+class ArrayView:
+    def __init__(self, array):
+        self._array = array
+        self.__array_interface__ = array.__array_interface__
+
+
+class TestFeedFastPath(unittest.TestCase):
+    def setUp(self):
+        self.main_program = paddle.static.Program()
+        startup_program = paddle.static.Program()
+        with paddle.static.program_guard(self.main_program, startup_program):
+            x = paddle.static.data(name='x', shape=[-1, 4], dtype='float32')
+            y = paddle.static.data(name='y', shape=[-1, 4], dtype='float32')
+            self.out = paddle.add(x, y)
+        self.exe = paddle.static.Executor(paddle.CPUPlace())
+
+    def run_program(self, x, y):
+        (res,) = self.exe.run(
+            self.main_program,
+            feed={'x': x, 'y': y},
+            fetch_list=[self.out],
+            use_program_cache=True,
+        )
+        return res
+
+    def random(self, batch_size=2):
+        return np.random.random([batch_size, 4]).astype('float32')
+
+    def test_skip_check(self):
+        check = executor.check_feed_shape_type
+        with mock.patch.object(
+            executor, 'check_feed_shape_type', side_effect=check
+        ) as mock_check:
+            for _ in range(5):
+                x, y = self.random(), self.random()
+                np.testing.assert_allclose(self.run_program(x, y), x + y)
+            # each feed is checked once with the same signature
+            self.assertEqual(mock_check.call_count, 2)
+            x, y = self.random(3), self.random(3)
+            np.testing.assert_allclose(self.run_program(x, y), x + y)
+            self.assertEqual(mock_check.call_count, 4)
+
+        # incompatible feed is still checked
+        with self.assertRaises(ValueError):
+            self.run_program(self.random(), np.ones([2, 5], dtype='float32'))
+        with self.assertRaises(ValueError):
+            self.run_program(self.random(), np.ones([2, 4], dtype='int64'))
+
+    def test_array_interface(self):
+        x, y = self.random(), self.random()
+        res = self.run_program(ArrayView(x), ArrayView(y))
+        np.testing.assert_allclose(res, x + y)
+
+    def test_scalar(self):
+        main_program = paddle.static.Program()
+        startup_program = paddle.static.Program()
+        with paddle.static.program_guard(main_program, startup_program):
+            x = paddle.static.data(name='x', shape=[1], dtype='float32')
+            out = paddle.scale(x, scale=2.0)
+        # scalars are fed in shape [1] and the dtype of variable
+        for x in [np.float32(0.5), np.float64(0.5), 0.5]:
+            (res,) = self.exe.run(
+                main_program,
+                feed={'x': x},
+                fetch_list=[out],
+                use_program_cache=True,
+            )
+            self.assertEqual(res.shape, (1,))
+            self.assertEqual(res.dtype, np.float32)
+            np.testing.assert_allclose(res, [1.0])
+
+    def test_feed_buffers(self):
+        self.exe.register_feed_buffers(['x', 'y'])
+        for batch_size in [2, 2, 3]:
+            x, y = self.random(batch_size), self.random(batch_size)
+            np.testing.assert_allclose(self.run_program(x, y), x + y)
+        plans = list(self.exe._feed_plans.values())
+        self.assertTrue(
+            any(sorted(plan.buffers.keys()) == ['x', 'y'] for plan in plans)
+        )
+
+    def test_without_program_cache(self):
+        x, y = self.random(), self.random()
+        for _ in range(3):
+            (res,) = self.exe.run(
+                self.main_program,
+                feed={'x': x, 'y': y},
+                fetch_list=[self.out],
+                use_program_cache=False,
+            )
+            np.testing.assert_allclose(res, x + y)
+        gc.collect()
+        # plans of programs cloned in each run are released with them
+        self.assertLessEqual(len(self.exe._feed_plans), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -642,6 +642,93 @@ class TestDygraphGradientClipFP64(unittest.TestCase):
             )
 
 
+class TestEagerGradientClipByGlobalNorm(unittest.TestCase):
+    def get_params_grads(self):
+        params_grads = []
+        for shape, dtype in [
+            ([4, 5], 'float32'),
+            ([5], 'float32'),
+            ([3, 2], 'float64'),
+        ]:
+            param = paddle.create_parameter(shape, dtype)
+            grad = paddle.to_tensor(
+                np.random.uniform(-1, 1, shape).astype(dtype)
+            )
+            params_grads.append((param, grad))
+        param = paddle.create_parameter([2], 'float32')
+        param.need_clip = False
+        params_grads.append((param, paddle.ones([2], 'float32')))
+        params_grads.append((paddle.create_parameter([2], 'float32'), None))
+        return params_grads
+
+    def check_clip(self, clip_norm, auto_skip_clip):
+        params_grads = self.get_params_grads()
+        grads = [g.numpy() for _, g in params_grads[:3]]
+        global_norm = np.sqrt(sum(np.sum(np.square(g)) for g in grads))
+        if auto_skip_clip and global_norm <= clip_norm:
+            scale = 1.0
+        else:
+            scale = clip_norm / max(global_norm, clip_norm)
+
+        clip = paddle.nn.ClipGradByGlobalNorm(
+            clip_norm=clip_norm, auto_skip_clip=auto_skip_clip
+        )
+        params_grads_clip = clip(params_grads)
+        self.assertEqual(len(params_grads_clip), 4)
+        for i, ((p, g), (p_clip, g_clip)) in enumerate(
+            zip(params_grads, params_grads_clip)
+        ):
+            self.assertIs(p, p_clip)
+            if i < 3:
+                # the input gradients are not modified
+                np.testing.assert_array_equal(g.numpy(), grads[i])
+                self.assertEqual(g_clip.shape, g.shape)
+                self.assertEqual(g_clip.dtype, g.dtype)
+                np.testing.assert_allclose(
+                    g_clip.numpy(), grads[i] * scale, rtol=1e-6
+                )
+            else:
+                self.assertIs(g, g_clip)
+
+    def test_clip(self):
+        with fluid.dygraph.guard():
+            self.check_clip(0.5, False)
+            self.check_clip(100.0, False)
+            self.check_clip(0.5, True)
+            self.check_clip(100.0, True)
+
+    def test_selected_rows(self):
+        with fluid.dygraph.guard():
+            embedding = paddle.nn.Embedding(10, 4, sparse=True)
+            linear = paddle.nn.Linear(4, 4)
+            x = paddle.to_tensor(np.array([[1, 3], [5, 7]]).astype('int64'))
+            loss = paddle.mean(linear(embedding(x)))
+            loss.backward()
+            params_grads = [
+                (p, p._grad_ivar())
+                for p in embedding.parameters() + linear.parameters()
+            ]
+            self.assertTrue(params_grads[0][1].is_selected_rows())
+            dense_grad = params_grads[0][1]._get_tensor_from_selected_rows()
+            global_norm = np.sqrt(
+                sum(
+                    np.sum(np.square(g.numpy()))
+                    for g in [dense_grad] + [g for _, g in params_grads[1:]]
+                )
+            )
+            clip = paddle.nn.ClipGradByGlobalNorm(clip_norm=global_norm / 2)
+            params_grads_clip = clip(params_grads)
+
+            global_norm_clip = 0
+            for _, g in params_grads_clip:
+                if g.is_selected_rows():
+                    g = g._get_tensor_from_selected_rows()
+                global_norm_clip += np.sum(np.square(g.numpy()))
+            np.testing.assert_allclose(
+                np.sqrt(global_norm_clip), global_norm / 2, rtol=1e-6
+            )
+
+
 class TestPureFP16ClipGradByGlobalNorm(unittest.TestCase):
     def check_main(self, expected_has_cast_op):
         main_prog = paddle.static.Program()
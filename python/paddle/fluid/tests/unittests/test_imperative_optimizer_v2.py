@@ -1103,5 +1103,60 @@ class TestImperativeOptimizerList(unittest.TestCase):
         self.func_test_parameter_list()
 
 
+class TestImperativeOptimizerParamIndex(unittest.TestCase):
+    def func_test_param_index(self):
+        with fluid.dygraph.guard():
+            linear_1 = paddle.nn.Linear(10, 10)
+            linear_2 = paddle.nn.Linear(10, 10)
+            linear_3 = paddle.nn.Linear(10, 10)
+            sgd = paddle.optimizer.SGD(
+                1.0,
+                parameters=[
+                    {'params': linear_1.parameters()},
+                    {'params': linear_2.parameters(), 'learning_rate': 0.1},
+                ],
+            )
+            in_np = np.random.uniform(-0.1, 0.1, [10, 10]).astype("float32")
+
+            def train_step():
+                y = linear_2(linear_1(paddle.to_tensor(in_np)))
+                loss = paddle.mean(y)
+                loss.backward()
+                weights = [
+                    linear.weight.numpy() for linear in [linear_1, linear_2]
+                ]
+                sgd.step()
+                sgd.clear_grad()
+                return weights
+
+            train_step()
+            param_index = sgd._get_param_index()
+            self.assertEqual(
+                param_index.params,
+                linear_1.parameters() + linear_2.parameters(),
+            )
+
+            # stop_gradient is checked on each step without rebuilding
+            linear_1.weight.stop_gradient = True
+            weights = train_step()
+            self.assertIs(sgd._get_param_index(), param_index)
+            np.testing.assert_array_equal(linear_1.weight.numpy(), weights[0])
+            self.assertFalse(
+                np.array_equal(linear_2.weight.numpy(), weights[1])
+            )
+
+            # the index is rebuilt when the parameter groups change
+            sgd._add_param_group({'params': linear_3.parameters()})
+            self.assertIsNot(sgd._get_param_index(), param_index)
+            params_grads_list = sgd._get_param_index().get_params_grads()
+            self.assertEqual(len(params_grads_list), 3)
+            self.assertEqual(params_grads_list[2], [])
+
+    def test_param_index(self):
+        with _test_eager_guard():
+            self.func_test_param_index()
+        self.func_test_param_index()
+
+
 if __name__ == '__main__':
     unittest.main()
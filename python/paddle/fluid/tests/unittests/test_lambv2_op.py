@@ -276,5 +276,80 @@ class TestLambOpMultiPrecision(unittest.TestCase):
         self.assertTrue(np.all(np.abs(bias_1 - bias_2) < 1e-7))
 
 
+class TestLambOpMultiTensor(unittest.TestCase):
+    def _lamb_optimize_dygraph(
+        self,
+        place,
+        use_param_group=False,
+        use_amp=False,
+        use_multi_tensor=False,
+    ):
+        paddle.disable_static()
+        paddle.seed(10)
+        paddle.set_device(place)
+
+        input = paddle.randn((5, 5))
+        model = paddle.nn.Sequential(
+            paddle.nn.Linear(5, 5),
+            paddle.nn.Linear(5, 5, paddle.ParamAttr(learning_rate=0.5)),
+            paddle.nn.Linear(5, 5),
+        )
+        if use_amp:
+            model = paddle.amp.decorate(models=model, level='O2')
+            scaler = paddle.amp.GradScaler(init_loss_scaling=1024)
+
+        parameters = list(model.parameters())
+        if use_param_group:
+            parameters = [
+                {'params': parameters[:4], 'lamb_weight_decay': 0.001},
+                {'params': parameters[4:], 'learning_rate': 0.1},
+            ]
+        optimizer = paddle.optimizer.Lamb(
+            learning_rate=0.01,
+            parameters=parameters,
+            exclude_from_weight_decay_fn=lambda p: p.name.endswith('b_0'),
+            multi_precision=use_amp,
+            use_multi_tensor=use_multi_tensor,
+        )
+
+        for idx in range(3):
+            if use_amp:
+                with paddle.amp.auto_cast(level='O2'):
+                    output = model(input)
+                    loss = paddle.mean(output)
+                scaled = scaler.scale(loss)
+                scaled.backward()
+                scaler.step(optimizer)
+                scaler.update()
+            else:
+                output = model(input)
+                loss = paddle.mean(output)
+                loss.backward()
+                optimizer.step()
+            optimizer.clear_grad()
+
+        return [param.numpy() for param in model.parameters()]
+
+    def _check_with_place(self, place, use_param_group, use_amp):
+        params1 = self._lamb_optimize_dygraph(
+            place, use_param_group, use_amp, use_multi_tensor=True
+        )
+        params2 = self._lamb_optimize_dygraph(
+            place, use_param_group, use_amp, use_multi_tensor=False
+        )
+        for param1, param2 in zip(params1, params2):
+            np.testing.assert_allclose(param1, param2, rtol=1e-05)
+
+    def test_main(self):
+        places = ['cpu']
+        if paddle.is_compiled_with_cuda():
+            places.append('gpu')
+        for place in places:
+            for use_param_group in [True, False]:
+                self._check_with_place(place, use_param_group, False)
+        if paddle.is_compiled_with_cuda():
+            self._check_with_place('gpu', False, True)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import (
+    DataLoader,
+    Dataset,
+    MMapRecordDataset,
+    write_record_dataset,
+)
+
+SAMPLE_NUM = 20
+IMAGE_SIZE = 8
+
+
+class VarLenDataset(Dataset):
+    def __getitem__(self, idx):
+        return {
+            'image': np.full([IMAGE_SIZE], idx, dtype='float32'),
+            'tokens': np.arange(idx % 5 + 1).astype('int64'),
+            'label': idx,
+        }
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+class ImageDataset(Dataset):
+    def __getitem__(self, idx):
+        np.random.seed(idx)
+        image = np.random.random([3, IMAGE_SIZE, IMAGE_SIZE]).astype('float32')
+        label = np.array([idx % 10]).astype('int64')
+        return image, label
+
+    def __len__(self):
+        return SAMPLE_NUM
+
+
+class BadDataset(Dataset):
+    def __getitem__(self, idx):
+        return np.zeros([2], dtype='float32' if idx == 0 else 'int64')
+
+    def __len__(self):
+        return 2
+
+
+class TestMMapRecordDataset(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'records', 'data')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_getitem(self):
+        write_record_dataset(VarLenDataset(), self.path)
+        dataset = MMapRecordDataset(self.path)
+        origin = VarLenDataset()
+        self.assertEqual(len(dataset), SAMPLE_NUM)
+        for idx in [0, 3, SAMPLE_NUM - 1, -1]:
+            sample = dataset[idx]
+            expected = origin[idx % SAMPLE_NUM]
+            np.testing.assert_array_equal(sample['image'], expected['image'])
+            np.testing.assert_array_equal(sample['tokens'], expected['tokens'])
+            self.assertEqual(int(sample['label']), expected['label'])
+            # fields are views on mapped file
+            self.assertFalse(sample['image'].flags.writeable)
+
+        with self.assertRaises(IndexError):
+            dataset[SAMPLE_NUM]
+
+    def test_inconsistent_samples(self):
+        with self.assertRaises(ValueError):
+            write_record_dataset(BadDataset(), self.path)
+
+    def run_dataloader(self, num_workers):
+        paddle.disable_static()
+        write_record_dataset(ImageDataset(), self.path)
+        loader = DataLoader(
+            MMapRecordDataset(self.path),
+            batch_size=4,
+            num_workers=num_workers,
+        )
+        origin = ImageDataset()
+        for i, (image, label) in enumerate(loader):
+            for j in range(4):
+                expected_image, expected_label = origin[i * 4 + j]
+                np.testing.assert_array_equal(image.numpy()[j], expected_image)
+                np.testing.assert_array_equal(label.numpy()[j], expected_label)
+
+    def test_dataloader(self):
+        self.run_dataloader(0)
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform != 'darwin' and sys.platform != 'win32':
+            self.run_dataloader(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import random
 import unittest
 
 import paddle.profiler.statistic_helper as statistic_helper
@@ -131,5 +132,81 @@ class TestStatisticHelper(unittest.TestCase):
         self.assertEqual(dst, [(10, 11)])
 
 
+def random_ranges(num, max_start=1000, max_length=30):
+    ranges = []
+    for _ in range(num):
+        start = random.randint(0, max_start)
+        ranges.append((start, start + random.randint(0, max_length)))
+    return ranges
+
+
+def drop_empty(ranges):
+    return statistic_helper.merge_self_ranges(
+        [time_range for time_range in ranges if time_range[1] > time_range[0]]
+    )
+
+
+class TestTimeRanges(unittest.TestCase):
+    def test_time_ranges(self):
+        src = [(5, 12), (1, 1), (2, 3), (4, 7)]
+        time_ranges = statistic_helper.TimeRanges(src)
+        self.assertEqual(time_ranges.to_list(), [(1, 1), (2, 3), (4, 12)])
+        self.assertEqual(len(time_ranges), 3)
+        self.assertEqual(statistic_helper.sum_ranges(time_ranges), 9)
+        self.assertEqual(len(statistic_helper.TimeRanges()), 0)
+        self.assertEqual(statistic_helper.TimeRanges().sum(), 0)
+
+    def test_set_operations(self):
+        time_ranges1 = statistic_helper.TimeRanges([(1, 10), (12, 15)])
+        time_ranges2 = statistic_helper.TimeRanges([(3, 7), (9, 11)])
+        self.assertEqual(
+            time_ranges1.union(time_ranges2).to_list(), [(1, 11), (12, 15)]
+        )
+        self.assertEqual(
+            time_ranges1.intersection(time_ranges2).to_list(),
+            [(3, 7), (9, 10)],
+        )
+        self.assertEqual(
+            time_ranges1.subtract(time_ranges2).to_list(),
+            [(1, 3), (7, 9), (12, 15)],
+        )
+        self.assertEqual(
+            time_ranges2.subtract(time_ranges1).to_list(), [(10, 11)]
+        )
+        empty = statistic_helper.TimeRanges()
+        self.assertEqual(time_ranges1.union(empty), time_ranges1)
+        self.assertEqual(time_ranges1.intersection(empty), empty)
+        self.assertEqual(time_ranges1.subtract(empty), time_ranges1)
+        self.assertEqual(empty.subtract(time_ranges1), empty)
+
+    def test_same_as_list_functions(self):
+        random.seed(2022)
+        for _ in range(200):
+            src1 = random_ranges(random.randint(0, 50))
+            src2 = random_ranges(random.randint(0, 50))
+            merged1 = statistic_helper.merge_self_ranges(list(src1))
+            merged2 = statistic_helper.merge_self_ranges(list(src2))
+            time_ranges1 = statistic_helper.TimeRanges(src1)
+            time_ranges2 = statistic_helper.TimeRanges(src2)
+            self.assertEqual(time_ranges1.to_list(), merged1)
+            self.assertEqual(
+                time_ranges1.union(time_ranges2).to_list(),
+                statistic_helper.merge_ranges(merged1, merged2, True),
+            )
+            # NOTE: empty ranges are dropped by the set operations
+            self.assertEqual(
+                time_ranges1.intersection(time_ranges2).to_list(),
+                drop_empty(
+                    statistic_helper.intersection_ranges(merged1, merged2, True)
+                ),
+            )
+            self.assertEqual(
+                time_ranges1.subtract(time_ranges2).to_list(),
+                drop_empty(
+                    statistic_helper.subtract_ranges(merged1, merged2, True)
+                ),
+            )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,251 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from unittest import mock
+
+import numpy as np
+
+import paddle
+import paddle.framework.io as paddle_io
+
+
+class TestSaveLoadStreamFormat(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'model.pdparams')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_state_dict(self):
+        layer = paddle.nn.Linear(8, 4)
+        state_dict = layer.state_dict()
+        state_dict['mask'] = paddle.to_tensor([True, False, True])
+        state_dict['empty'] = paddle.zeros([0, 3], dtype='int64')
+        return state_dict
+
+    def check_state_dict(self, loaded, state_dict):
+        self.assertEqual(list(loaded.keys()), list(state_dict.keys()))
+        for key, value in state_dict.items():
+            self.assertEqual(loaded[key].dtype, value.dtype)
+            self.assertEqual(loaded[key].name, value.name)
+            np.testing.assert_array_equal(loaded[key].numpy(), value.numpy())
+
+    def test_state_dict(self):
+        state_dict = self.create_state_dict()
+        paddle.save(state_dict, self.path, use_stream_format=True)
+        self.check_state_dict(paddle.load(self.path), state_dict)
+        self.check_state_dict(paddle.load(self.path, mmap=True), state_dict)
+
+        loaded = paddle.load(self.path, return_numpy=True)
+        for key, value in state_dict.items():
+            self.assertTrue(isinstance(loaded[key], np.ndarray))
+            np.testing.assert_array_equal(loaded[key], value.numpy())
+
+    def test_mmap_copy_on_write(self):
+        state_dict = self.create_state_dict()
+        paddle.save(state_dict, self.path, use_stream_format=True)
+        loaded = paddle.load(self.path, mmap=True)
+        self.assertTrue(loaded['weight'].place.is_cpu_place())
+        loaded['weight'].set_value(np.zeros([8, 4], dtype='float32'))
+        # writing the loaded tensor does not change the file
+        self.check_state_dict(paddle.load(self.path, mmap=True), state_dict)
+
+    def test_nested_object(self):
+        tensor = paddle.randn([3, 5])
+        array = np.random.random([2, 2])
+        obj = {
+            'tensors': [tensor, (tensor, 1)],
+            'array': array,
+            'objects': np.array(['a', None], dtype=object),
+            'meta': {'epoch': 3, 'name': 'linear'},
+        }
+        paddle.save(obj, self.path, use_stream_format=True)
+        loaded = paddle.load(self.path, mmap=True)
+        # the same tensor is saved once and loaded as the same object
+        self.assertIs(loaded['tensors'][0], loaded['tensors'][1][0])
+        np.testing.assert_array_equal(
+            loaded['tensors'][0].numpy(), tensor.numpy()
+        )
+        self.assertEqual(loaded['tensors'][1][1], 1)
+        self.assertTrue(isinstance(loaded['array'], np.ndarray))
+        np.testing.assert_array_equal(loaded['array'], array)
+        self.assertEqual(loaded['objects'].tolist(), ['a', None])
+        self.assertEqual(loaded['meta'], obj['meta'])
+
+    def test_memory_buffer(self):
+        state_dict = self.create_state_dict()
+        buffer = BytesIO()
+        paddle.save(state_dict, buffer, use_stream_format=True)
+        tensor = paddle.randn([2, 3])
+        paddle.save(tensor, buffer)
+        buffer.seek(0)
+        self.check_state_dict(paddle.load(buffer), state_dict)
+        np.testing.assert_array_equal(
+            paddle.load(buffer).numpy(), tensor.numpy()
+        )
+
+        buffer.seek(0)
+        with self.assertRaises(ValueError):
+            paddle.load(buffer, mmap=True)
+
+    def test_error(self):
+        paddle.save(self.create_state_dict(), self.path)
+        with self.assertRaises(ValueError):
+            paddle.load(self.path, mmap=True)
+        with self.assertRaises(TypeError):
+            paddle.save({}, self.path, use_stream_format=1)
+        with self.assertRaises(ValueError):
+            paddle.save(
+                {'layer': paddle.nn.Linear(2, 2)},
+                self.path,
+                use_stream_format=True,
+            )
+
+
+class Backbone(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.conv = paddle.nn.Conv2D(3, 4, 3)
+        self.bn = paddle.nn.BatchNorm2D(4)
+
+
+class Model(paddle.nn.Layer):
+    def __init__(self):
+        super().__init__()
+        self.backbone = Backbone()
+        self.head = paddle.nn.Linear(4, 2)
+
+
+class TestSelectiveLoad(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        paddle.set_device('cpu')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'model.pdparams')
+        self.state_dict = Model().state_dict()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_keys(self, loaded, keys):
+        self.assertEqual(list(loaded.keys()), keys)
+        for key in keys:
+            np.testing.assert_array_equal(
+                loaded[key].numpy(), self.state_dict[key].numpy()
+            )
+
+    def test_keys(self):
+        backbone_keys = [
+            key for key in self.state_dict if key.startswith('backbone.')
+        ]
+        for use_stream_format in [False, True]:
+            paddle.save(
+                self.state_dict, self.path, use_stream_format=use_stream_format
+            )
+            self.check_keys(
+                paddle.load(self.path, keys='backbone'), backbone_keys
+            )
+            self.check_keys(
+                paddle.load(self.path, keys=['head.bias', 'backbone.conv']),
+                ['backbone.conv.weight', 'backbone.conv.bias', 'head.bias'],
+            )
+            with self.assertRaises(KeyError):
+                paddle.load(self.path, keys=['back'])
+
+    def test_keys_in_one_pass(self):
+        paddle.save(self.state_dict, self.path, use_stream_format=True)
+        keys = list(self.state_dict.keys())
+        for mmap in [False, True]:
+            with mock.patch.object(
+                paddle_io,
+                '_open_file_buffer',
+                wraps=paddle_io._open_file_buffer,
+            ) as mock_open:
+                reader = paddle_io._StreamReader(self.path, mmap)
+                refs = reader.load_refs()
+                num_opened = mock_open.call_count
+                loaded = paddle_io._LazyStateDict(
+                    reader, refs, keys, False, True
+                )
+                loaded._load_all()
+                # tensors of all keys are read with one opened file, and
+                # the file is not opened again if mapped
+                self.assertEqual(
+                    mock_open.call_count - num_opened, 0 if mmap else 1
+                )
+                self.assertEqual(
+                    set(loaded._tensors), set(range(len(reader.metas)))
+                )
+            self.check_keys(
+                paddle.load(self.path, keys=['backbone', 'head'], mmap=mmap),
+                keys,
+            )
+
+    def test_lazy(self):
+        paddle.save(self.state_dict, self.path, use_stream_format=True)
+        loaded = paddle.load(self.path, lazy=True)
+        self.assertEqual(list(loaded.keys()), list(self.state_dict.keys()))
+        self.assertIn('head.weight', loaded)
+        self.assertEqual(loaded._values, {})
+        self.check_keys({'head.weight': loaded['head.weight']}, ['head.weight'])
+        self.assertEqual(list(loaded._values.keys()), ['head.weight'])
+        # the loaded tensor is cached
+        self.assertIs(loaded['head.weight'], loaded['head.weight'])
+
+        model = Model()
+        model.set_state_dict(loaded)
+        self.check_keys(model.state_dict(), list(self.state_dict.keys()))
+
+        loaded = paddle.load(self.path, keys='backbone.bn', lazy=True)
+        self.assertNotIn('head.weight', loaded)
+        self.assertEqual(len(loaded), 4)
+
+    def test_lazy_legacy_format(self):
+        paddle.save(self.state_dict, self.path)
+        with self.assertRaises(ValueError):
+            paddle.load(self.path, lazy=True)
+
+
+class TestSaveLoadStreamFormatStatic(unittest.TestCase):
+    def setUp(self):
+        paddle.enable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'tensor.pdtensor')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        paddle.disable_static()
+
+    def test_lod_tensor(self):
+        array = np.random.random([4, 3]).astype('float32')
+        tensor = paddle.fluid.core.LoDTensor()
+        tensor.set(array, paddle.CPUPlace())
+        tensor.set_lod([[0, 1, 4]])
+        paddle.save(tensor, self.path, use_stream_format=True)
+        for mmap in [False, True]:
+            loaded = paddle.load(self.path, mmap=mmap)
+            self.assertTrue(isinstance(loaded, paddle.fluid.core.LoDTensor))
+            self.assertEqual(loaded.lod(), [[0, 1, 4]])
+            np.testing.assert_array_equal(np.array(loaded), array)
+
+
+if __name__ == '__main__':
+    unittest.main()
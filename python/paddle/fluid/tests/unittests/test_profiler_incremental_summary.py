@@ -0,0 +1,224 @@
+#   Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import unittest
+
+import numpy as np
+from test_profiler_statistic import DevicePythonNode, HostPythonNode
+
+import paddle
+import paddle.profiler as profiler
+from paddle.profiler.profiler import _sample_scheduler
+from paddle.profiler.profiler_statistic import (
+    IncrementalStatisticData,
+    StatisticData,
+)
+
+
+def build_window(offset, kernel_time):
+    root_node = HostPythonNode(
+        'Root Node',
+        profiler.TracerEventType.UserDefined,
+        0,
+        float('inf'),
+        1000,
+        1001,
+    )
+    step_node = HostPythonNode(
+        'ProfileStep#1',
+        profiler.TracerEventType.ProfileStep,
+        offset,
+        offset + 100,
+        1000,
+        1001,
+    )
+    matmul_node = HostPythonNode(
+        'matmul',
+        profiler.TracerEventType.Operator,
+        offset + 10,
+        offset + 40,
+        1000,
+        1001,
+    )
+    compute_node = HostPythonNode(
+        'matmul::compute',
+        profiler.TracerEventType.OperatorInner,
+        offset + 15,
+        offset + 35,
+        1000,
+        1001,
+    )
+    launch_node = HostPythonNode(
+        'cudaLaunchKernel',
+        profiler.TracerEventType.CudaRuntime,
+        offset + 20,
+        offset + 25,
+        1000,
+        1001,
+    )
+    kernel_node = DevicePythonNode(
+        'gemm_kernel',
+        profiler.TracerEventType.Kernel,
+        offset + 30,
+        offset + 30 + kernel_time,
+        0,
+        0,
+        7,
+    )
+    allreduce_node = HostPythonNode(
+        'allreduce_op',
+        profiler.TracerEventType.Operator,
+        offset + 50,
+        offset + 60,
+        1000,
+        1001,
+    )
+    root_node.children_node.append(step_node)
+    step_node.children_node.extend([matmul_node, allreduce_node])
+    matmul_node.children_node.append(compute_node)
+    compute_node.runtime_node.append(launch_node)
+    launch_node.device_node.append(kernel_node)
+    extra_info = {
+        'Process Cpu Utilization': '1.0',
+        'System Cpu Utilization': '0.5',
+    }
+    return {'thread1001': root_node}, extra_info
+
+
+class TestIncrementalStatisticData(unittest.TestCase):
+    def test_merge(self):
+        statistic_data = IncrementalStatisticData()
+        statistic_data.add(*build_window(0, 10))
+        statistic_data.add(*build_window(1000, 30))
+        self.assertEqual(statistic_data.num_windows, 2)
+
+        time_range_summary = statistic_data.time_range_summary
+        self.assertEqual(
+            time_range_summary.get_cpu_range_sum(
+                profiler.TracerEventType.ProfileStep
+            ),
+            200,
+        )
+        self.assertEqual(
+            time_range_summary.get_gpu_range_sum(
+                0, profiler.TracerEventType.Kernel
+            ),
+            40,
+        )
+        self.assertEqual(
+            time_range_summary.AllGPUTimeRangeSum[
+                profiler.TracerEventType.Kernel
+            ],
+            40,
+        )
+        self.assertEqual(
+            time_range_summary.call_times[profiler.TracerEventType.Operator], 4
+        )
+
+        matmul = statistic_data.event_summary.items['matmul']
+        self.assertEqual(matmul.call, 2)
+        self.assertEqual(matmul.cpu_time, 60)
+        self.assertEqual(matmul.gpu_time, 40)
+        self.assertEqual(matmul.max_gpu_time, 30)
+        self.assertEqual(matmul.min_gpu_time, 10)
+        self.assertEqual(matmul.operator_inners['matmul::compute'].call, 2)
+        kernel = statistic_data.event_summary.kernel_items['gemm_kernel']
+        self.assertEqual(kernel.call, 2)
+        self.assertEqual(kernel.gpu_time, 40)
+
+        distributed_summary = statistic_data.distributed_summary
+        self.assertEqual(distributed_summary.cpu_calls, 2)
+        self.assertEqual(distributed_summary.cpu_communication_time, 20)
+        self.assertEqual(distributed_summary.computation_time, 40)
+        self.assertEqual(
+            float(statistic_data.extra_info['Process Cpu Utilization']), 1.0
+        )
+
+        # the summary is the same as analysing all data once
+        node_trees, extra_info = build_window(0, 10)
+        single = StatisticData(node_trees, extra_info)
+        merged = IncrementalStatisticData()
+        merged.add(node_trees, extra_info)
+        self.assertEqual(
+            profiler.profiler_statistic._build_table(merged),
+            profiler.profiler_statistic._build_table(single),
+        )
+
+
+class TestSampleScheduler(unittest.TestCase):
+    def test_sample_period(self):
+        random.seed(2022)
+        scheduler = profiler.make_scheduler(closed=1, ready=1, record=2)
+        sampled_scheduler = _sample_scheduler(scheduler, 0.5)
+        period_states = []
+        for step in range(400):
+            state = sampled_scheduler(step)
+            if step % 4 == 0:
+                period_states.append([])
+            period_states[-1].append(state)
+        closed_period = [profiler.ProfilerState.CLOSED] * 4
+        origin_period = [scheduler(step) for step in range(4)]
+        num_sampled = 0
+        for states in period_states:
+            # a period is either recorded or skipped as a whole
+            self.assertIn(states, [closed_period, origin_period])
+            num_sampled += states == origin_period
+        self.assertGreater(num_sampled, 20)
+        self.assertLess(num_sampled, 80)
+
+
+class TestProfilerIncrementalSummary(unittest.TestCase):
+    def run_profiler(self, **kwargs):
+        x = paddle.to_tensor(np.random.randn(4, 4), place=paddle.CPUPlace())
+        prof = profiler.Profiler(
+            targets=[profiler.ProfilerTarget.CPU],
+            scheduler=profiler.make_scheduler(
+                closed=1, ready=1, record=2, repeat=3
+            ),
+            incremental_summary=True,
+            **kwargs
+        )
+        prof.start()
+        for _ in range(16):
+            y = paddle.matmul(x, x)
+            prof.step()
+        prof.stop()
+        return prof
+
+    def test_incremental_summary(self):
+        windows = []
+        prof = self.run_profiler(
+            on_trace_ready=lambda prof: windows.append(prof.profiler_result)
+        )
+        self.assertEqual(len(windows), 3)
+        self.assertIsNone(prof.profiler_result)
+        statistic_data = prof._incremental_statistic_data
+        self.assertEqual(statistic_data.num_windows, 3)
+        self.assertEqual(
+            statistic_data.event_summary.model_perspective_items[
+                'ProfileStep'
+            ].call,
+            6,
+        )
+        prof.summary()
+
+    def test_sample_rate(self):
+        prof = self.run_profiler(sample_rate=0.0)
+        self.assertEqual(prof._incremental_statistic_data.num_windows, 0)
+        prof.summary()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+import paddle
+from paddle.io import DataLoader, ShardedFileDataset
+
+FILE_NUM = 7
+NUM_REPLICAS = 2
+
+
+def read_fn(path):
+    with open(path) as f:
+        for line in f:
+            yield np.array([int(line)]).astype('int64')
+
+
+class TestShardedFileDataset(unittest.TestCase):
+    def setUp(self):
+        paddle.disable_static()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.files = []
+        rng = np.random.RandomState(0)
+        self.sample_num = 0
+        for i in range(FILE_NUM):
+            path = os.path.join(self.temp_dir.name, 'part-{}'.format(i))
+            with open(path, 'w') as f:
+                # skewed file sizes
+                for _ in range(rng.randint(5, 50)):
+                    f.write('{}\n'.format(self.sample_num))
+                    self.sample_num += 1
+            self.files.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_dataset(self, rank, shuffle=False, **kwargs):
+        return ShardedFileDataset(
+            self.files,
+            read_fn=read_fn,
+            shuffle=shuffle,
+            num_replicas=NUM_REPLICAS,
+            rank=rank,
+            **kwargs
+        )
+
+    def test_partition(self):
+        num_workers = 2
+        for shuffle in [False, True]:
+            files = []
+            for rank in range(NUM_REPLICAS):
+                dataset = self.create_dataset(rank, shuffle)
+                for worker_id in range(num_workers):
+                    files += dataset.get_shard_files(worker_id, num_workers)
+            # each file is read by exactly one worker of one rank
+            self.assertEqual(sorted(files), sorted(self.files))
+
+    def test_default_read_fn(self):
+        dataset = ShardedFileDataset(self.files, num_replicas=1, rank=0)
+        samples = [int(line) for line in dataset]
+        self.assertEqual(sorted(samples), list(range(self.sample_num)))
+
+    def read_epoch(self, shuffle, num_workers, epoch=0):
+        samples = []
+        for rank in range(NUM_REPLICAS):
+            dataset = self.create_dataset(rank, shuffle, buffer_size=8)
+            dataset.set_epoch(epoch)
+            loader = DataLoader(
+                dataset, batch_size=None, num_workers=num_workers
+            )
+            samples += [int(data.numpy()[0]) for data in loader]
+        return samples
+
+    def run_main(self, num_workers):
+        samples = self.read_epoch(False, num_workers)
+        self.assertEqual(sorted(samples), list(range(self.sample_num)))
+
+        epoch0 = self.read_epoch(True, num_workers, epoch=0)
+        epoch1 = self.read_epoch(True, num_workers, epoch=1)
+        self.assertEqual(sorted(epoch0), list(range(self.sample_num)))
+        self.assertEqual(sorted(epoch1), list(range(self.sample_num)))
+        self.assertNotEqual(epoch0, epoch1)
+        # deterministic under the same seed and epoch
+        self.assertEqual(self.read_epoch(True, num_workers, epoch=1), epoch1)
+
+    def test_single_process(self):
+        self.run_main(0)
+
+    def test_multi_process(self):
+        # DataLoader with multi-process mode is not supported on MacOs and Windows currently
+        if sys.platform == 'darwin' or sys.platform == 'win32':
+            return
+        self.run_main(2)
+
+    def test_auto_epoch(self):
+        dataset = ShardedFileDataset(
+            self.files, shuffle=True, num_replicas=1, rank=0
+        )
+        epoch0 = [line for line in dataset]
+        epoch1 = [line for line in dataset]
+        self.assertEqual(dataset.epoch, 2)
+        self.assertNotEqual(epoch0, epoch1)
+        self.assertEqual(sorted(epoch0), sorted(epoch1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,8 @@ import warnings
 import sys
 import numpy as np
 import copyreg
+import struct
+from io import BytesIO
 import paddle
 
 # deprecated module import
@@ -37,6 +39,7 @@ from paddle.fluid.framework import (
     _varbase_creator,
     _dygraph_tracer,
     _non_static_mode,
+    in_dygraph_mode,
     ParamBase,
     EagerParamBase,
     _current_expected_place,
@@ -48,8 +51,9 @@ from paddle.fluid.dygraph.io import (
     _construct_params_and_buffers,
 )
 from paddle.fluid.dygraph.io import INFER_MODEL_SUFFIX, INFER_PARAMS_SUFFIX
+from paddle.fluid.data_feeder import convert_dtype
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 
 __all__ = []
 
@@ -220,6 +224,9 @@ def _parse_load_config(configs):
         'params_filename',
         'keep_name_table',
         'return_numpy',
+        'mmap',
+        'keys',
+        'lazy',
     ]
 
     # input check
@@ -236,12 +243,19 @@ def _parse_load_config(configs):
     inner_config.params_filename = configs.get('params_filename', None)
     inner_config.keep_name_table = configs.get('keep_name_table', None)
     inner_config.return_numpy = configs.get('return_numpy', False)
+    inner_config.mmap = configs.get('mmap', False)
+    inner_config.keys = configs.get('keys', None)
+    inner_config.lazy = configs.get('lazy', False)
 
     return inner_config
 
 
 def _parse_save_config(configs):
-    supported_configs = ['use_binary_format', 'pickle_protocol']
+    supported_configs = [
+        'use_binary_format',
+        'use_stream_format',
+        'pickle_protocol',
+    ]
 
     # input check
     for key in configs:
@@ -254,6 +268,7 @@ def _parse_save_config(configs):
     # construct inner config
     inner_config = _SaveLoadConfig()
     inner_config.use_binary_format = configs.get('use_binary_format', False)
+    inner_config.use_stream_format = configs.get('use_stream_format', False)
     inner_config.pickle_protocol = configs.get('pickle_protocol', None)
 
     return inner_config
@@ -339,6 +354,492 @@ def _pickle_save(obj, f, protocol):
         pickler.dump(obj)
 
 
+# NOTE: layout of the stream format is
+#       | magic | version | header size | header | padding | data |
+#       the header is a pickle of the object with tensors replaced by
+#       persistent ids and the meta of tensors, and the data section holds
+#       raw bytes of tensors, each aligned to _STREAM_ALIGNMENT bytes
+_STREAM_MAGIC = b'PDSTREAM'
+_STREAM_FORMAT_VERSION = 1
+_STREAM_PREFIX = struct.Struct('<8sIQ')
+_STREAM_ALIGNMENT = 64
+# NOTE: write at most 1GB each time, since writing larger bytes at once
+#       fails on 'MAC python3'
+_STREAM_MAX_WRITE_BYTES = 2**30
+
+_STREAM_TENSOR = 'tensor'
+_STREAM_LOD_TENSOR = 'lod_tensor'
+_STREAM_NDARRAY = 'ndarray'
+
+
+def _stream_align(offset):
+    return (
+        (offset + _STREAM_ALIGNMENT - 1)
+        // _STREAM_ALIGNMENT
+        * _STREAM_ALIGNMENT
+    )
+
+
+def _stream_dense_tensor(obj):
+    if isinstance(obj, core.LoDTensor):
+        return obj
+    if isinstance(obj, core.eager.Tensor):
+        return obj.get_tensor()
+    return obj.value().get_tensor()
+
+
+class _StreamPickler(pickle.Pickler):
+    """
+    Pickler replacing tensors and numeric ndarrays by persistent ids, and
+    recording the meta and the source of each of them. The raw bytes are
+    written after the header by `_stream_save`.
+    """
+
+    def __init__(self, f, protocol):
+        super().__init__(f, protocol)
+        self.metas = []
+        self.sources = []
+        self._size = 0
+        # NOTE: the same object referenced multiple times is saved once,
+        #       objects are alive during pickling so ids are not reused
+        self._indices = {}
+
+    def _meta(self, obj):
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.hasobject or obj.dtype.fields is not None:
+                return None
+            return {
+                'kind': _STREAM_NDARRAY,
+                'dtype': obj.dtype.str,
+                'shape': list(obj.shape),
+            }
+        if isinstance(obj, core.LoDTensor):
+            return {
+                'kind': _STREAM_LOD_TENSOR,
+                'dtype': np.dtype(convert_dtype(obj._dtype())).str,
+                'shape': list(obj.shape()),
+                'lod': obj.lod(),
+            }
+        if isinstance(obj, (core.VarBase, core.eager.Tensor)):
+            return {
+                'kind': _STREAM_TENSOR,
+                'name': obj.name,
+                'dtype': np.dtype(convert_dtype(obj.dtype)).str,
+                'shape': list(obj.shape),
+            }
+        return None
+
+    def persistent_id(self, obj):
+        if isinstance(obj, fluid.Layer):
+            raise ValueError(
+                "paddle do not support saving `paddle.nn.Layer` object."
+            )
+        index = self._indices.get(id(obj))
+        if index is not None:
+            return index
+        meta = self._meta(obj)
+        if meta is None:
+            return None
+        nbytes = int(np.prod(meta['shape'])) * np.dtype(meta['dtype']).itemsize
+        meta['offset'] = _stream_align(self._size)
+        meta['nbytes'] = nbytes
+        self._size = meta['offset'] + nbytes
+        index = len(self.metas)
+        self.metas.append(meta)
+        self.sources.append(obj)
+        self._indices[id(obj)] = index
+        return index
+
+
+def _stream_save(obj, f, protocol):
+    if not isinstance(protocol, int):
+        raise ValueError(
+            "The 'protocol' MUST be `int`, but received {}".format(
+                type(protocol)
+            )
+        )
+
+    if protocol < 2 or protocol > 4:
+        raise ValueError(
+            "Expected 1<'protocol'<5, but received protocol={}".format(protocol)
+        )
+
+    obj_buffer = BytesIO()
+    pickler = _StreamPickler(obj_buffer, protocol)
+    pickler.dump(obj)
+    header = pickle.dumps(
+        {'metas': pickler.metas, 'obj': obj_buffer.getvalue()},
+        protocol=protocol,
+    )
+    prefix = _STREAM_PREFIX.pack(
+        _STREAM_MAGIC, _STREAM_FORMAT_VERSION, len(header)
+    )
+    f.write(prefix)
+    f.write(header)
+    header_end = len(prefix) + len(header)
+    f.write(b'\0' * (_stream_align(header_end) - header_end))
+
+    position = 0
+    for meta, source in zip(pickler.metas, pickler.sources):
+        f.write(b'\0' * (meta['offset'] - position))
+        if isinstance(source, np.ndarray):
+            array = np.ascontiguousarray(source)
+        else:
+            # NOTE: the array shares memory with the tensor on CPU, and
+            #       only one tensor is copied to host at a time on GPU
+            array = np.asarray(_stream_dense_tensor(source))
+        assert (
+            array.dtype.str == meta['dtype'] and array.nbytes == meta['nbytes']
+        ), "tensor {} is changed during saving".format(meta.get('name'))
+        data = memoryview(array.reshape([-1])).cast('B')
+        for i in range(0, len(data), _STREAM_MAX_WRITE_BYTES):
+            f.write(data[i : i + _STREAM_MAX_WRITE_BYTES])
+        position = meta['offset'] + meta['nbytes']
+
+
+class _StreamRef:
+    """
+    Placeholder of a tensor in the object loaded by `_StreamReader.load_refs`.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+
+class _NullBuffer:
+    def write(self, data):
+        return len(data)
+
+
+def _stream_ref_indices(obj):
+    """
+    Returns the indices of all `_StreamRef` contained in `obj`.
+    """
+    indices = set()
+
+    class _Collector(pickle.Pickler):
+        def persistent_id(self, value):
+            if isinstance(value, _StreamRef):
+                indices.add(value.index)
+                return value.index
+            return None
+
+    _Collector(_NullBuffer(), pickle.HIGHEST_PROTOCOL).dump(obj)
+    return indices
+
+
+def _stream_replace_refs(obj, load_value):
+    """
+    Returns a copy of `obj` with each `_StreamRef` replaced by
+    `load_value(index)`.
+    """
+
+    class _RefPickler(pickle.Pickler):
+        def persistent_id(self, value):
+            if isinstance(value, _StreamRef):
+                return value.index
+            return None
+
+    class _RefUnpickler(pickle.Unpickler):
+        def persistent_load(self, index):
+            return load_value(index)
+
+    buffer = BytesIO()
+    _RefPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(obj)
+    buffer.seek(0)
+    return _RefUnpickler(buffer).load()
+
+
+def _select_keys(all_keys, keys):
+    """
+    Returns the keys in `all_keys` selected by `keys`, in the order of
+    `all_keys`. An entry of `keys` selects the key equal to it, and the
+    keys starting with it followed by '.', e.g. 'backbone' selects
+    'backbone.conv.weight'.
+    """
+    if isinstance(keys, str):
+        keys = [keys]
+    entries = set(keys)
+    matched = set()
+    selected = []
+    for key in all_keys:
+        candidates = [key]
+        if isinstance(key, str):
+            # NOTE: all dotted prefixes of the key, such as 'a' and 'a.b'
+            #       of 'a.b.c'
+            parts = key.split('.')
+            candidates += ['.'.join(parts[:i]) for i in range(1, len(parts))]
+        hits = [c for c in candidates if c in entries]
+        if hits:
+            selected.append(key)
+            matched.update(hits)
+    missing = [key for key in keys if key not in matched]
+    if missing:
+        raise KeyError(
+            "Keys {} are not found in the loaded object.".format(missing)
+        )
+    return selected
+
+
+def _new_dict_like(obj):
+    if type(obj) in (dict, collections.OrderedDict):
+        return type(obj)()
+    return {}
+
+
+def _select_state_dict(obj, keys):
+    if not isinstance(obj, dict):
+        raise ValueError(
+            "`keys` is only supported for loading dict, but the loaded object is {}.".format(
+                type(obj)
+            )
+        )
+    selected = _select_keys(obj.keys(), keys)
+    result = _new_dict_like(obj)
+    for key in selected:
+        result[key] = obj[key]
+    return result
+
+
+def _is_stream_file(path):
+    with _open_file_buffer(path, 'rb') as f:
+        start = f.tell()
+        magic = f.read(len(_STREAM_MAGIC))
+        f.seek(start)
+    return magic == _STREAM_MAGIC
+
+
+class _StreamReader:
+    """
+    Reader of files saved by `paddle.save` with `use_stream_format=True`.
+    Tensors are read lazily by `load_array`. If `mmap` is True, arrays
+    are backed by the copy-on-write mapped file instead of being read
+    into memory.
+    """
+
+    def __init__(self, path, mmap=False):
+        if mmap and not _is_file_path(path):
+            raise ValueError(
+                "`mmap` is only supported for loading from file path, but got {}".format(
+                    type(path)
+                )
+            )
+        self._path = path
+        with _open_file_buffer(path, 'rb') as f:
+            self._start = f.tell()
+            magic, version, header_size = _STREAM_PREFIX.unpack(
+                f.read(_STREAM_PREFIX.size)
+            )
+            if magic != _STREAM_MAGIC or version > _STREAM_FORMAT_VERSION:
+                raise ValueError(
+                    "`paddle.load` can not parse the stream file:{} of version {}.".format(
+                        path, version
+                    )
+                )
+            header = pickle.loads(f.read(header_size))
+        self.metas = header['metas']
+        self._obj_bytes = header['obj']
+        self._data_start = self._start + _stream_align(
+            _STREAM_PREFIX.size + header_size
+        )
+        self._mmap = np.memmap(path, dtype='uint8', mode='c') if mmap else None
+
+    def load_array(self, index, f=None):
+        meta = self.metas[index]
+        dtype = np.dtype(meta['dtype'])
+        start = self._data_start + meta['offset']
+        if self._mmap is not None:
+            data = self._mmap[start : start + meta['nbytes']]
+            return data.view(dtype).reshape(meta['shape'])
+        array = np.empty(meta['shape'], dtype=dtype)
+        data = memoryview(array.reshape([-1])).cast('B')
+        f.seek(start)
+        size = 0
+        while size < len(data):
+            read_size = f.readinto(data[size:])
+            if not read_size:
+                raise ValueError(
+                    "`paddle.load` can not parse the truncated file:{}.".format(
+                        self._path
+                    )
+                )
+            size += read_size
+        return array
+
+    def load_arrays(self, indices):
+        """
+        Yields `(index, array)` of the given tensor indices, read in one
+        pass over the file. The file is not opened if `mmap` is True.
+        """
+        if self._mmap is not None:
+            for index in indices:
+                yield index, self.load_array(index)
+            return
+        with _open_file_buffer(self._path, 'rb') as f:
+            for index in indices:
+                yield index, self.load_array(index, f)
+
+    def load(self, load_value):
+        """
+        Unpickles the saved object, with the index of each tensor replaced
+        by `load_value(index, f)`.
+        """
+
+        class _Unpickler(pickle.Unpickler):
+            def persistent_load(self, index):
+                return load_value(index, f)
+
+        with _open_file_buffer(self._path, 'rb') as f:
+            obj = _Unpickler(BytesIO(self._obj_bytes)).load()
+            # NOTE: move the position of buffer to the end of the object
+            f.seek(
+                self._data_start
+                + max(
+                    [meta['offset'] + meta['nbytes'] for meta in self.metas],
+                    default=0,
+                )
+            )
+        return obj
+
+    def load_refs(self):
+        """
+        Unpickles the saved object with tensors replaced by `_StreamRef`,
+        without reading any tensor data.
+        """
+        return self.load(lambda index, f: _StreamRef(index))
+
+
+def _stream_zero_copy(mmap):
+    # NOTE: tensors share memory with the arrays if they are on CPU,
+    #       tensors loaded by mmap are always on CPU
+    return mmap or isinstance(_current_expected_place(), core.CPUPlace)
+
+
+def _stream_array_to_tensor(meta, array, return_numpy, zero_copy):
+    if return_numpy or meta['kind'] == _STREAM_NDARRAY:
+        return array
+    place = core.CPUPlace() if zero_copy else _current_expected_place()
+    if _non_static_mode():
+        if zero_copy:
+            tensor_type = (
+                core.eager.Tensor if in_dygraph_mode() else core.VarBase
+            )
+            tensor = tensor_type(
+                value=array,
+                place=place,
+                persistable=False,
+                zero_copy=True,
+                name=meta.get('name', ''),
+            )
+        else:
+            tensor = paddle.to_tensor(array)
+        if 'name' in meta:
+            tensor.name = meta['name']
+        return tensor
+    tensor = core.LoDTensor()
+    tensor.set(array, place, zero_copy)
+    if meta.get('lod'):
+        tensor.set_lod(meta['lod'])
+    return tensor
+
+
+class _LazyStateDict(Mapping):
+    """
+    Read-only mapping of the dict saved in the stream format. Only the
+    header is read on construction, and the tensors of a key are read on
+    the first access of the key.
+    """
+
+    def __init__(self, reader, refs, keys, return_numpy, zero_copy):
+        self._reader = reader
+        self._refs = refs
+        self._keys = list(refs) if keys is None else _select_keys(refs, keys)
+        self._key_set = set(self._keys)
+        self._return_numpy = return_numpy
+        self._zero_copy = zero_copy
+        self._values = {}
+        # NOTE: tensors shared by multiple keys are loaded once
+        self._tensors = {}
+
+    def __getitem__(self, key):
+        if key not in self._key_set:
+            raise KeyError(key)
+        if key not in self._values:
+            self._values[key] = self._materialize(self._refs[key])
+        return self._values[key]
+
+    def __contains__(self, key):
+        return key in self._key_set
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return "_LazyStateDict(keys={}, loaded={})".format(
+            self._keys, list(self._values)
+        )
+
+    def _load_tensors(self, indices):
+        indices = sorted(set(indices).difference(self._tensors))
+        for index, array in self._reader.load_arrays(indices):
+            self._tensors[index] = _stream_array_to_tensor(
+                self._reader.metas[index],
+                array,
+                self._return_numpy,
+                self._zero_copy,
+            )
+
+    def _load_all(self):
+        """
+        Loads the tensors of all selected keys in one pass over the file.
+        """
+        indices = set()
+        for key in self._keys:
+            indices.update(_stream_ref_indices(self._refs[key]))
+        self._load_tensors(indices)
+
+    def _materialize(self, value):
+        self._load_tensors(_stream_ref_indices(value))
+        if isinstance(value, _StreamRef):
+            return self._tensors[value.index]
+        return _stream_replace_refs(value, lambda index: self._tensors[index])
+
+
+def _stream_load(path, return_numpy, mmap, keys=None, lazy=False):
+    reader = _StreamReader(path, mmap)
+    zero_copy = _stream_zero_copy(mmap)
+    if keys is not None or lazy:
+        refs = reader.load_refs()
+        if not isinstance(refs, dict):
+            raise ValueError(
+                "`keys` and `lazy` are only supported for loading dict, but the loaded object is {}.".format(
+                    type(refs)
+                )
+            )
+        state_dict = _LazyStateDict(reader, refs, keys, return_numpy, zero_copy)
+        if lazy:
+            return state_dict
+        state_dict._load_all()
+        result = _new_dict_like(refs)
+        for key in state_dict:
+            result[key] = state_dict[key]
+        return result
+    loaded = {}
+
+    def load_value(index, f):
+        if index not in loaded:
+            meta = reader.metas[index]
+            loaded[index] = _stream_array_to_tensor(
+                meta, reader.load_array(index, f), return_numpy, zero_copy
+            )
+        return loaded[index]
+
+    return reader.load(load_value)
+
+
 def _contain_x(obj, condition_func):
     if isinstance(obj, core.SelectedRows):
         raise NotImplementedError(
@@ -660,6 +1161,9 @@ def save(obj, path, protocol=4, **configs):
           use_binary_format(bool): When the saved object is static graph variable, you can specify ``use_binary_for_var``.
           If True, save the file in the c++ binary format when saving a single static graph variable; otherwise, save it in pickle format.
           Default: False
+          use_stream_format(bool): If True, save the object in the stream format, which consists of a small pickled header and raw bytes
+          of tensors written directly from tensor memory, so that no extra copy of tensors is made. The saved file can be loaded by
+          ``paddle.load`` with ``mmap=True``. Default: False
 
     Returns:
         None
@@ -794,6 +1298,13 @@ def save(obj, path, protocol=4, **configs):
             )
         )
 
+    if not isinstance(config.use_stream_format, bool):
+        raise TypeError(
+            "Type of `use_stream_format` should be bool, but received {}.".format(
+                type(config.use_stream_format)
+            )
+        )
+
     if config.use_binary_format:
         _save_binary_var(obj, path)
     else:
@@ -809,6 +1320,10 @@ def save(obj, path, protocol=4, **configs):
             with _open_file_buffer(path, "wb") as f:
                 f.write(obj.desc.serialize_to_string())
 
+        elif config.use_stream_format:
+            with _open_file_buffer(path, 'wb') as f:
+                _stream_save(obj, f, protocol)
+
         elif _is_state_dict(obj):
             if _non_static_mode():
                 _legacy_save(obj, path, protocol)
@@ -921,6 +1436,13 @@ def load(path, **configs):
             by default.
             (3) return_numpy(bool): If specified as True, return tensor as numpy.ndarray, otherwise return tensor as paddle.Tensor.
             Default False.
+            (4) mmap(bool): If specified as True, memory-map the file saved with ``use_stream_format=True`` instead of reading it,
+            and return tensors on CPU backed by the mapped file. Only supported when ``path`` is a file path. Default False.
+            (5) keys(str|list[str]): The keys of the loaded dict to return. An entry selects the key equal to it and the keys
+            starting with it followed by '.', e.g. 'backbone' selects 'backbone.conv.weight'. For the file saved with
+            ``use_stream_format=True``, only the tensors of the selected keys are read. Default None, which means all keys.
+            (6) lazy(bool): If specified as True, return a read-only mapping of the dict saved with ``use_stream_format=True``,
+            which reads only the header of file first and reads the tensors of a key on the first access. Default False.
 
     Returns:
         Object(Object): a target object can be used in paddle
@@ -1041,8 +1563,16 @@ def load(path, **configs):
 
     '''
 
+    config = _parse_load_config(configs)
     if _is_memory_buffer(path) or os.path.isfile(path):
-        config = _parse_load_config(configs)
+        if _is_stream_file(path):
+            return _stream_load(
+                path, config.return_numpy, config.mmap, config.keys, config.lazy
+            )
+        if config.mmap or config.lazy:
+            raise ValueError(
+                "`mmap` and `lazy` are only supported for loading the file saved with `use_stream_format=True`."
+            )
         exception_type = pickle.UnpicklingError
         try:
             with _open_file_buffer(path, 'rb') as f:
@@ -1115,6 +1645,8 @@ def load(path, **configs):
     else:
         load_result = _legacy_load(path, **configs)
 
+    if config.keys is not None:
+        load_result = _select_state_dict(load_result, config.keys)
     return load_result
 
 
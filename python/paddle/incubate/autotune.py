@@ -39,10 +39,15 @@ def set_config(config=None):
 
     - enable(bool): Whether to enable layout tuning.
 
-    3. dataloader: When it is enabled, the best num_workers will be selected to replace
-    the origin dataloader setting. Tuning parameters are as follows:
+    3. dataloader: When it is enabled, the best num_workers, prefetch_factor,
+    use_shared_memory and the columnar reading strategy will be selected to replace
+    the origin dataloader setting, the result can be got by the ``autotune_report``
+    attribute of DataLoader. Tuning parameters are as follows:
 
     - enable(bool): Whether to enable dataloader tuning.
+    - tuning_steps(int): The number of batches to evaluate each setting. Default: 500.
+    - online_tuning(bool): Whether to keep tuning prefetch_factor in training by the
+      blocking queue depth and the time waiting for data. Default: False.
 
     Args:
         config (dict|str|None, optional): Configuration for auto-tuning. If it is a
@@ -69,6 +74,7 @@ def set_config(config=None):
                 },
                 "dataloader": {
                     "enable": True,
+                    "online_tuning": True,
                 }
             }
             paddle.incubate.autotune.set_config(config)
@@ -144,14 +150,31 @@ def set_config(config=None):
                     "The auto-tuning configuration of the dataloader is incorrect."
                     "The `enable` should be bool. Use default parameter instead."
                 )
+        online_tuning = False
+        if "online_tuning" in dataloader_config:
+            if isinstance(dataloader_config['online_tuning'], bool):
+                online_tuning = dataloader_config['online_tuning']
+            else:
+                warnings.warn(
+                    "The auto-tuning configuration of the dataloader is incorrect."
+                    "The `online_tuning` should be bool. Use default parameter instead."
+                )
         if "tuning_steps" in dataloader_config:
             if isinstance(dataloader_config['tuning_steps'], int):
                 paddle.fluid.reader.set_autotune_config(
-                    use_autoune, dataloader_config['tuning_steps']
+                    use_autoune,
+                    dataloader_config['tuning_steps'],
+                    online_tuning=online_tuning,
                 )
             else:
                 warnings.warn(
                     "The auto-tuning configuration of the dataloader is incorrect."
                     "The `tuning_steps` should be int. Use default parameter instead."
                 )
-                paddle.fluid.reader.set_autotune_config(use_autoune)
+                paddle.fluid.reader.set_autotune_config(
+                    use_autoune, online_tuning=online_tuning
+                )
+        else:
+            paddle.fluid.reader.set_autotune_config(
+                use_autoune, online_tuning=online_tuning
+            )
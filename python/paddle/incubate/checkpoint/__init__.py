@@ -13,5 +13,7 @@
 # limitations under the License.
 
 from ...fluid.incubate.checkpoint import auto_checkpoint  # noqa: F401
+from .async_checkpoint import AsyncCheckpointSaver  # noqa: F401
+from .async_checkpoint import load_checkpoint  # noqa: F401
 
-__all__ = []
+__all__ = ['AsyncCheckpointSaver', 'load_checkpoint']
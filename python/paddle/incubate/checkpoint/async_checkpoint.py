@@ -0,0 +1,400 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import copy
+import json
+import os
+import threading
+import concurrent.futures
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from paddle.fluid import core
+from paddle.framework.io import (
+    _STREAM_LOD_TENSOR,
+    _STREAM_TENSOR,
+    _StreamReader,
+    _select_keys,
+    _stream_array_to_tensor,
+    _stream_dense_tensor,
+    _stream_ref_indices,
+    _stream_save,
+    _stream_zero_copy,
+)
+
+__all__ = []
+
+INDEX_FILE_NAME = 'index.json'
+_SHARD_FILE_NAME = 'shard-{:05d}-of-{:05d}.pdshard'
+_INDEX_FORMAT_VERSION = 1
+
+
+def _snapshot(obj):
+    """
+    Copies tensors and ndarrays in `obj` to host memory, so that the
+    snapshot is not changed by the following training steps.
+    """
+    if isinstance(obj, (core.VarBase, core.eager.Tensor)):
+        return _stream_array_to_tensor(
+            {'kind': _STREAM_TENSOR, 'name': obj.name}, obj.numpy(), False, True
+        )
+    if isinstance(obj, core.LoDTensor):
+        return _stream_array_to_tensor(
+            {'kind': _STREAM_LOD_TENSOR, 'lod': obj.lod()},
+            np.array(obj),
+            False,
+            True,
+        )
+    if isinstance(obj, np.ndarray):
+        return obj.copy()
+    if type(obj) in (dict, collections.OrderedDict):
+        return type(obj)((key, _snapshot(value)) for key, value in obj.items())
+    if type(obj) in (list, tuple):
+        return type(obj)(_snapshot(value) for value in obj)
+    return copy.deepcopy(obj)
+
+
+def _snapshot_nbytes(obj):
+    if isinstance(obj, (core.VarBase, core.eager.Tensor, core.LoDTensor)):
+        return np.asarray(_stream_dense_tensor(obj)).nbytes
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(_snapshot_nbytes(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(_snapshot_nbytes(value) for value in obj)
+    return 0
+
+
+def _partition(sizes, num_shards):
+    """
+    Assigns each key to a shard, the largest first to the least loaded
+    shard, so that shards have nearly equal sizes.
+    """
+    loads = [0] * num_shards
+    shards = {}
+    for key in sorted(sizes, key=lambda k: sizes[k], reverse=True):
+        shard = loads.index(min(loads))
+        shards[key] = shard
+        loads[shard] += sizes[key]
+    return shards
+
+
+def _write_file(path, write_func):
+    # NOTE: write to a temporary file and rename it, so that a crash never
+    #       leaves a partial file
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            write_func(f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class AsyncCheckpointSaver:
+    """
+    Saves state dicts asynchronously. :code:`save` copies the tensors of a
+    state dict to host memory and returns immediately, then the background
+    threads write the snapshot to :attr:`num_shards` shard files and an
+    index file ``index.json`` in the checkpoint directory. The index file
+    is written after all shard files, so a checkpoint with index file is
+    always complete. The checkpoint is loaded by :code:`load_checkpoint`.
+
+    Args:
+        num_shards(int, optional): The number of shard files of each
+            checkpoint. Default: 4.
+        max_workers(int, optional): The number of background writing
+            threads. Default: None, which means :attr:`num_shards`.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+            from paddle.incubate.checkpoint import (
+                AsyncCheckpointSaver,
+                load_checkpoint,
+            )
+
+            linear = paddle.nn.Linear(10, 10)
+            saver = AsyncCheckpointSaver(num_shards=2)
+            # returns once the state dict is copied to host memory
+            future = saver.save(linear.state_dict(), 'checkpoint/step_0')
+            # training goes on while the checkpoint is written
+            future.result()
+            saver.close()
+
+            state_dict = load_checkpoint('checkpoint/step_0', keys=['weight'])
+    """
+
+    def __init__(self, num_shards=4, max_workers=None):
+        assert (
+            isinstance(num_shards, int) and num_shards > 0
+        ), "num_shards should be a positive integer, but got {}".format(
+            num_shards
+        )
+        self._num_shards = num_shards
+        self._pool = ThreadPoolExecutor(max_workers or num_shards)
+        self._lock = threading.Lock()
+        # checkpoint path -> Future of the latest save, successful saves
+        # are removed once done, failed ones are kept for `wait` to raise
+        self._pending = {}
+
+    def save(self, state_dict, path, protocol=4):
+        """
+        Snapshots :attr:`state_dict` to host memory and writes it to the
+        directory :attr:`path` in background.
+
+        Args:
+            state_dict(dict): The state dict to be saved, whose values are
+                Tensors, numpy.ndarrays or picklable objects.
+            path(str): The checkpoint directory.
+            protocol(int, optional): The protocol version of pickle module.
+                Default: 4
+
+        Returns:
+            concurrent.futures.Future: The future completed after the
+            checkpoint is written, or raising the error of writing.
+        """
+        if not isinstance(state_dict, dict):
+            raise TypeError(
+                "`AsyncCheckpointSaver.save` expected dict, but received {}.".format(
+                    type(state_dict)
+                )
+            )
+        for key in state_dict:
+            if not isinstance(key, (str, int)):
+                raise TypeError(
+                    "Keys of the saved state dict should be str or int, but received {}.".format(
+                        type(key)
+                    )
+                )
+        # NOTE: saves to the same path are written in order
+        self._wait_path(path)
+
+        snapshot = _snapshot(state_dict)
+        shards = _partition(
+            {key: _snapshot_nbytes(value) for key, value in snapshot.items()},
+            self._num_shards,
+        )
+        shard_names = [
+            _SHARD_FILE_NAME.format(i, self._num_shards)
+            for i in range(self._num_shards)
+        ]
+        index = {
+            'version': _INDEX_FORMAT_VERSION,
+            'shards': shard_names,
+            'keys': [[key, shards[key]] for key in snapshot],
+        }
+
+        os.makedirs(path, exist_ok=True)
+        # NOTE: remove the index of the old checkpoint first, so that the
+        #       directory is never loaded with shards of different saves
+        index_path = os.path.join(path, INDEX_FILE_NAME)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+        future = Future()
+        remaining = [self._num_shards]
+
+        def on_shard_done(shard_future):
+            with self._lock:
+                if future.done():
+                    return
+                error = shard_future.exception()
+                if error is not None:
+                    future.set_exception(error)
+                    return
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            try:
+                _write_file(
+                    index_path,
+                    lambda f: f.write(json.dumps(index).encode('utf-8')),
+                )
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(path)
+
+        for i, shard_name in enumerate(shard_names):
+            shard = {
+                key: value
+                for key, value in snapshot.items()
+                if shards[key] == i
+            }
+            shard_future = self._pool.submit(
+                _write_file,
+                os.path.join(path, shard_name),
+                lambda f, shard=shard: _stream_save(shard, f, protocol),
+            )
+            shard_future.add_done_callback(on_shard_done)
+
+        def on_done(done_future):
+            # NOTE: errors may be set with self._lock held, the lock is only
+            #       taken for a successful save whose result is set out of it
+            if done_future.exception() is not None:
+                return
+            with self._lock:
+                if self._pending.get(path) is done_future:
+                    del self._pending[path]
+
+        with self._lock:
+            self._pending[path] = future
+        future.add_done_callback(on_done)
+        return future
+
+    def _wait_path(self, path):
+        with self._lock:
+            future = self._pending.get(path)
+        if future is not None:
+            # NOTE: the error of the previous save is raised by `wait`
+            concurrent.futures.wait([future])
+
+    def wait(self):
+        """
+        Waits for all pending saves, and raises the error of writing if
+        any.
+        """
+        with self._lock:
+            futures = list(self._pending.values())
+            self._pending.clear()
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """
+        Waits for all pending saves and stops the background threads.
+        """
+        try:
+            self.wait()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _read_shard(path, keys, mmap):
+    reader = _StreamReader(path, mmap)
+    refs = reader.load_refs()
+    indices = _stream_ref_indices([refs[key] for key in keys])
+    with open(path, 'rb') as f:
+        arrays = {index: reader.load_array(index, f) for index in indices}
+    return reader, arrays
+
+
+def load_checkpoint(
+    path, keys=None, return_numpy=False, mmap=False, max_workers=None
+):
+    """
+    Loads the checkpoint saved by :code:`AsyncCheckpointSaver`. The shard
+    files are read in parallel, and only the shard files and tensors of
+    the requested keys are read.
+
+    Args:
+        path(str): The checkpoint directory.
+        keys(str|list[str], optional): The keys to be loaded. An entry
+            selects the key equal to it and the keys starting with it
+            followed by '.', e.g. 'backbone' selects 'backbone.conv.weight'.
+            Default: None, which means loading all keys.
+        return_numpy(bool, optional): If True, return tensors as
+            numpy.ndarray. Default: False.
+        mmap(bool, optional): If True, memory-map the shard files instead
+            of reading them, and return tensors on CPU backed by the mapped
+            files. Default: False.
+        max_workers(int, optional): The number of reading threads.
+            Default: None, which means the number of shard files to read.
+
+    Returns:
+        dict: The loaded state dict, with keys in the saved order.
+
+    Examples:
+        .. code-block:: python
+
+            import paddle
+            from paddle.incubate.checkpoint import (
+                AsyncCheckpointSaver,
+                load_checkpoint,
+            )
+
+            linear = paddle.nn.Linear(10, 10)
+            with AsyncCheckpointSaver() as saver:
+                saver.save(linear.state_dict(), 'checkpoint/step_0')
+
+            linear.set_state_dict(load_checkpoint('checkpoint/step_0'))
+    """
+    index_path = os.path.join(path, INDEX_FILE_NAME)
+    if not os.path.isfile(index_path):
+        raise ValueError(
+            "The checkpoint {} is not found or not complete.".format(path)
+        )
+    with open(index_path, 'rb') as f:
+        index = json.loads(f.read().decode('utf-8'))
+    if index['version'] > _INDEX_FORMAT_VERSION:
+        raise ValueError(
+            "The checkpoint {} of version {} is not supported.".format(
+                path, index['version']
+            )
+        )
+
+    saved_keys = [key for key, _ in index['keys']]
+    key_shards = dict(index['keys'])
+    keys = saved_keys if keys is None else _select_keys(saved_keys, keys)
+
+    shard_keys = {}
+    for key in keys:
+        shard_keys.setdefault(key_shards[key], []).append(key)
+    if not shard_keys:
+        return {}
+
+    with ThreadPoolExecutor(max_workers or len(shard_keys)) as pool:
+        futures = {
+            shard: pool.submit(
+                _read_shard,
+                os.path.join(path, index['shards'][shard]),
+                shard_key_list,
+                mmap,
+            )
+            for shard, shard_key_list in shard_keys.items()
+        }
+        results = {shard: future.result() for shard, future in futures.items()}
+
+    # NOTE: tensors are created in the main thread, since the dygraph
+    #       mode is not shared by threads
+    zero_copy = _stream_zero_copy(mmap)
+    values = {}
+    for shard, (reader, arrays) in results.items():
+        tensors = {}
+
+        def load_value(index, f):
+            if index not in arrays:
+                return None
+            if index not in tensors:
+                tensors[index] = _stream_array_to_tensor(
+                    reader.metas[index], arrays[index], return_numpy, zero_copy
+                )
+            return tensors[index]
+
+        obj = reader.load(load_value)
+        for key in shard_keys[shard]:
+            values[key] = obj[key]
+    return {key: values[key] for key in keys}
@@ -24,11 +24,15 @@ from ..fluid.dataloader import Sampler  # noqa: F401
 from ..fluid.dataloader import SequenceSampler  # noqa: F401
 from ..fluid.dataloader import RandomSampler  # noqa: F401
 from ..fluid.dataloader import DistributedBatchSampler  # noqa: F401
+from ..fluid.dataloader import BucketedBatchSampler  # noqa: F401
 from ..fluid.dataloader import ComposeDataset  # noqa: F401
 from ..fluid.dataloader import ChainDataset  # noqa: F401
+from ..fluid.dataloader import ShardedFileDataset  # noqa: F401
 from ..fluid.dataloader import WeightedRandomSampler  # noqa: F401
 from ..fluid.dataloader import Subset  # noqa: F401
 from ..fluid.dataloader import random_split  # noqa: F401
+from ..fluid.dataloader import MMapRecordDataset  # noqa: F401
+from ..fluid.dataloader import write_record_dataset  # noqa: F401
 
 __all__ = [  # noqa
     'Dataset',
@@ -36,8 +40,10 @@ __all__ = [  # noqa
     'TensorDataset',
     'ComposeDataset',
     'ChainDataset',
+    'ShardedFileDataset',
     'BatchSampler',
     'DistributedBatchSampler',
+    'BucketedBatchSampler',
     'DataLoader',
     'get_worker_info',
     'Sampler',
@@ -46,4 +52,6 @@ __all__ = [  # noqa
     'WeightedRandomSampler',
     'random_split',
     'Subset',
+    'MMapRecordDataset',
+    'write_record_dataset',
 ]
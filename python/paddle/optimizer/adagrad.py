@@ -14,6 +14,7 @@
 
 from .optimizer import Optimizer
 from ..fluid import framework
+from paddle import _C_ops
 
 __all__ = []
 
@@ -65,6 +66,8 @@ class Adagrad(Optimizer):
             The default value is None.
         initial_accumulator_value (float, optional): Initial value for moment accumulator.
             The default value is 0.0.
+        use_multi_tensor (bool, optional): Whether to use multi-tensor strategy to update all parameters at once. In dygraph mode,
+            the parameters with the same options are fused into flat buffers and updated by one operator. Default is false.
 
     Examples:
         .. code-block:: python
@@ -114,6 +117,7 @@ class Adagrad(Optimizer):
         grad_clip=None,
         name=None,
         initial_accumulator_value=0.0,
+        use_multi_tensor=False,
     ):
         assert learning_rate is not None
         assert epsilon is not None
@@ -131,6 +135,7 @@ class Adagrad(Optimizer):
             'epsilon': epsilon,
             'initial_accumulator_value': initial_accumulator_value,
         }
+        self._use_multi_tensor = use_multi_tensor
 
     def _create_accumulators(self, block, parameters):
         assert isinstance(block, framework.Block)
@@ -170,6 +175,18 @@ class Adagrad(Optimizer):
 
         return adagrad_op
 
+    def _get_multi_tensor_tensors(self, param):
+        fused = {
+            'param': param,
+            'moment': self._get_accumulator(self._moment_acc_str, param),
+        }
+        return fused, {}
+
+    def _append_fused_optimize_op(self, block, group, buffers, grad, lr):
+        _C_ops.adagrad_(
+            buffers['param'], grad, buffers['moment'], lr, self._epsilon
+        )
+
     def _update_param_group(self, parameters):
         self._epsilon = parameters.get('epsilon', self._default_dict['epsilon'])
         self.initial_accumulator_value = parameters.get(
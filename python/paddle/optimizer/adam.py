@@ -21,7 +21,6 @@ from ..fluid import unique_name
 from ..fluid.layer_helper import LayerHelper
 import warnings
 from ..fluid.dygraph import base as imperative_base
-from collections import defaultdict
 
 import paddle
 from paddle import _C_ops, _legacy_C_ops
@@ -512,58 +511,24 @@ class Adam(Optimizer):
                 adam.step()
                 adam.clear_grad()
         """
-        if not isinstance(self._parameter_list[0], dict):
-            params_grads = []
-            for param in self._parameter_list:
-                if param.stop_gradient:
-                    continue
-                if param._grad_ivar() is not None:
-                    grad_var = param._grad_ivar()
+        if self.regularization is not None:
+            for params_grads in self._get_param_index().get_params_grads():
+                for _, grad_var in params_grads:
                     if in_dygraph_mode():
-                        if (
+                        is_sparse = (
                             hasattr(grad_var, "is_selected_rows")
                             and grad_var.is_selected_rows()
-                            and self.regularization is not None
-                        ):
-                            raise RuntimeError(
-                                "Adam don't support weight_decay with sparse parameters, please set it to None."
-                            )
+                        )
                     else:
-                        if (
+                        is_sparse = (
                             hasattr(grad_var, "_is_sparse")
                             and grad_var._is_sparse()
-                            and self.regularization is not None
-                        ):
-                            raise RuntimeError(
-                                "Adam don't support weight_decay with sparse parameters, please set it to None."
-                            )
-                    params_grads.append((param, grad_var))
-
-            optimize_ops = self._apply_optimize(
-                loss=None,
-                startup_program=None,
-                params_grads=params_grads,
-                param_group_idx=0,
-            )
-        else:
-            # optimize parameters in groups
-            for idx, param_group in enumerate(self._param_groups):
-                params_grads = defaultdict(lambda: list())
-                for param in param_group['params']:
-                    if param.stop_gradient:
-                        continue
-                    if param._grad_ivar() is not None:
-                        grad_var = param._grad_ivar()
-                        params_grads['params'].append((param, grad_var))
-                params_grads.update(
-                    {k: v for k, v in param_group.items() if k != 'params'}
-                )
-                self._apply_optimize(
-                    loss=None,
-                    startup_program=None,
-                    params_grads=params_grads,
-                    param_group_idx=idx,
-                )
+                        )
+                    if is_sparse:
+                        raise RuntimeError(
+                            "Adam don't support weight_decay with sparse parameters, please set it to None."
+                        )
+        super().step()
 
     def _multi_tensor_init(self, target_block, parameters, param_group_idx):
         """
@@ -89,6 +89,8 @@ class AdamW(Optimizer):
             different semantics with the original Adam algorithm and may lead to different result.
             The default value is False.
         multi_precision (bool, optional): Whether to use multi-precision during weight updating. Default is false.
+        use_multi_tensor (bool, optional): Whether to use multi-tensor strategy to update all parameters at once. In dygraph mode,
+            the parameters with the same options are fused into flat buffers and updated by one operator. Default is false.
         name (str, optional): Normally there is no need for user to set this property.
             For more information, please refer to :ref:`api_guide_Name`.
             The default value is None.
@@ -161,6 +163,7 @@ class AdamW(Optimizer):
         grad_clip=None,
         lazy_mode=False,
         multi_precision=False,
+        use_multi_tensor=False,
         name=None,
     ):
         assert learning_rate is not None
@@ -279,7 +282,9 @@ class AdamW(Optimizer):
         else:
             self._param_groups = self._parameter_list
 
-        self._use_multi_tensor = None
+        self._use_multi_tensor = use_multi_tensor
+        self._multi_tensor_groups = {}
+        self._param_index = None
         self.regularization = None
         self._auxiliary_vars = {}
 
@@ -613,6 +618,78 @@ class AdamW(Optimizer):
 
         return adamw_op
 
+    def _multi_tensor_group_key(self, param):
+        key = super()._multi_tensor_group_key(param)
+        if key is None:
+            return None
+        with_decay = self._apply_decay_param_fun is None or bool(
+            self._apply_decay_param_fun(param.name)
+        )
+        lr_ratio = 1.0 if self._lr_ratio is None else self._lr_ratio(param)
+        # the beta pows are shared by the group, so they must be equal
+        beta1_pow_acc = self._get_accumulator(self._beta1_pow_acc_str, param)
+        beta2_pow_acc = self._get_accumulator(self._beta2_pow_acc_str, param)
+        return key + (
+            with_decay,
+            lr_ratio,
+            beta1_pow_acc.numpy().item(0),
+            beta2_pow_acc.numpy().item(0),
+        )
+
+    def _get_multi_tensor_tensors(self, param):
+        fused = {
+            'param': param,
+            'moment1': self._get_accumulator(self._moment1_acc_str, param),
+            'moment2': self._get_accumulator(self._moment2_acc_str, param),
+        }
+        if self._multi_precision and self._is_dtype_fp16_or_bf16(param.dtype):
+            fused['master_weight'] = self._master_weights[param.name]
+        shared = {
+            'beta1_pow': self._get_accumulator(self._beta1_pow_acc_str, param),
+            'beta2_pow': self._get_accumulator(self._beta2_pow_acc_str, param),
+        }
+        return fused, shared
+
+    def _append_fused_optimize_op(self, block, group, buffers, grad, lr):
+        param = group.params[0]
+        with_decay = self._apply_decay_param_fun is None or bool(
+            self._apply_decay_param_fun(param.name)
+        )
+        lr_ratio_ = 1.0 if self._lr_ratio is None else self._lr_ratio(param)
+        _beta1 = (
+            self._beta1
+            if not isinstance(self._beta1, Variable)
+            else self._beta1.numpy().item(0)
+        )
+        _beta2 = (
+            self._beta2
+            if not isinstance(self._beta2, Variable)
+            else self._beta2.numpy().item(0)
+        )
+        master_weight = buffers.get('master_weight')
+        found_inf = self._get_auxiliary_var('found_inf')
+        _C_ops.adamw_(
+            buffers['param'],
+            grad,
+            lr,
+            buffers['moment1'],
+            buffers['moment2'],
+            buffers['beta1_pow'],
+            buffers['beta2_pow'],
+            master_weight,
+            found_inf,
+            _beta1,
+            _beta2,
+            self._epsilon,
+            lr_ratio_,
+            self._weight_decay,
+            with_decay,
+            self._lazy_mode,
+            1000,
+            master_weight is not None,
+            False,
+        )
+
     def __str__(self):
         return " ".join(["Weight Decay, params:", ",".join(self._params_name)])
 
@@ -640,70 +717,24 @@ class AdamW(Optimizer):
                 opt.step()
                 opt.clear_grad()
         """
-        if not isinstance(self._parameter_list[0], dict):
-            params_grads = []
-            for param in self._parameter_list:
-                if param.stop_gradient:
-                    continue
-                if param._grad_ivar() is not None:
-                    grad_var = param._grad_ivar()
+        if self.regularization is not None:
+            for params_grads in self._get_param_index().get_params_grads():
+                for _, grad_var in params_grads:
                     if framework.in_dygraph_mode():
-                        if (
+                        is_sparse = (
                             hasattr(grad_var, "is_selected_rows")
                             and grad_var.is_selected_rows()
-                            and self.regularization is not None
-                        ):
-                            raise RuntimeError(
-                                "AdamW don't support weight_decay with sparse parameters, please set it to None."
-                            )
+                        )
                     else:
-                        if (
+                        is_sparse = (
                             hasattr(grad_var, "_is_sparse")
                             and grad_var._is_sparse()
-                            and self.regularization is not None
-                        ):
-                            raise RuntimeError(
-                                "AdamW don't support weight_decay with sparse parameters, please set it to None."
-                            )
-                    params_grads.append((param, grad_var))
-
-            optimize_ops = self._apply_optimize(
-                loss=None, startup_program=None, params_grads=params_grads
-            )
-        else:
-            # optimize parameters in groups
-            for param_group in self._param_groups:
-                params_grads = defaultdict(lambda: list())
-                for param in param_group['params']:
-                    if param.stop_gradient:
-                        continue
-                    if param._grad_ivar() is not None:
-                        grad_var = param._grad_ivar()
-                        if framework.in_dygraph_mode():
-                            if (
-                                hasattr(grad_var, "is_selected_rows")
-                                and grad_var.is_selected_rows()
-                                and self.regularization is not None
-                            ):
-                                raise RuntimeError(
-                                    "AdamW don't support weight_decay with sparse parameters, please set it to None."
-                                )
-                        else:
-                            if (
-                                hasattr(grad_var, "_is_sparse")
-                                and grad_var._is_sparse()
-                                and self.regularization is not None
-                            ):
-                                raise RuntimeError(
-                                    "AdamW don't support weight_decay with sparse parameters, please set it to None."
-                                )
-                        params_grads['params'].append((param, grad_var))
-                params_grads.update(
-                    {k: v for k, v in param_group.items() if k != 'params'}
-                )
-                self._apply_optimize(
-                    loss=None, startup_program=None, params_grads=params_grads
-                )
+                        )
+                    if is_sparse:
+                        raise RuntimeError(
+                            "AdamW don't support weight_decay with sparse parameters, please set it to None."
+                        )
+        super().step()
 
     def _update_param_group(self, parameters):
         self._beta1 = parameters.get('beta1', self._default_dict['beta1'])
@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+
+import paddle
 from .optimizer import Optimizer
 from ..fluid import core
 from ..fluid import framework
@@ -74,6 +77,8 @@ class Lamb(Optimizer):
             ( :ref:`api_paddle_fluid_clip_ClipGradByGlobalNorm` , :ref:`api_paddle_fluid_clip_ClipGradByNorm` ,
             :ref:`api_paddle_fluid_clip_ClipGradByValue` ). If you want better convergence, it is recommended
             to use :ref:`api_paddle_fluid_clip_ClipGradByGlobalNorm` . Default None, meaning there is no gradient clipping.
+        use_multi_tensor (bool, optional): Whether to use multi-tensor strategy to update all parameters at once. In dygraph mode,
+            the parameters with the same options are fused into flat buffers and updated together. Default is false.
         name(str|None): For detailed information, please refer to
             :ref:`api_guide_Name` . Usually name is no need to set and None by default.
     Examples:
@@ -109,6 +114,7 @@ class Lamb(Optimizer):
         grad_clip=None,
         exclude_from_weight_decay_fn=None,
         multi_precision=False,
+        use_multi_tensor=False,
         name=None,
     ):
         assert learning_rate is not None
@@ -139,6 +145,7 @@ class Lamb(Optimizer):
         self._used_master_weights = {}
         # TODO(zengjinle): expose API as soon as possible
         self._multi_precision = multi_precision
+        self._use_multi_tensor = use_multi_tensor
 
     def _get_parameter(self, name, scope=None):
         if scope is None:
@@ -385,6 +392,128 @@ class Lamb(Optimizer):
 
         return lamb_op
 
+    def _multi_tensor_group_key(self, param):
+        key = super()._multi_tensor_group_key(param)
+        if key is None:
+            return None
+        if (
+            param.dtype == core.VarDesc.VarType.FP16
+            and not self._multi_precision
+        ):
+            return None
+        with_decay = self._exclude_from_weight_decay_fn is None or not (
+            self._exclude_from_weight_decay_fn(param)
+        )
+        # the beta pows are shared by the group, so they must be equal
+        beta1_pow_acc = self._get_accumulator(self._beta1_pow_acc_str, param)
+        beta2_pow_acc = self._get_accumulator(self._beta2_pow_acc_str, param)
+        return key + (
+            with_decay,
+            beta1_pow_acc.numpy().item(0),
+            beta2_pow_acc.numpy().item(0),
+        )
+
+    def _get_multi_tensor_tensors(self, param):
+        fused = {
+            'param': param,
+            'moment1': self._get_accumulator(self._moment1_acc_str, param),
+            'moment2': self._get_accumulator(self._moment2_acc_str, param),
+        }
+        if self._multi_precision and param.dtype == core.VarDesc.VarType.FP16:
+            fused['master_weight'] = self._master_weights[param.name]
+        shared = {
+            'beta1_pow': self._get_accumulator(self._beta1_pow_acc_str, param),
+            'beta2_pow': self._get_accumulator(self._beta2_pow_acc_str, param),
+        }
+        return fused, shared
+
+    def _append_fused_optimize_op(self, block, group, buffers, grad, lr):
+        # NOTE: The trust ratio of lamb is computed per parameter, there is no
+        #       kernel for fused parameters. So the update is composed of
+        #       elementwise operators, with the norms of the parameters
+        #       reduced by segment_pool over the fused buffers.
+        found_inf = self._get_auxiliary_var('found_inf')
+        if found_inf is not None and found_inf.place.is_cpu_place():
+            if found_inf.numpy().item(0):
+                return
+            found_inf = None
+
+        if (
+            self._exclude_from_weight_decay_fn is not None
+            and self._exclude_from_weight_decay_fn(group.params[0])
+        ):
+            weight_decay = 0.0
+        else:
+            weight_decay = self._lamb_weight_decay
+
+        master_weight = buffers.get('master_weight')
+        param = buffers['param'] if master_weight is None else master_weight
+        if grad.dtype != param.dtype:
+            grad = paddle.cast(grad, param.dtype)
+        if group.segment_ids is None:
+            numels = [p._numel() for p in group.params]
+            group.segment_ids = paddle.to_tensor(
+                np.repeat(np.arange(len(numels), dtype='int32'), numels),
+                place=param.place,
+            )
+        segment_ids = group.segment_ids
+        beta1_pow = buffers['beta1_pow']
+        beta2_pow = buffers['beta2_pow']
+        beta_pows_on_cpu = beta1_pow.place.is_cpu_place()
+        if beta_pows_on_cpu:
+            beta1_pow = beta1_pow.numpy().item(0)
+            beta2_pow = beta2_pow.numpy().item(0)
+
+        moment1 = buffers['moment1'] * self._beta1 + grad * (1 - self._beta1)
+        moment2 = buffers['moment2'] * self._beta2 + grad * grad * (
+            1 - self._beta2
+        )
+        denom = paddle.sqrt(moment2 / (1 - beta2_pow)) + self._epsilon
+        trust_ratio_div = moment1 / (1 - beta1_pow) / denom
+        trust_ratio_div = trust_ratio_div + weight_decay * param
+        param_norm = paddle.sqrt(
+            _C_ops.segment_pool(param * param, segment_ids, "SUM")[0]
+        )
+        trust_ratio_div_norm = paddle.sqrt(
+            _C_ops.segment_pool(
+                trust_ratio_div * trust_ratio_div, segment_ids, "SUM"
+            )[0]
+        )
+        ratio = paddle.where(
+            paddle.logical_and(param_norm > 0, trust_ratio_div_norm > 0),
+            param_norm / trust_ratio_div_norm,
+            paddle.ones_like(param_norm),
+        )
+        ratio = paddle.gather(ratio, segment_ids)
+        param_out = param - lr * ratio * trust_ratio_div
+        if found_inf is not None:
+            # mask the update on device, as the lamb kernel does, and the
+            # beta pows on cpu are updated anyway
+            skip_update = paddle.expand(found_inf, param.shape)
+            moment1 = _C_ops.where(skip_update, buffers['moment1'], moment1)
+            moment2 = _C_ops.where(skip_update, buffers['moment2'], moment2)
+            param_out = _C_ops.where(skip_update, param, param_out)
+
+        paddle.assign(moment1, buffers['moment1'])
+        paddle.assign(moment2, buffers['moment2'])
+        if master_weight is not None:
+            paddle.assign(param_out, master_weight)
+            param_out = paddle.cast(param_out, buffers['param'].dtype)
+        paddle.assign(param_out, buffers['param'])
+        if found_inf is not None and not beta_pows_on_cpu:
+            for name, beta in (
+                ('beta1_pow', self._beta1),
+                ('beta2_pow', self._beta2),
+            ):
+                beta_pow = buffers[name]
+                paddle.assign(
+                    _C_ops.where(found_inf, beta_pow, beta_pow * beta),
+                    beta_pow,
+                )
+        else:
+            _C_ops.scale_(buffers['beta1_pow'], self._beta1, 0.0, True)
+            _C_ops.scale_(buffers['beta2_pow'], self._beta2, 0.0, True)
+
     def _update_param_group(self, parameters):
         self._beta1 = parameters.get('beta1', self._default_dict['beta1'])
         self._beta2 = parameters.get('beta2', self._default_dict['beta2'])
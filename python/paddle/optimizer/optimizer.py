@@ -98,6 +98,128 @@ def append_backward_new(
     return params_and_grads
 
 
+class _FusedTensors:
+    """
+    Tensors aliased into one flat buffer, so that an elementwise update of
+    all of them takes a single kernel launch.
+    """
+
+    def __init__(self, tensors):
+        self._tensors = tensors
+        self._buffer = None
+
+    def fuse(self):
+        # NOTE: The tensors are fused again if any of them is given a new
+        #       allocation, e.g. by `set_value` with another place.
+        if self._buffer is None or not all(
+            t._is_shared_buffer_with(self._buffer) for t in self._tensors
+        ):
+            dtype = self._tensors[0].dtype
+            self._buffer = framework._varbase_creator(dtype=dtype)
+            _legacy_C_ops.coalesce_tensor(
+                self._tensors,
+                self._tensors,
+                self._buffer,
+                "copy_data",
+                True,
+                "use_align",
+                False,
+                "dtype",
+                dtype,
+            )
+        return self._buffer
+
+
+class _MultiTensorGroup:
+    """
+    Parameters updated by one fused optimize operator. The elementwise
+    tensors of the group are fused into flat buffers, and the tensors with
+    shape [1] (e.g. beta pows) share the storage of the first parameter's.
+    """
+
+    def __init__(self, params, get_tensors):
+        self.params = params
+        self.segment_ids = None
+        fused = defaultdict(list)
+        self._shared = defaultdict(list)
+        for param in params:
+            fused_tensors, shared_tensors = get_tensors(param)
+            for name, tensor in fused_tensors.items():
+                fused[name].append(tensor)
+            for name, tensor in shared_tensors.items():
+                self._shared[name].append(tensor)
+        self._fused = {
+            name: _FusedTensors(tensors) for name, tensors in fused.items()
+        }
+
+    def fuse(self):
+        buffers = {name: fused.fuse() for name, fused in self._fused.items()}
+        for name, tensors in self._shared.items():
+            for tensor in tensors[1:]:
+                if not tensor._is_shared_buffer_with(tensors[0]):
+                    tensors[0]._share_buffer_to(tensor)
+            buffers[name] = tensors[0]
+        return buffers
+
+    def release(self):
+        # give back every shared tensor its own storage
+        for tensors in self._shared.values():
+            for tensor in tensors[1:]:
+                tensor.clone()._share_buffer_to(tensor)
+
+
+class _ParamIndex:
+    """
+    Flat index of the parameters of an optimizer, rebuilt only when its
+    parameter groups change. In eager mode, the gradients of all parameters
+    are fetched by one call, which also skips the parameters with
+    stop_gradient, so changing stop_gradient does not need a rebuild.
+    """
+
+    def __init__(self, param_groups):
+        self.signature = _ParamIndex.get_signature(param_groups)
+        self.params = []
+        self._bounds = []
+        if param_groups and isinstance(param_groups[0], dict):
+            groups = [param_group['params'] for param_group in param_groups]
+        else:
+            groups = [param_groups or []]
+        for params in groups:
+            start = len(self.params)
+            self.params.extend(params)
+            self._bounds.append((start, len(self.params)))
+
+    @staticmethod
+    def get_signature(param_groups):
+        if param_groups and isinstance(param_groups[0], dict):
+            return tuple(
+                (id(param_group['params']), len(param_group['params']))
+                for param_group in param_groups
+            )
+        return (id(param_groups), len(param_groups or []))
+
+    def get_params_grads(self):
+        """
+        Returns the list of (param, grad) pairs of each group, without the
+        parameters which are stop_gradient or have no gradient.
+        """
+        if in_dygraph_mode():
+            grads = core.eager.get_all_grads(self.params)
+        else:
+            grads = [
+                None if param.stop_gradient else param._grad_ivar()
+                for param in self.params
+            ]
+        return [
+            [
+                (param, grad)
+                for param, grad in zip(self.params[start:end], grads[start:end])
+                if grad is not None
+            ]
+            for start, end in self._bounds
+        ]
+
+
 class Optimizer:
     r"""Optimizer Base class.
 
@@ -281,9 +403,14 @@ class Optimizer:
 
         # NOTE: Multi Tensor: Pass in all parameters and gradients to the op kernel of the Optimizer at one time for updating for dygraph mode.
         # Optimizer support list: [ paddle.optimizer.Momentum, paddle.optimizer.Adam].
+        # [ paddle.optimizer.AdamW, paddle.optimizer.Lamb, paddle.optimizer.RMSProp, paddle.optimizer.Adagrad ]
+        # have no merged kernel, their parameters are fused into flat buffers in eager mode.
         self._use_multi_tensor = None
 
         self._param_dict = self._create_multi_tensor_dict()
+        # param_group_idx -> (params, fused groups, params not fused)
+        self._multi_tensor_groups = {}
+        self._param_index = None
         self._auxiliary_vars = {}
 
     def _set_auxiliary_var(self, key, val):
@@ -369,6 +496,10 @@ class Optimizer:
         if isinstance(self._learning_rate, LRScheduler):
             self._learning_rate.set_state_dict(state_dict["LR_Scheduler"])
 
+        # NOTE: the loaded beta pows and master weights may differ between
+        #       the parameters of a fused group, so the groups are rebuilt.
+        self._release_multi_tensor_groups()
+
         # NOTE: exclude learning rate scheduler's state from
         # _accumulators_holder.
         state_dict = state_dict.copy()
@@ -908,6 +1039,17 @@ class Optimizer:
                             parameters_and_grads,
                             param_group_idx=param_group_idx,
                         )
+        elif (
+            self._use_multi_tensor
+            and self.__class__.__name__
+            in ['AdamW', 'Lamb', 'RMSProp', 'Adagrad']
+            and in_dygraph_mode()
+        ):
+            self._append_optimize_fused_multi_tensor_op(
+                target_block,
+                parameters_and_grads,
+                param_group_idx=param_group_idx,
+            )
         else:
             if not framework._non_static_mode():
                 params_grads_device_map = (
@@ -1432,35 +1574,22 @@ class Optimizer:
                 adam.clear_grad()
         """
 
+        params_grads_list = self._get_param_index().get_params_grads()
         if not isinstance(self._param_groups[0], dict):
-            params_grads = []
-            for param in self._param_groups:
-                if param.stop_gradient:
-                    continue
-                if param._grad_ivar() is not None:
-                    grad_var = param._grad_ivar()
-                    params_grads.append((param, grad_var))
-
             self._apply_optimize(
                 loss=None,
                 startup_program=None,
-                params_grads=params_grads,
+                params_grads=params_grads_list[0],
                 param_group_idx=0,
             )
 
         else:
             # optimize parameters in groups
             for idx, param_group in enumerate(self._param_groups):
-                params_grads = defaultdict(lambda: list())
-                for param in param_group['params']:
-                    if param.stop_gradient:
-                        continue
-                    if param._grad_ivar() is not None:
-                        grad_var = param._grad_ivar()
-                        params_grads['params'].append((param, grad_var))
-                params_grads.update(
-                    {k: v for k, v in param_group.items() if k != 'params'}
-                )
+                params_grads = {
+                    k: v for k, v in param_group.items() if k != 'params'
+                }
+                params_grads['params'] = params_grads_list[idx]
                 self._apply_optimize(
                     loss=None,
                     startup_program=None,
@@ -1468,6 +1597,20 @@ class Optimizer:
                     param_group_idx=idx,
                 )
 
+    def _get_param_index(self):
+        """
+        Get the index of the parameters, shared by step, the gradient clipping
+        and the unscaling of AmpScaler. It is rebuilt when the parameter groups
+        change.
+        """
+        signature = _ParamIndex.get_signature(self._param_groups)
+        if (
+            self._param_index is None
+            or self._param_index.signature != signature
+        ):
+            self._param_index = _ParamIndex(self._param_groups)
+        return self._param_index
+
     def _add_param_group(self, param_group):
         """
         Add a param group to parameter_list.
@@ -1545,6 +1688,154 @@ class Optimizer:
         """
         pass
 
+    def _multi_tensor_group_key(self, param):
+        """
+        Parameters with the same key are fused and updated by one optimize operator.
+        Returns None if the parameter can not be fused. The subclasses supporting
+        fused multi tensor extend the key with their per parameter options.
+
+        Args:
+            param: parameter tensor for the optimizer
+        """
+        param_lr = 1.0
+        if hasattr(param, 'optimize_attr'):
+            param_lr = param.optimize_attr['learning_rate']
+        if isinstance(param_lr, Variable):
+            return None
+        if param.dtype == core.VarDesc.VarType.BF16 or (
+            param.dtype == core.VarDesc.VarType.FP16
+            and param.place.is_cpu_place()
+        ):
+            # coalesce_tensor supports float16 on devices only
+            return None
+        return (str(param.place), param.dtype, param_lr)
+
+    def _get_multi_tensor_tensors(self, param):
+        """
+        Returns the tensors of ``param`` updated by the fused optimize operator,
+        as a dict of the elementwise ones (including ``param`` itself) and a dict
+        of the ones with shape [1]. This function will be overridden in the
+        corresponding optimizer file.
+
+        Args:
+            param: parameter tensor for the optimizer
+        """
+        return {'param': param}, {}
+
+    def _append_fused_optimize_op(self, block, group, buffers, grad, lr):
+        """
+        Update all parameters of a ``_MultiTensorGroup`` at once. ``buffers``
+        contains the fused tensors returned by ``_get_multi_tensor_tensors``,
+        and ``grad`` is the fused gradient. This function will be overridden
+        in the corresponding optimizer file.
+        """
+        raise NotImplementedError()
+
+    def _release_multi_tensor_groups(self):
+        for _, groups, _ in self._multi_tensor_groups.values():
+            for group in groups:
+                group.release()
+        self._multi_tensor_groups = {}
+
+    @framework.dygraph_only
+    def _append_optimize_fused_multi_tensor_op(
+        self, target_block, parameters_and_grads, param_group_idx
+    ):
+        """
+        For Multi Tensor of optimizers without merged operator, group the parameters by
+        ``_multi_tensor_group_key`` and update each group with one fused optimize operator.
+        """
+        if isinstance(parameters_and_grads, list):
+            params_grads = parameters_and_grads
+        else:
+            self._update_param_group(parameters_and_grads)
+            params_grads = parameters_and_grads['params']
+        params_grads = [
+            (param, grad)
+            for param, grad in params_grads
+            if grad is not None and not param.stop_gradient
+        ]
+        params = [param for param, _ in params_grads]
+        grads = {id(param): grad for param, grad in params_grads}
+        sparse_ids = {
+            id(param) for param, grad in params_grads if grad.is_selected_rows()
+        }
+
+        cached = self._multi_tensor_groups.get(param_group_idx)
+        if (
+            cached is None
+            or len(cached[0]) != len(params)
+            or any(p is not q for p, q in zip(cached[0], params))
+            or any(
+                id(param) in sparse_ids
+                for group in cached[1]
+                for param in group.params
+            )
+        ):
+            # NOTE: The groups are rebuilt when the parameters with gradient
+            #       change, so that the shared beta pows are only updated
+            #       together with the parameters of their group.
+            if cached is not None:
+                for group in cached[1]:
+                    group.release()
+            self._create_accumulators(target_block, params)
+            params_by_key = {}
+            for param in params:
+                key = (
+                    None
+                    if id(param) in sparse_ids
+                    else self._multi_tensor_group_key(param)
+                )
+                params_by_key.setdefault(key, []).append(param)
+            groups = []
+            unfused_params = []
+            for key, group_params in params_by_key.items():
+                if key is None or len(group_params) == 1:
+                    unfused_params.extend(group_params)
+                else:
+                    groups.append(
+                        _MultiTensorGroup(
+                            group_params, self._get_multi_tensor_tensors
+                        )
+                    )
+            cached = (params, groups, unfused_params)
+            self._multi_tensor_groups[param_group_idx] = cached
+
+        _, groups, unfused_params = cached
+        for group in groups:
+            buffers = group.fuse()
+            group_grads = [grads[id(param)] for param in group.params]
+            _, grad = _C_ops.coalesce_tensor(
+                group_grads,
+                group_grads[0].dtype,
+                True,
+                False,
+                False,
+                0.0,
+                False,
+                -1,
+                -1,
+                [],
+                [],
+            )
+            lr = self._create_param_lr((group.params[0], grad))
+            self._append_fused_optimize_op(
+                target_block, group, buffers, grad, lr
+            )
+
+        for param in unfused_params:
+            param_and_grad = (param, grads[id(param)])
+            if isinstance(parameters_and_grads, list):
+                self._append_optimize_op(target_block, param_and_grad)
+            else:
+                param_grad_dict = {
+                    k: v
+                    for k, v in parameters_and_grads.items()
+                    if k != 'params'
+                }
+                param_grad_dict['params'] = param_and_grad
+                self._append_optimize_op(target_block, param_grad_dict)
+
     def _is_dtype_fp16_or_bf16(self, dtype):
         """
         check the dtype is fp16 or the dtype is bf16
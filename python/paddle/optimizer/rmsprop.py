@@ -14,6 +14,7 @@
 
 from .optimizer import Optimizer
 from ..fluid import framework
+from paddle import _C_ops
 
 __all__ = []
 
@@ -95,6 +96,8 @@ class RMSProp(Optimizer):
           some derived class of ``GradientClipBase`` . There are three cliping strategies
           ( :ref:`api_fluid_clip_GradientClipByGlobalNorm` , :ref:`api_fluid_clip_GradientClipByNorm` ,
           :ref:`api_fluid_clip_GradientClipByValue` ). Default None, meaning there is no gradient clipping.
+        use_multi_tensor (bool, optional): Whether to use multi-tensor strategy to update all parameters at once. In dygraph mode,
+          the parameters with the same options are fused into flat buffers and updated by one operator. Default is false.
         name (str, optional): This parameter is used by developers to print debugging information.
           For details, please refer to :ref:`api_guide_Name`. Default is None.
 
@@ -151,6 +154,7 @@ class RMSProp(Optimizer):
         parameters=None,
         weight_decay=None,
         grad_clip=None,
+        use_multi_tensor=False,
         name=None,
     ):
         if learning_rate is None:
@@ -187,6 +191,7 @@ class RMSProp(Optimizer):
             'momentum': momentum,
             'centered': centered,
         }
+        self._use_multi_tensor = use_multi_tensor
 
     def _create_accumulators(self, block, parameters):
         if not isinstance(block, framework.Block):
@@ -243,6 +248,31 @@ class RMSProp(Optimizer):
 
         return rmsprop_op
 
+    def _get_multi_tensor_tensors(self, param):
+        fused = {
+            'param': param,
+            'momentum': self._get_accumulator(self._momentum_acc_str, param),
+            'mean_square': self._get_accumulator(
+                self._mean_square_acc_str, param
+            ),
+            'mean_grad': self._get_accumulator(self._mean_grad_acc_str, param),
+        }
+        return fused, {}
+
+    def _append_fused_optimize_op(self, block, group, buffers, grad, lr):
+        _C_ops.rmsprop_(
+            buffers['param'],
+            buffers['mean_square'],
+            grad,
+            buffers['momentum'],
+            lr,
+            buffers['mean_grad'],
+            self._epsilon,
+            self._rho,
+            self._momentum,
+            self._centered,
+        )
+
     def _update_param_group(self, parameters):
         self._epsilon = parameters.get('epsilon', self._default_dict['epsilon'])
         self._rho = parameters.get('rho', self._default_dict['rho'])
@@ -20,6 +20,7 @@ from typing import Any, Callable, Iterable, Optional, Union
 from warnings import warn
 import importlib
 import json
+import random
 
 import paddle
 from paddle.fluid.core import (
@@ -33,7 +34,12 @@ from paddle.fluid.core import (
 )
 
 from .utils import RecordEvent, wrap_optimizers
-from .profiler_statistic import StatisticData, _build_table, SortedKeys
+from .profiler_statistic import (
+    StatisticData,
+    IncrementalStatisticData,
+    _build_table,
+    SortedKeys,
+)
 from paddle.profiler import utils
 from .timer import benchmark
 
@@ -207,6 +213,30 @@ def _default_state_scheduler(step: int):
     return ProfilerState.RECORD
 
 
+def _sample_scheduler(scheduler, sample_rate):
+    r"""
+    Wrap a scheduler to record each period of READY and RECORD states with
+    probability sample_rate, the states of a period not sampled are CLOSED.
+    Steps are expected to be scheduled in order.
+    """
+    sample_state = {'in_period': False, 'sampled': True}
+
+    def getScheduleState(step: int) -> ProfilerState:
+        state = scheduler(step)
+        if state == ProfilerState.CLOSED:
+            sample_state['in_period'] = False
+            return state
+        if not sample_state['in_period']:
+            # the first READY or RECORD step of a period
+            sample_state['in_period'] = True
+            sample_state['sampled'] = random.random() < sample_rate
+        if state == ProfilerState.RECORD_AND_RETURN:
+            sample_state['in_period'] = False
+        return state if sample_state['sampled'] else ProfilerState.CLOSED
+
+    return getScheduleState
+
+
 def export_chrome_tracing(
     dir_name: str, worker_name: Optional[str] = None
 ) -> Callable:
@@ -351,6 +381,11 @@ class Profiler:
             be timed and profiled. Default: False.
         record_shapes (bool, optional): If it is True, collect op's input shape information. Default: False.
         profile_memory (bool, optional): If it is True, collect tensor memory allocation and release information. Default: False.
+        incremental_summary (bool, optional): If it is True, the profiling data of each RECORD period is analysed and merged into the statistics
+            once the period ends, and then released, so that the memory and the time of ``summary`` do not grow with the length of profiling.
+            ``export`` has no data in this mode, ``on_trace_ready`` should be used to export the data of each period, and its default value is None. Default: False.
+        sample_rate (float, optional): The probability of recording each period of READY and RECORD states of ``scheduler``, the states of a period not
+            sampled are CLOSED. It can be used with ``incremental_summary`` to keep profiling in long running jobs with low overhead. Default: 1.0.
 
     Examples:
         1. profiling range [2, 5).
@@ -471,7 +506,9 @@ class Profiler:
         profile_memory=False,
         timer_only: Optional[bool] = False,
         emit_nvtx: Optional[bool] = False,
-        custom_device_types: Optional[list] = []
+        custom_device_types: Optional[list] = [],
+        incremental_summary: Optional[bool] = False,
+        sample_rate: Optional[float] = 1.0
     ):
         supported_targets = _get_supported_targets()
         if targets:
@@ -521,11 +558,20 @@ class Profiler:
                 )
         else:
             self.scheduler = _default_state_scheduler
+        assert (
+            0 <= sample_rate <= 1
+        ), "sample_rate should be in [0, 1], but got {}".format(sample_rate)
+        if sample_rate < 1:
+            self.scheduler = _sample_scheduler(self.scheduler, sample_rate)
 
-        if on_trace_ready is None:
+        if on_trace_ready is None and not incremental_summary:
             self.on_trace_ready = export_chrome_tracing('./profiler_log/')
         else:
             self.on_trace_ready = on_trace_ready
+        self.incremental_summary = incremental_summary
+        self._incremental_statistic_data = (
+            IncrementalStatisticData() if incremental_summary else None
+        )
         self.step_num = 0
         self.previous_state = ProfilerState.CLOSED
         self.current_state = self.scheduler(self.step_num)
@@ -634,8 +680,7 @@ class Profiler:
             or self.current_state == ProfilerState.RECORD_AND_RETURN
         ):
             self.profiler_result = self.profiler.stop()
-            if self.on_trace_ready:
-                self.on_trace_ready(self)
+            self._handle_trace_ready()
         utils._is_profiler_used = False
 
     def step(self, num_samples: Optional[int] = None):
@@ -795,8 +840,19 @@ class Profiler:
                 self.profiler_result = self.profiler.stop()
                 self.profiler.prepare()
                 self.profiler.start()
-            if self.on_trace_ready:
-                self.on_trace_ready(self)
+            self._handle_trace_ready()
+
+    def _handle_trace_ready(self):
+        if self.on_trace_ready:
+            self.on_trace_ready(self)
+        if self.incremental_summary:
+            # NOTE: merge the data of the period into statistics, and release
+            #       its node trees
+            self._incremental_statistic_data.add(
+                self.profiler_result.get_data(),
+                self.profiler_result.get_extra_info(),
+            )
+            self.profiler_result = None
 
     def export(self, path="", format="json"):
         r"""
@@ -864,7 +920,19 @@ class Profiler:
         if isinstance(views, SummaryView):
             views = [views]
 
-        if self.profiler_result:
+        if self.incremental_summary:
+            if self._incremental_statistic_data.num_windows > 0:
+                print(
+                    _build_table(
+                        self._incremental_statistic_data,
+                        sorted_by=sorted_by,
+                        op_detail=op_detail,
+                        thread_sep=thread_sep,
+                        time_unit=time_unit,
+                        views=views,
+                    )
+                )
+        elif self.profiler_result:
             statistic_data = StatisticData(
                 self.profiler_result.get_data(),
                 self.profiler_result.get_extra_info(),
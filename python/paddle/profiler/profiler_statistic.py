@@ -17,12 +17,7 @@ import re
 
 from paddle.fluid.core import TracerEventType, TracerMemEventType
 
-from .statistic_helper import (
-    intersection_ranges,
-    merge_ranges,
-    merge_self_ranges,
-    sum_ranges,
-)
+from .statistic_helper import TimeRanges
 
 _AllTracerEventType = [
     TracerEventType.Operator,
@@ -200,20 +195,51 @@ def wrap_tree(nodetrees):
     return node_statistic_tree, newresults
 
 
+def _merge_items(items, other_items):
+    r'''
+    Merge summary items of the same names, items of other_items may be
+    moved into items.
+    '''
+    for name, other_item in other_items.items():
+        if name in items:
+            items[name].merge(other_item)
+        else:
+            items[name] = other_item
+
+
+def _merge_time_item(item, other):
+    item.call += other.call
+    item.cpu_time += other.cpu_time
+    item.max_cpu_time = max(item.max_cpu_time, other.max_cpu_time)
+    item.min_cpu_time = min(item.min_cpu_time, other.min_cpu_time)
+    item.gpu_time += other.gpu_time
+    item.max_gpu_time = max(item.max_gpu_time, other.max_gpu_time)
+    item.min_gpu_time = min(item.min_gpu_time, other.min_gpu_time)
+    item.general_gpu_time += other.general_gpu_time
+    item.max_general_gpu_time = max(
+        item.max_general_gpu_time, other.max_general_gpu_time
+    )
+    item.min_general_gpu_time = min(
+        item.min_general_gpu_time, other.min_general_gpu_time
+    )
+
+
 class TimeRangeSummary:
     r"""
     Analyse time ranges for each TracerEventType, and summarize the time.
     """
 
     def __init__(self):
-        self.CPUTimeRange = collections.defaultdict(list)
+        self.CPUTimeRange = collections.defaultdict(TimeRanges)
         self.GPUTimeRange = collections.defaultdict(
-            lambda: collections.defaultdict(list)
+            lambda: collections.defaultdict(TimeRanges)
         )  # GPU events should be divided into different devices
         self.CPUTimeRangeSum = collections.defaultdict(int)
         self.GPUTimeRangeSum = collections.defaultdict(
             lambda: collections.defaultdict(int)
         )
+        # time of GPU events of all devices merged
+        self.AllGPUTimeRangeSum = collections.defaultdict(int)
         self.call_times = collections.defaultdict(int)
 
     def parse(self, nodetrees):
@@ -221,13 +247,11 @@ class TimeRangeSummary:
         Analysis node trees in profiler result, and get time range for different tracer event type.
         """
         thread2hostnodes = traverse_tree(nodetrees)
+        CPUTimeRange = collections.defaultdict(list)
+        GPUTimeRange = collections.defaultdict(
+            lambda: collections.defaultdict(list)
+        )  # device_id/type
         for threadid, hostnodes in thread2hostnodes.items():
-            CPUTimeRange = collections.defaultdict(list)
-            GPUTimeRange = collections.defaultdict(
-                lambda: collections.defaultdict(
-                    lambda: collections.defaultdict(list)
-                )
-            )  # device_id/type/stream_id
             for hostnode in hostnodes[1:]:  # skip root node
                 CPUTimeRange[hostnode.type].append(
                     (hostnode.start_ns, hostnode.end_ns)
@@ -239,38 +263,48 @@ class TimeRangeSummary:
                     )
                     self.call_times[runtimenode.type] += 1
                     for devicenode in runtimenode.device_node:
-                        GPUTimeRange[devicenode.device_id][devicenode.type][
-                            devicenode.stream_id
+                        GPUTimeRange[devicenode.device_id][
+                            devicenode.type
                         ].append((devicenode.start_ns, devicenode.end_ns))
                         self.call_times[devicenode.type] += 1
 
-            for event_type, time_ranges in CPUTimeRange.items():
-                time_ranges = merge_self_ranges(time_ranges, is_sorted=False)
-                self.CPUTimeRange[event_type] = merge_ranges(
-                    self.CPUTimeRange[event_type], time_ranges, is_sorted=True
-                )
-            for device_id, device_time_ranges in GPUTimeRange.items():
-                for event_type, event_time_ranges in device_time_ranges.items():
-                    for stream_id, time_ranges in event_time_ranges.items():
-                        time_ranges = merge_self_ranges(
-                            time_ranges, is_sorted=False
-                        )
-                        self.GPUTimeRange[device_id][event_type] = merge_ranges(
-                            self.GPUTimeRange[device_id][event_type],
-                            time_ranges,
-                            is_sorted=True,
-                        )
-
-        for event_type, time_ranges in self.CPUTimeRange.items():
-            self.CPUTimeRangeSum[event_type] = sum_ranges(time_ranges)
-        for device_id, device_time_ranges in self.GPUTimeRange.items():
+        # NOTE: ranges of all threads and streams are merged at once
+        for event_type, time_ranges in CPUTimeRange.items():
+            time_ranges = TimeRanges(time_ranges)
+            self.CPUTimeRange[event_type] = time_ranges
+            self.CPUTimeRangeSum[event_type] = time_ranges.sum()
+        all_gpu_time_range = collections.defaultdict(TimeRanges)
+        for device_id, device_time_ranges in GPUTimeRange.items():
             for event_type, time_ranges in device_time_ranges.items():
-                self.GPUTimeRangeSum[device_id][event_type] = sum_ranges(
-                    time_ranges
-                )
+                time_ranges = TimeRanges(time_ranges)
+                self.GPUTimeRange[device_id][event_type] = time_ranges
+                self.GPUTimeRangeSum[device_id][event_type] = time_ranges.sum()
+                all_gpu_time_range[event_type] = all_gpu_time_range[
+                    event_type
+                ].union(time_ranges)
+        for event_type, time_ranges in all_gpu_time_range.items():
+            self.AllGPUTimeRangeSum[event_type] = time_ranges.sum()
+
+    def merge(self, other):
+        r"""
+        Merge the summary of profiling data in another time range, which
+        does not overlap with this one. Only the sums of time ranges are
+        merged, and the time ranges are not kept.
+        """
+        self.CPUTimeRange.clear()
+        self.GPUTimeRange.clear()
+        for event_type, value in other.CPUTimeRangeSum.items():
+            self.CPUTimeRangeSum[event_type] += value
+        for device_id, device_time_sums in other.GPUTimeRangeSum.items():
+            for event_type, value in device_time_sums.items():
+                self.GPUTimeRangeSum[device_id][event_type] += value
+        for event_type, value in other.AllGPUTimeRangeSum.items():
+            self.AllGPUTimeRangeSum[event_type] += value
+        for event_type, value in other.call_times.items():
+            self.call_times[event_type] += value
 
     def get_gpu_devices(self):
-        return self.GPUTimeRange.keys()
+        return self.GPUTimeRangeSum.keys()
 
     def get_gpu_range_sum(self, device_id, event_type):
         return self.GPUTimeRangeSum[device_id][event_type]
@@ -293,6 +327,11 @@ class DistributedSummary:
         self.overlap_range = []
         self.cpu_calls = 0
         self.gpu_calls = 0
+        self.cpu_communication_time = 0
+        self.gpu_communication_time = 0
+        self.communication_time = 0
+        self.computation_time = 0
+        self.overlap_time = 0
 
     def parse(self, nodetrees):
         '''
@@ -345,23 +384,39 @@ class DistributedSummary:
                                     )
         self.cpu_calls = len(set(self.cpu_communication_range))
         self.gpu_calls = len(set(self.gpu_communication_range))
-        self.cpu_communication_range = merge_self_ranges(
-            self.cpu_communication_range, is_sorted=False
-        )
-        self.gpu_communication_range = merge_self_ranges(
-            self.gpu_communication_range, is_sorted=False
+        self.cpu_communication_range = TimeRanges(self.cpu_communication_range)
+        self.gpu_communication_range = TimeRanges(self.gpu_communication_range)
+        self.communication_range = self.cpu_communication_range.union(
+            self.gpu_communication_range
         )
-        self.communication_range = merge_ranges(
-            self.cpu_communication_range,
-            self.gpu_communication_range,
-            is_sorted=True,
-        )
-        self.computation_range = merge_self_ranges(
-            self.computation_range, is_sorted=False
-        )
-        self.overlap_range = intersection_ranges(
-            self.communication_range, self.computation_range, is_sorted=True
+        self.computation_range = TimeRanges(self.computation_range)
+        self.overlap_range = self.communication_range.intersection(
+            self.computation_range
         )
+        self.cpu_communication_time = self.cpu_communication_range.sum()
+        self.gpu_communication_time = self.gpu_communication_range.sum()
+        self.communication_time = self.communication_range.sum()
+        self.computation_time = self.computation_range.sum()
+        self.overlap_time = self.overlap_range.sum()
+
+    def merge(self, other):
+        r"""
+        Merge the summary of profiling data in another time range, which
+        does not overlap with this one. Only the calls and the sums of time
+        ranges are merged, and the time ranges are not kept.
+        """
+        self.cpu_communication_range = TimeRanges()
+        self.gpu_communication_range = TimeRanges()
+        self.communication_range = TimeRanges()
+        self.computation_range = TimeRanges()
+        self.overlap_range = TimeRanges()
+        self.cpu_calls += other.cpu_calls
+        self.gpu_calls += other.gpu_calls
+        self.cpu_communication_time += other.cpu_communication_time
+        self.gpu_communication_time += other.gpu_communication_time
+        self.communication_time += other.communication_time
+        self.computation_time += other.computation_time
+        self.overlap_time += other.overlap_time
 
 
 class EventSummary:
@@ -392,6 +447,12 @@ class EventSummary:
             self.call += 1
             self.add_gpu_time(node.end_ns - node.start_ns)
 
+        def merge(self, other):
+            self.call += other.call
+            self.gpu_time += other.gpu_time
+            self.max_gpu_time = max(self.max_gpu_time, other.max_gpu_time)
+            self.min_gpu_time = min(self.min_gpu_time, other.min_gpu_time)
+
     class OperatorItem:
         def __init__(self, name):
             self.name = name
@@ -464,6 +525,11 @@ class EventSummary:
                         self.devices[name] = EventSummary.DeviceItem(name)
                     self.devices[name].add_item(devicenode)
 
+        def merge(self, other):
+            _merge_time_item(self, other)
+            _merge_items(self.operator_inners, other.operator_inners)
+            _merge_items(self.devices, other.devices)
+
     class GeneralItem:
         def __init__(self, name):
             self.name = name
@@ -520,6 +586,9 @@ class EventSummary:
             self.add_gpu_time(node.gpu_time)
             self.add_general_gpu_time(node.general_gpu_time)
 
+        def merge(self, other):
+            _merge_time_item(self, other)
+
     def __init__(self):
         self.items = {}  # for operator summary
         self.thread_items = collections.defaultdict(
@@ -586,6 +655,24 @@ class EventSummary:
                             self.add_model_perspective_item(child)
                         deque.append(child)
 
+    def merge(self, other):
+        r"""
+        Merge the summary of profiling data in another time range.
+        """
+        _merge_items(self.items, other.items)
+        for thread_id, items in other.thread_items.items():
+            _merge_items(self.thread_items[thread_id], items)
+        _merge_items(self.userdefined_items, other.userdefined_items)
+        for thread_id, items in other.userdefined_thread_items.items():
+            _merge_items(self.userdefined_thread_items[thread_id], items)
+        _merge_items(
+            self.model_perspective_items, other.model_perspective_items
+        )
+        _merge_items(
+            self.memory_manipulation_items, other.memory_manipulation_items
+        )
+        _merge_items(self.kernel_items, other.kernel_items)
+
     def add_operator_item(self, operator_node):
         if operator_node.name not in self.items:
             self.items[operator_node.name] = EventSummary.OperatorItem(
@@ -692,6 +779,13 @@ class MemorySummary:
                 print("No corresponding type.")
             self.increase_size = self.allocation_size - self.free_size
 
+        def merge(self, other):
+            self.allocation_count += other.allocation_count
+            self.free_count += other.free_count
+            self.allocation_size += other.allocation_size
+            self.free_size += other.free_size
+            self.increase_size = self.allocation_size - self.free_size
+
     def __init__(self):
         self.allocated_items = collections.defaultdict(
             dict
@@ -738,6 +832,23 @@ class MemorySummary:
                 self.peak_reserved_values[memnode.place], memnode.peak_reserved
             )
 
+    def merge(self, other):
+        r"""
+        Merge the summary of profiling data in another time range.
+        """
+        for place, items in other.allocated_items.items():
+            _merge_items(self.allocated_items[place], items)
+        for place, items in other.reserved_items.items():
+            _merge_items(self.reserved_items[place], items)
+        for place, value in other.peak_allocation_values.items():
+            self.peak_allocation_values[place] = max(
+                self.peak_allocation_values[place], value
+            )
+        for place, value in other.peak_reserved_values.items():
+            self.peak_reserved_values[place] = max(
+                self.peak_reserved_values[place], value
+            )
+
     def parse(self, nodetrees):
         r"""
         Analyse memory event in the nodetress.
@@ -771,6 +882,50 @@ class StatisticData:
         self.memory_summary.parse(node_trees)
 
 
+class IncrementalStatisticData:
+    r"""
+    Hold analysed results folded from profiling data of multiple time ranges,
+    e.g. RECORD windows of profiler scheduler. Profiling data of each time
+    range is analysed and merged once added, so its node trees can be
+    released, and the memory is bounded by the number of distinct events
+    instead of the number of events.
+
+    Note:
+        Time ranges of events are not kept, so :code:`StatisticData` should
+        be used if time ranges are needed.
+    """
+
+    def __init__(self):
+        self.node_trees = None
+        self.extra_info = {}
+        self.time_range_summary = TimeRangeSummary()
+        self.event_summary = EventSummary()
+        self.distributed_summary = DistributedSummary()
+        self.memory_summary = MemorySummary()
+        self.num_windows = 0
+        # extra info of numbers are averaged over time ranges
+        self._extra_info_sums = collections.defaultdict(float)
+
+    def add(self, node_trees, extra_info):
+        r"""
+        Analyse profiling data of a time range, and merge it into results.
+        """
+        statistic_data = StatisticData(node_trees, extra_info)
+        self.time_range_summary.merge(statistic_data.time_range_summary)
+        self.event_summary.merge(statistic_data.event_summary)
+        self.distributed_summary.merge(statistic_data.distributed_summary)
+        self.memory_summary.merge(statistic_data.memory_summary)
+        self.num_windows += 1
+        for key, value in extra_info.items():
+            try:
+                self._extra_info_sums[key] += float(value)
+                self.extra_info[key] = str(
+                    self._extra_info_sums[key] / self.num_windows
+                )
+            except (TypeError, ValueError):
+                self.extra_info[key] = value
+
+
 def _build_table(
     statistic_data,
     sorted_by=SortedKeys.CPUTotal,
@@ -926,10 +1081,10 @@ def _build_table(
         ) in statistic_data.time_range_summary.CPUTimeRangeSum.items():
             if event_type != TracerEventType.Communication:
                 cpu_type_time[event_type] = value
-        if statistic_data.distributed_summary.cpu_communication_range:
-            cpu_type_time[TracerEventType.Communication] = sum_ranges(
-                statistic_data.distributed_summary.cpu_communication_range
-            )
+        if statistic_data.distributed_summary.cpu_calls:
+            cpu_type_time[
+                TracerEventType.Communication
+            ] = statistic_data.distributed_summary.cpu_communication_time
             cpu_call_times[
                 TracerEventType.Communication
             ] = statistic_data.distributed_summary.cpu_calls
@@ -957,21 +1112,13 @@ def _build_table(
                     event_type_name
                 ].cpu_time
 
-        gpu_time_range = collections.defaultdict(list)
-        for (
-            device_id,
-            device_time_ranges,
-        ) in statistic_data.time_range_summary.GPUTimeRange.items():
-            for event_type, time_range in device_time_ranges.items():
-                gpu_time_range[event_type] = merge_ranges(
-                    gpu_time_range[event_type], time_range, is_sorted=True
-                )
-        for event_type, time_range in gpu_time_range.items():
-            gpu_type_time[event_type] = sum_ranges(time_range)
-        if statistic_data.distributed_summary.gpu_communication_range:
-            gpu_type_time[TracerEventType.Communication] = sum_ranges(
-                statistic_data.distributed_summary.gpu_communication_range
-            )
+        gpu_type_time.update(
+            statistic_data.time_range_summary.AllGPUTimeRangeSum
+        )
+        if statistic_data.distributed_summary.gpu_calls:
+            gpu_type_time[
+                TracerEventType.Communication
+            ] = statistic_data.distributed_summary.gpu_communication_time
             gpu_call_times[
                 TracerEventType.Communication
             ] = statistic_data.distributed_summary.gpu_calls
@@ -1154,7 +1301,10 @@ def _build_table(
     if views is None or SummaryView.DistributedView in views:
 
         # ----- Print Distribution Summary Report ----- #
-        if statistic_data.distributed_summary.communication_range:
+        if (
+            statistic_data.distributed_summary.cpu_calls
+            or statistic_data.distributed_summary.gpu_calls
+        ):
             headers = [
                 'Name',
                 'Total Time',
@@ -1178,15 +1328,13 @@ def _build_table(
             append(header_sep)
             append(row_format.format(*headers))
             append(header_sep)
-            communication_time = sum_ranges(
-                statistic_data.distributed_summary.communication_range
-            )
-            computation_time = sum_ranges(
-                statistic_data.distributed_summary.computation_range
+            communication_time = (
+                statistic_data.distributed_summary.communication_time
             )
-            overlap_time = sum_ranges(
-                statistic_data.distributed_summary.overlap_range
+            computation_time = (
+                statistic_data.distributed_summary.computation_time
             )
+            overlap_time = statistic_data.distributed_summary.overlap_time
             row_values = [
                 'ProfileStep',
                 format_time(total_time, unit=time_unit),
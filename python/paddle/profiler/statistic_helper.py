@@ -12,8 +12,124 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
+
+import numpy as np
+
+
+class TimeRanges:
+    r"""
+    A set of time ranges backed by sorted numpy arrays of starts and ends.
+    Ranges in the set are disjoint and sorted, overlapping or adjacent
+    ranges are merged once added. Union, intersection and subtraction of
+    sets are computed by vectorized sweeps over the sorted boundaries,
+    which are much faster than :code:`merge_ranges`,
+    :code:`intersection_ranges` and :code:`subtract_ranges` for large
+    number of ranges.
+
+    Args:
+        ranges(list[tuple], optional): List of (start, end) ranges in
+            integer nanoseconds, which need not be sorted or disjoint.
+            Default: None.
+    """
+
+    def __init__(self, ranges=None):
+        if ranges is None or len(ranges) == 0:
+            self.starts = np.empty([0], dtype=np.int64)
+            self.ends = np.empty([0], dtype=np.int64)
+            return
+        # NOTE: np.fromiter is several times faster than np.array to
+        #       convert a long list of tuples
+        ranges = np.fromiter(
+            itertools.chain.from_iterable(ranges),
+            dtype=np.int64,
+            count=2 * len(ranges),
+        )
+        self.starts, self.ends = _merge_sorted_ranges(
+            *_sort_ranges(ranges[0::2], ranges[1::2])
+        )
+
+    @classmethod
+    def _from_sorted_arrays(cls, starts, ends):
+        time_ranges = cls()
+        time_ranges.starts = starts
+        time_ranges.ends = ends
+        return time_ranges
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other):
+        if not isinstance(other, TimeRanges):
+            return NotImplemented
+        return np.array_equal(self.starts, other.starts) and np.array_equal(
+            self.ends, other.ends
+        )
+
+    def to_list(self):
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def sum(self):
+        return np.sum(self.ends - self.starts).item()
+
+    def union(self, other):
+        starts = np.concatenate([self.starts, other.starts])
+        ends = np.concatenate([self.ends, other.ends])
+        return TimeRanges._from_sorted_arrays(
+            *_merge_sorted_ranges(*_sort_ranges(starts, ends))
+        )
+
+    def intersection(self, other):
+        return self._sweep(other, lambda in_self, in_other: in_self & in_other)
+
+    def subtract(self, other):
+        return self._sweep(other, lambda in_self, in_other: in_self & ~in_other)
+
+    def _sweep(self, other, combine):
+        # NOTE: sort boundaries of both sets, ends before starts at the same
+        #       time, and count ranges of each set covering each segment
+        #       between adjacent boundaries
+        points = np.concatenate(
+            [self.starts, self.ends, other.starts, other.ends]
+        )
+        counts = [len(self), len(self), len(other), len(other)]
+        self_deltas = np.repeat([1, -1, 0, 0], counts)
+        other_deltas = np.repeat([0, 0, 1, -1], counts)
+        order = np.lexsort((self_deltas + other_deltas, points))
+        points = points[order]
+        in_self = np.cumsum(self_deltas[order]) > 0
+        in_other = np.cumsum(other_deltas[order]) > 0
+        selected = combine(in_self, in_other)[:-1] & (points[1:] > points[:-1])
+        return TimeRanges._from_sorted_arrays(
+            *_merge_sorted_ranges(points[:-1][selected], points[1:][selected])
+        )
+
+
+def _sort_ranges(starts, ends):
+    order = np.argsort(starts, kind='stable')
+    return starts[order], ends[order]
+
+
+def _merge_sorted_ranges(starts, ends):
+    # NOTE: a range starts a new merged range if it starts after all
+    #       previous ranges end, the same as `merge_self_ranges`
+    if len(starts) == 0:
+        return starts, ends
+    max_ends = np.maximum.accumulate(ends)
+    is_first = np.empty(len(starts), dtype=bool)
+    is_first[0] = True
+    is_first[1:] = starts[1:] > max_ends[:-1]
+    first_indices = np.flatnonzero(is_first)
+    last_indices = np.append(first_indices[1:] - 1, len(starts) - 1)
+    return starts[first_indices], max_ends[last_indices]
+
 
 def sum_ranges(ranges):
+    if isinstance(ranges, TimeRanges):
+        return ranges.sum()
     result = 0
     for time_range in ranges:
         result += time_range[1] - time_range[0]